@@ -4,7 +4,7 @@ API v1 router.
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import proof, agents, settlement, ipfs
+from app.api.v1.endpoints import proof, agents, settlement, ipfs, underwrite, admin
 
 router = APIRouter()
 
@@ -12,3 +12,5 @@ router.include_router(proof.router, prefix="/proof", tags=["ZK Proofs"])
 router.include_router(agents.router, prefix="/agents", tags=["AI Agents"])
 router.include_router(settlement.router, prefix="/settlement", tags=["Settlement"])
 router.include_router(ipfs.router, prefix="/ipfs", tags=["IPFS"])
+router.include_router(underwrite.router, prefix="/underwrite", tags=["Underwriting"])
+router.include_router(admin.router, prefix="/admin", tags=["Admin"])
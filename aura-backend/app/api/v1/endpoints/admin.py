@@ -0,0 +1,168 @@
+"""
+Admin endpoints, enabled by setting ADMIN_API_TOKEN.
+"""
+
+import asyncio
+import json
+import secrets
+from typing import Any, Dict, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, Field
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.jobs.stress_test import StressTest
+from app.services.agents import AuraAgent, LenderAgent
+from app.services.model_registry import ModelRegistry
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    if not settings.ADMIN_API_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.ADMIN_API_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+# Stress tests occupy every pool worker, so only one runs at a time. The
+# lock is per API process: with several uvicorn workers, each can run one.
+_stress_test_lock = asyncio.Lock()
+
+
+class StressTestPolicy(BaseModel):
+    """Candidate policy; omitted fields keep the agents' current values."""
+    
+    base_rate: Optional[float] = Field(default=None, ge=0, le=100)
+    risk_premium: Optional[Dict[str, float]] = None
+    risk_thresholds: Optional[List[float]] = Field(default=None, min_length=3, max_length=3)
+
+
+class StressTestRequest(BaseModel):
+    applicants: int = Field(100_000, ge=1, le=settings.STRESS_TEST_MAX_APPLICANTS)
+    seed: int = 0
+    policy: StressTestPolicy = StressTestPolicy()
+    # Overrides of the synthetic applicant and credit assumptions (see DEFAULT_SCENARIO)
+    population: Dict[str, Any] = Field(default_factory=dict)
+    credit: Dict[str, float] = Field(default_factory=dict)
+
+
+@router.post("/stress-test")
+async def run_stress_test(request: StressTestRequest):
+    """
+    Monte Carlo stress test of a candidate lending policy.
+    
+    Streams one JSON object per line (application/x-ndjson) with running
+    totals for the current and candidate policy after each shard; the last
+    line has `"complete": true`. Answers 409 while another stress test
+    runs in this process.
+    """
+    scenario = request.model_dump(exclude={"policy"})
+    scenario["policy"] = request.policy.model_dump(exclude_none=True)
+    try:
+        stress_test = StressTest(scenario)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    # Nothing awaits between the check and the uncontended acquire, so a
+    # concurrent request cannot slip in between
+    if _stress_test_lock.locked():
+        raise HTTPException(status_code=409, detail="A stress test is already running")
+    await _stress_test_lock.acquire()
+    released = False
+    
+    def release() -> None:
+        nonlocal released
+        if not released:
+            released = True
+            _stress_test_lock.release()
+    
+    async def stream():
+        try:
+            async for progress in stress_test.stream():
+                yield json.dumps(progress) + "\n"
+        except Exception as e:
+            # Headers are already sent; report the failure in-band and stop
+            yield json.dumps({"error": str(e)}) + "\n"
+        finally:
+            release()
+    
+    # The background task also releases when the client leaves before the stream starts
+    return StreamingResponse(stream(), media_type="application/x-ndjson", background=BackgroundTask(release))
+
+
+class ModelLoadRequest(BaseModel):
+    path: str
+    version: str = Field(..., min_length=1, max_length=32)
+    # "active" swaps the version in at once; "candidate" shadow-scores it first
+    role: Literal["active", "candidate"] = "candidate"
+    shadow_fraction: float = Field(settings.MODEL_SHADOW_FRACTION, ge=0, le=1)
+
+
+def _registry(name: str) -> ModelRegistry:
+    registries = {"aura": AuraAgent.models, "lender": LenderAgent.models}
+    if name not in registries:
+        raise HTTPException(status_code=404, detail=f"Unknown model {name!r}")
+    return registries[name]
+
+
+@router.get("/models")
+async def model_status():
+    """
+    Active and candidate versions of each agent model, with shadow score
+    deltas. Versions are the answering worker's view of the published
+    revision; shadow statistics are that worker's own.
+    """
+    return {"aura": AuraAgent.models.status(), "lender": LenderAgent.models.status()}
+
+
+@router.post("/models/{name}/load")
+async def load_model_version(name: str, request: ModelLoadRequest):
+    """
+    Load a model version without a restart.
+    
+    The file is loaded in the background while the current version keeps
+    serving; requests already in flight finish on the version they started
+    with. Other workers load it within MODEL_REGISTRY_SYNC_INTERVAL, so the
+    path must be readable by all of them.
+    """
+    registry = _registry(name)
+    try:
+        if request.role == "active":
+            await registry.roll_out(request.path, request.version)
+        else:
+            await registry.set_candidate(request.path, request.version, request.shadow_fraction)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except RedisError as e:
+        raise HTTPException(status_code=503, detail=f"Could not publish the model version: {e}")
+    return registry.status()
+
+
+@router.post("/models/{name}/promote")
+async def promote_model_version(name: str):
+    """Make the candidate version active."""
+    registry = _registry(name)
+    try:
+        await registry.promote()
+    except LookupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except RedisError as e:
+        raise HTTPException(status_code=503, detail=f"Could not publish the model version: {e}")
+    return registry.status()
+
+
+@router.delete("/models/{name}/candidate")
+async def discard_model_candidate(name: str):
+    """Stop shadow scoring and drop the candidate version."""
+    registry = _registry(name)
+    try:
+        await registry.discard_candidate()
+    except RedisError as e:
+        raise HTTPException(status_code=503, detail=f"Could not publish the model version: {e}")
+    return registry.status()
@@ -2,10 +2,16 @@
 AI Agent endpoints.
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Optional
+import hashlib
+import json
+import time
+from functools import lru_cache
 
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
 from app.services.agents import AuraAgent, LenderAgent
 
 router = APIRouter()
@@ -20,6 +26,30 @@ class AuraAssessmentRequest(BaseModel):
     tenure_months: int
     monthly_income: float
     existing_debt: float
+    wallet_address: Optional[str] = Field(default=None, max_length=128)
+
+
+class AuraBatchAssessmentRequest(BaseModel):
+    """Applicants as columns: element i of every list describes applicant i."""
+    
+    proof_valid: List[bool] = Field(..., min_length=1, max_length=settings.AGENT_ASSESS_BATCH_MAX)
+    income_sufficient: List[bool]
+    dti_acceptable: List[bool]
+    no_compliance_flags: List[bool]
+    requested_amount: List[float]
+    tenure_months: List[int]
+    monthly_income: List[float]
+    existing_debt: List[float]
+    wallet_address: Optional[List[str]] = None
+    
+    @model_validator(mode="after")
+    def check_lengths(self) -> "AuraBatchAssessmentRequest":
+        lengths = {
+            name: len(getattr(self, name)) for name in self.model_fields if getattr(self, name) is not None
+        }
+        if len(set(lengths.values())) != 1:
+            raise ValueError(f"All columns must have the same length, got {lengths}")
+        return self
 
 
 class LenderDecisionRequest(BaseModel):
@@ -34,7 +64,7 @@ async def aura_risk_assessment(request: AuraAssessmentRequest):
     Perform Aura risk assessment based on ZK proof results.
     """
     try:
-        result = await AuraAgent.assess_risk(
+        result = await AuraAgent.assess_risk_memoized(
             proof_valid=request.proof_valid,
             income_sufficient=request.income_sufficient,
             dti_acceptable=request.dti_acceptable,
@@ -43,19 +73,44 @@ async def aura_risk_assessment(request: AuraAssessmentRequest):
             tenure_months=request.tenure_months,
             monthly_income=request.monthly_income,
             existing_debt=request.existing_debt,
+            wallet_address=request.wallet_address,
         )
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/aura/assess/batch")
+async def aura_risk_assessment_batch(request: AuraBatchAssessmentRequest):
+    """
+    Aura risk assessment for a batch of applicants given as columns.
+    
+    Results are in input order and match `/aura/assess` row by row.
+    """
+    start_time = time.time()
+    try:
+        results = await AuraAgent.assess_risk_batch(**request.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    elapsed = time.time() - start_time
+    return {
+        "count": len(results),
+        "results": results,
+        "processing_time_ms": int(elapsed * 1000),
+        "rows_per_second": round(len(results) / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
 @router.post("/lender/decide")
 async def lender_decision(request: LenderDecisionRequest):
     """
     Get final lending decision from Lender agent.
     """
     try:
-        result = await LenderAgent.make_decision(
+        result = await LenderAgent.make_decision_memoized(
             aura_assessment=request.aura_assessment,
             requested_amount=request.requested_amount,
             requested_tenure=request.requested_tenure,
@@ -63,3 +118,50 @@ async def lender_decision(request: LenderDecisionRequest):
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@lru_cache(maxsize=256)
+def _quote_grid(
+    amounts: Tuple[float, ...],
+    tenures: Tuple[int, ...],
+    risk_levels: Tuple[str, ...],
+    max_amount: Optional[float],
+) -> Tuple[bytes, str]:
+    """Encoded grid and its ETag; quotes depend only on the arguments and the rate rules."""
+    body = json.dumps(
+        LenderAgent.quote_grid(amounts, tenures, risk_levels, max_amount), separators=(",", ":")
+    ).encode()
+    return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+@router.get("/lender/quote-grid")
+async def lender_quote_grid(
+    amounts: List[float] = Query(..., description="Loan amounts, e.g. ?amounts=1000&amounts=2000"),
+    tenures: List[int] = Query(..., description="Tenures in months"),
+    risk_levels: List[str] = Query(default=["low", "medium"], description="low, medium, and high with max_amount"),
+    max_amount: Optional[float] = Query(default=None, gt=0, description="Cap on the approved amount"),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    """
+    Price grid of risk levels × amounts × tenures for the loan sliders.
+    
+    Each cell holds the rule-based terms the Lender agent would offer;
+    `monthly_payment[l][a][t]` is for `risk_levels[l]`, `amounts[a]` and
+    `tenures[t]`. Encoded grids are cached in-process, and clients can
+    revalidate with the ETag.
+    """
+    cells = len(amounts) * len(tenures) * len(risk_levels)
+    if cells > settings.LENDER_QUOTE_GRID_MAX_CELLS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Grid has {cells} cells, limit is {settings.LENDER_QUOTE_GRID_MAX_CELLS}",
+        )
+    try:
+        body, etag = _quote_grid(tuple(amounts), tuple(tenures), tuple(risk_levels), max_amount)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    headers = {"Cache-Control": f"public, max-age={settings.CACHE_TTL}", "ETag": etag}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
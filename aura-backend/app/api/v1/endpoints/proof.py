@@ -2,12 +2,31 @@
 ZK Proof generation endpoints.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+import json
+import time
+from datetime import datetime
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.schemas.proof import ProofGenerateRequest, ProofGenerateResponse
+from app.schemas.proof import (
+    ProofGenerateRequest,
+    ProofGenerateResponse,
+    ProofBatchGenerateRequest,
+    ProofJobRequest,
+    ProofJobResponse,
+    ProofBatchVerifyRequest,
+    ProofBatchVerifyResponse,
+)
+from app.services.proof_jobs import ProofJobQueueFull, job_priority, proof_job_queue
+from app.services.prover_pool import ProverJobTimeout, ProverPoolSaturated
 from app.services.zk_prover import ZKProverService
+from app.zk import codec
+from app.zk.setup import SetupUnavailable
 
 router = APIRouter()
 prover_service = ZKProverService()
@@ -16,13 +35,17 @@ prover_service = ZKProverService()
 @router.post("/generate", response_model=ProofGenerateResponse)
 async def generate_proof(
     request: ProofGenerateRequest,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    accept: Optional[str] = Header(default=None),
+    trace: bool = Query(default=False, description="Include per-phase timings"),
 ):
     """
     Generate a zero-knowledge proof for loan eligibility.
     
     The proof attests to eligibility conditions without revealing
-    the underlying financial data.
+    the underlying financial data. With `Accept: application/octet-stream`
+    the body is the compressed proof followed by its public signals
+    (see app.zk.codec) and the rest of the result moves to headers.
     """
     try:
         # In production, decrypt and verify data from IPFS
@@ -34,12 +57,127 @@ async def generate_proof(
             requested_amount=request.requested_amount,
             tenure_months=request.tenure_months,
             has_compliance_flags=request.has_compliance_flags,
+            include_trace=trace,
         )
+        result.setdefault("generated_at", datetime.utcnow())
         
-        return result
+        if accept and "application/octet-stream" in accept:
+            headers = {
+                "X-Proof-Hash": result["proof_hash"],
+                "X-Proof-Valid": str(result["is_valid"]).lower(),
+                "X-Proof-Encoding": codec.ENCODING,
+            }
+            if trace:
+                headers["X-Proof-Trace"] = json.dumps(result["trace"], separators=(",", ":"))
+            return Response(
+                content=codec.encode_bundle(result["proof_data"], result["public_signals"]),
+                media_type="application/octet-stream",
+                headers=headers,
+            )
         
+        return result
+    
+    except ProverPoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ProverJobTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except SetupUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/generate/batch")
+async def generate_proofs_batch(request: ProofBatchGenerateRequest):
+    """
+    Generate zero-knowledge proofs for a batch of applications.
+    
+    Streams one JSON object per line (application/x-ndjson) in submission
+    order, each tagged with its `index` and `application_id`. All proofs
+    are cached by the time the stream ends.
+    """
+    applications = [
+        {
+            "monthly_income": 5000.0,  # Derived from hash in production
+            "existing_debt": 1000.0,
+            "requested_amount": item.requested_amount,
+            "tenure_months": item.tenure_months,
+            "has_compliance_flags": item.has_compliance_flags,
+        }
+        for item in request.applications
+    ]
+    results = prover_service.generate_proofs_batch(applications)
+    
+    # Wait for the first chunk so pool and input errors still map to a status code
+    try:
+        first = await results.__anext__()
+    except ProverPoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ProverJobTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except SetupUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    def line(result: dict) -> str:
+        result["application_id"] = str(request.applications[result["index"]].application_id)
+        result["generated_at"] = datetime.utcnow().isoformat()
+        return json.dumps(result) + "\n"
+    
+    async def stream():
+        yield line(first)
+        try:
+            async for result in results:
+                yield line(result)
+        except Exception as e:
+            # Headers are already sent; report the failure in-band and stop
+            yield json.dumps({"error": str(e)}) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post("/jobs", response_model=ProofJobResponse, status_code=202)
+async def submit_proof_job(request: ProofJobRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Queue a proof for background generation and return its job id at once.
+    
+    Jobs from pre-approved wallets run first, then first come, first served;
+    fetch the result from `GET /jobs/{job_id}`.
+    """
+    priority = await job_priority(db, request.application_id)
+    try:
+        return await proof_job_queue.submit(
+            {
+                "monthly_income": 5000.0,  # Derived from hash in production
+                "existing_debt": 1000.0,
+                "requested_amount": request.requested_amount,
+                "tenure_months": request.tenure_months,
+                "has_compliance_flags": request.has_compliance_flags,
+            },
+            priority=priority,
+        )
+    except ProofJobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/jobs/{job_id}", response_model=ProofJobResponse)
+async def get_proof_job(
+    job_id: str,
+    wait: float = Query(default=0.0, ge=0.0, description="Seconds to long-poll for completion"),
+):
+    """
+    Status of a proof job, including the proof once it is done.
+    
+    With `wait`, the request is held until the job finishes or the wait
+    (capped at ZK_JOB_LONG_POLL_MAX) runs out.
+    """
+    job = await proof_job_queue.get(job_id, wait=wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Proof job not found")
+    return job
 
 
 @router.get("/verify/{proof_hash}")
@@ -58,3 +196,65 @@ async def verify_proof(proof_hash: str):
         "conditions": cached["conditions"],
         "verified_at": cached.get("generated_at"),
     }
+
+
+@router.post("/verify/batch", response_model=ProofBatchVerifyResponse)
+async def verify_proofs_batch(request: ProofBatchVerifyRequest):
+    """
+    Verify a batch of proofs with one randomized pairing check.
+    
+    Proofs are referenced by cached proof hash or supplied inline.
+    """
+    start_time = time.time()
+    results = []
+    to_verify = []
+    
+    # Items without inline data always carry a hash (ProofBatchVerifyItem checks)
+    by_hash = [
+        item.proof_hash for item in request.proofs
+        if item.proof_hash is not None and (item.proof_data is None or item.public_signals is None)
+    ]
+    cached_proofs = dict(zip(by_hash, await prover_service.get_cached_proofs(by_hash)))
+    
+    for index, item in enumerate(request.proofs):
+        if item.proof_data is not None and item.public_signals is not None:
+            to_verify.append((index, item.proof_data, item.public_signals))
+            results.append({"index": index, "proof_hash": item.proof_hash, "is_verified": False})
+            continue
+        
+        cached = cached_proofs.get(item.proof_hash) if item.proof_hash is not None else None
+        if not cached:
+            results.append({
+                "index": index,
+                "proof_hash": item.proof_hash,
+                "is_verified": False,
+                "error": "Proof not found",
+            })
+            continue
+        
+        to_verify.append((index, cached["proof_data"], cached["public_signals"]))
+        results.append({"index": index, "proof_hash": item.proof_hash, "is_verified": False})
+    
+    try:
+        verified = await prover_service.verify_proofs_batch(
+            [(proof_data, signals) for _, proof_data, signals in to_verify]
+        )
+    except ProverPoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ProverJobTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except SetupUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    for (index, _, _), ok in zip(to_verify, verified):
+        results[index]["is_verified"] = ok
+    
+    return {
+        "all_verified": all(r["is_verified"] for r in results),
+        "results": results,
+        "verification_time_ms": int((time.time() - start_time) * 1000),
+        "verifier_type": "backend",
+        "verified_at": datetime.utcnow(),
+    }
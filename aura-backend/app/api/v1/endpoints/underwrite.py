@@ -0,0 +1,87 @@
+"""
+Single-call underwriting endpoint.
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.schemas.loan import UnderwriteRequest
+from app.services.prover_pool import ProverJobTimeout, ProverPoolSaturated
+from app.services.underwriting import collect_stages, underwriting_pipeline
+from app.zk.setup import SetupUnavailable
+
+router = APIRouter()
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _event(name: str, data: dict) -> str:
+    return f"event: {name}\ndata: {json.dumps(data, default=_json_default, separators=(',', ':'))}\n\n"
+
+
+@router.post("")
+async def underwrite(
+    request: UnderwriteRequest,
+    accept: Optional[str] = Header(default=None),
+):
+    """
+    Prove eligibility, assess risk and decide on an application in one call.
+    
+    Replaces the `/proof/generate` → `/agents/aura/assess` →
+    `/agents/lender/decide` round trips. With `Accept: text/event-stream`
+    each stage is sent as a Server-Sent Event (`proof`, `aura_assessment`,
+    `lender_decision`, then `complete` with the timings) as soon as it
+    finishes; otherwise the combined result is returned once all are done.
+    """
+    application: Dict[str, Any] = {
+        "monthly_income": 5000.0,  # Derived from hash in production
+        "existing_debt": 1000.0,
+        "requested_amount": request.requested_amount,
+        "tenure_months": request.tenure_months,
+        "has_compliance_flags": request.has_compliance_flags,
+    }
+    stages = underwriting_pipeline.stages(**application)
+    
+    # Wait for the proof so pool errors still map to a status code
+    try:
+        stage, proof = await stages.__anext__()
+    except ProverPoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ProverJobTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except SetupUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    proof.setdefault("generated_at", datetime.utcnow())
+    
+    if accept and "text/event-stream" in accept:
+        async def stream():
+            yield _event("proof", {"application_id": str(request.application_id), **proof})
+            try:
+                async for stage, payload in stages:
+                    yield _event(stage, payload)
+            except Exception as e:
+                # Headers are already sent; report the failure in-band and stop
+                yield _event("error", {"error": str(e)})
+        
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    
+    try:
+        result = await collect_stages(stages, {"application_id": request.application_id, stage: proof})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    result["decided_at"] = datetime.utcnow()
+    return result
@@ -34,6 +34,12 @@ class Settings(BaseSettings):
     # Cardano
     CARDANO_NETWORK: str = Field(default="preprod")
     BLOCKFROST_PROJECT_ID: str = Field(default="")
+    # Blockfrost calls share one keep-alive pool; transient failures are
+    # retried with jittered exponential backoff starting at CHAIN_CLIENT_BACKOFF
+    CHAIN_CLIENT_POOL_SIZE: int = Field(default=20)
+    CHAIN_CLIENT_TIMEOUT: float = Field(default=10.0)
+    CHAIN_CLIENT_RETRIES: int = Field(default=3)
+    CHAIN_CLIENT_BACKOFF: float = Field(default=0.25)
     LENDER_PRIVATE_KEY: str = Field(default="")
     LENDER_MNEMONIC: str = Field(default="")
     
@@ -41,6 +47,7 @@ class Settings(BaseSettings):
     JWT_SECRET: str = Field(default="change-this-in-production")
     JWT_ALGORITHM: str = Field(default="HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30)
+    ADMIN_API_TOKEN: str = Field(default="")  # admin endpoints are disabled while empty
     
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = Field(default=60)
@@ -49,10 +56,70 @@ class Settings(BaseSettings):
     ZK_CIRCUIT_PATH: str = Field(default="/app/circuits/loan_eligibility.r1cs")
     ZK_PROVING_KEY_PATH: str = Field(default="/app/circuits/proving_key.bin")
     ZK_VERIFICATION_KEY_PATH: str = Field(default="/app/circuits/verification_key.json")
+    # Key paths may use {circuit_id} and {circuit_version} placeholders
+    ZK_KEY_STORE_MAX_RESIDENT: int = Field(default=4)
+    # Prove and verify against a trapdoor derived from public strings when no
+    # keys are deployed. Offers no soundness; honoured only in development
+    ZK_DEVELOPMENT_SETUP: bool = Field(default=False)
+    
+    # ZK Prover pool (0 workers proves inline on the event loop)
+    ZK_PROVER_WORKERS: int = Field(default=2)
+    ZK_PROVER_MAX_QUEUE: int = Field(default=32)
+    ZK_PROVER_JOB_TIMEOUT: float = Field(default=30.0)
+    ZK_FIXED_BASE_WINDOW: int = Field(default=5)
+    # Generator tables shared by all workers as mapped files ("" builds per process);
+    # must be a mode 0700 directory owned by the service user
+    ZK_PRECOMPUTE_DIR: str = Field(default="~/.cache/aura/precompute")
+    ZK_CURVE_BACKEND: str = Field(default="projective")  # "projective" or "affine"
+    ZK_VERIFY_BATCH_MAX: int = Field(default=256)
+    ZK_VERIFY_BATCH_CHUNK: int = Field(default=32)
+    ZK_PROVE_BATCH_MAX: int = Field(default=500)
+    ZK_PROVE_BATCH_CHUNK: int = Field(default=16)
+    
+    # ZK proof jobs (submit now, fetch later)
+    ZK_JOB_CONCURRENCY: int = Field(default=4)
+    ZK_JOB_MAX_PENDING: int = Field(default=1000)
+    ZK_JOB_LONG_POLL_MAX: float = Field(default=30.0)
+    # A job waits at most this long for room in a saturated prover pool
+    ZK_JOB_SATURATED_WAIT: float = Field(default=60.0)
+    
+    # Proof results keyed on the witness digest (the timestamp signal of a
+    # reused proof is at most ZK_PROOF_CACHE_TTL seconds old)
+    ZK_PROOF_CACHE_SIZE: int = Field(default=1024)
+    ZK_PROOF_CACHE_TTL: int = Field(default=300)
     
     # AI Models
     AURA_MODEL_PATH: str = Field(default="/app/ml_models/aura_risk_model.joblib")
     LENDER_MODEL_PATH: str = Field(default="/app/ml_models/lender_decision_model.joblib")
+    AGENT_ASSESS_BATCH_MAX: int = Field(default=50000)
+    LENDER_QUOTE_GRID_MAX_CELLS: int = Field(default=20000)
+    MODEL_INFERENCE_THREADS: int = Field(default=4)
+    # Inference micro-batching: longer waits give larger batches at higher p50
+    MODEL_BATCH_MAX_SIZE: int = Field(default=64)
+    MODEL_BATCH_MAX_WAIT_MS: float = Field(default=2.0)
+    # Candidate models are shadow-scored on their own threads
+    MODEL_SHADOW_THREADS: int = Field(default=1)
+    MODEL_SHADOW_FRACTION: float = Field(default=0.05)
+    # How often each worker checks Redis for versions rolled out elsewhere
+    MODEL_REGISTRY_SYNC_INTERVAL: float = Field(default=2.0)
+    # Opt-in memoization of /agents assessments and decisions; inputs are
+    # quantized to these steps (ADA) before lookup and scoring, amounts and
+    # income rounded down and debt up
+    AGENT_MEMO_ENABLED: bool = Field(default=False)
+    AGENT_MEMO_SIZE: int = Field(default=4096)
+    AGENT_MEMO_TTL: int = Field(default=60)
+    AGENT_MEMO_AMOUNT_STEP: float = Field(default=1.0)
+    AGENT_MEMO_INCOME_STEP: float = Field(default=10.0)
+    AGENT_MEMO_SCORE_STEP: float = Field(default=0.01)
+    
+    # Policy stress tests (0 workers runs shards in-process)
+    STRESS_TEST_WORKERS: int = Field(default=4)
+    STRESS_TEST_SHARD_SIZE: int = Field(default=100000)
+    STRESS_TEST_MAX_APPLICANTS: int = Field(default=10000000)
+    
+    # Offline re-scoring of stored applications into loan_rescores (python -m app.jobs.rescore)
+    RESCORE_CHUNK_SIZE: int = Field(default=1000)
+    RESCORE_CHECKPOINT_PATH: str = Field(default="rescore.checkpoint.json")
     
     # CORS
     CORS_ORIGINS: List[str] = Field(default=["http://localhost:3000", "https://aura-protocol.vercel.app"])
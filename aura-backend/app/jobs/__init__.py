@@ -0,0 +1,3 @@
+"""
+Offline jobs, runnable as `python -m app.jobs.<name>`.
+"""
@@ -0,0 +1,111 @@
+"""
+Migrate zk_proofs.proof_data from JSON text to the compressed binary form.
+
+Databases created before the proof codec hold proof_data as TEXT (the
+snarkjs decimal-string JSON); init.sql only runs on a fresh volume, so
+they need this step once. Every row is re-encoded with app.zk.codec into a
+new BYTEA column, which then replaces the old one, all in one transaction:
+a row that cannot be parsed aborts the migration and leaves the table as it
+was. Databases already on BYTEA are left alone, so the job is safe to rerun.
+
+Usage: python -m app.jobs.migrate_proof_data [--chunk-size N] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.database import engine
+from app.zk import codec
+
+COLUMN_TYPE = text(
+    "SELECT data_type FROM information_schema.columns "
+    "WHERE table_name = 'zk_proofs' AND column_name = 'proof_data'"
+)
+SELECT_CHUNK = text(
+    "SELECT id, proof_data FROM zk_proofs WHERE (CAST(:after AS uuid) IS NULL OR id > CAST(:after AS uuid)) "
+    "ORDER BY id LIMIT :limit"
+)
+UPDATE_ROW = text(
+    "UPDATE zk_proofs SET proof_data_compressed = :proof_data, proof_size_bytes = :size WHERE id = :id"
+)
+
+
+def encode_legacy_proof(value: str) -> bytes:
+    """Compressed encoding of a proof stored as snarkjs JSON text."""
+    try:
+        proof_data = json.loads(value)
+        return codec.encode_proof(proof_data)
+    except (TypeError, KeyError, IndexError, ValueError) as e:
+        raise ValueError(f"Unparseable proof_data: {e}") from e
+
+
+async def migrate(bind: AsyncEngine = engine, chunk_size: int = 1000, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Convert the column in place and report what was done.
+    
+    Dry runs parse and encode every row inside the transaction, then roll
+    it back.
+    """
+    async with bind.connect() as conn, conn.begin() as transaction:
+        column_type = (await conn.execute(COLUMN_TYPE)).scalar()
+        if column_type is None:
+            return {"status": "no_table"}
+        if column_type == "bytea":
+            return {"status": "already_migrated"}
+        
+        await conn.execute(text("ALTER TABLE zk_proofs ADD COLUMN proof_data_compressed BYTEA"))
+        rows = 0
+        after: Optional[str] = None
+        while True:
+            chunk = (await conn.execute(SELECT_CHUNK, {"after": after, "limit": chunk_size})).all()
+            if not chunk:
+                break
+            values = []
+            for row in chunk:
+                try:
+                    encoded = encode_legacy_proof(row.proof_data)
+                except ValueError as e:
+                    raise ValueError(f"zk_proofs row {row.id}: {e}") from e
+                values.append({"id": row.id, "proof_data": encoded, "size": len(encoded)})
+            await conn.execute(UPDATE_ROW, values)
+            rows += len(chunk)
+            after = str(chunk[-1].id)
+        
+        await conn.execute(text("ALTER TABLE zk_proofs DROP COLUMN proof_data"))
+        await conn.execute(text("ALTER TABLE zk_proofs RENAME COLUMN proof_data_compressed TO proof_data"))
+        await conn.execute(text("ALTER TABLE zk_proofs ALTER COLUMN proof_data SET NOT NULL"))
+        if dry_run:
+            await transaction.rollback()
+    
+    return {"status": "dry_run" if dry_run else "migrated", "rows": rows}
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        print(json.dumps(await migrate(chunk_size=args.chunk_size, dry_run=args.dry_run)), flush=True)
+    except ValueError as e:
+        print(f"Migration aborted, nothing changed: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="Convert every row, then roll back")
+    args = parser.parse_args()
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
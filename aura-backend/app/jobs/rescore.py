@@ -0,0 +1,290 @@
+"""
+Re-score stored loan applications with the current agents.
+
+Applications are streamed from Postgres through a server-side cursor in
+application id order, each with its latest proof and decision. Every chunk
+is assessed and decided by the agents and written in one bulk upsert to
+loan_rescores, keyed on the run and application; loan_decisions keeps the
+terms applicants were actually offered. The run id and the last application
+id of each committed chunk go to a checkpoint file, so an interrupted run
+resumes where it stopped and a rerun of a chunk replaces its rows.
+
+Income is never stored, so every run scores at an assumed income and debt,
+recorded on each row. Writing such scores needs --assume-income; without it
+only --dry-run is allowed.
+
+Usage: python -m app.jobs.rescore [--chunk-size N] [--checkpoint FILE]
+    [--restart] [--limit N] [--include-undecided] [--dry-run | --assume-income]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from uuid import UUID, uuid4
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import async_session_maker, engine
+from app.models.loan import LoanApplication, LoanDecision, LoanRescore
+from app.models.proof import ZKProof
+from app.services.agents import AuraAgent, LenderAgent
+from app.services.underwriting import loan_decision_values
+
+# Income is never stored; the API assumes these until it is derived from
+# the committed hash
+ASSUMED_MONTHLY_INCOME = 5000.0
+ASSUMED_EXISTING_DEBT = 1000.0
+
+# Columns a rerun of the same chunk rewrites; run_id and application_id
+# identify the row
+UPDATED_COLUMNS = tuple(
+    column.key for column in LoanRescore.__table__.columns if column.key not in ("id", "run_id", "application_id")
+)
+# Postgres allows 65535 bind parameters per statement
+MAX_CHUNK_SIZE = 65535 // len(LoanRescore.__table__.columns)
+
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """The saved progress at `path`, or None to start from the beginning."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """Write `state` to `path` atomically, so a crash never leaves half a file."""
+    partial = f"{path}.tmp"
+    with open(partial, "w") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(partial, path)
+
+
+def applications_query(after: Optional[UUID] = None, include_undecided: bool = False):
+    """Applications with their latest proof and decision, in id order from `after`."""
+    stmt = (
+        select(
+            LoanApplication.id.label("application_id"),
+            LoanApplication.wallet_address,
+            LoanApplication.requested_amount,
+            LoanApplication.tenure_months,
+            ZKProof.is_valid,
+            ZKProof.income_sufficient,
+            ZKProof.dti_acceptable,
+            ZKProof.no_compliance_flags,
+            LoanDecision.id.label("decision_id"),
+            LoanDecision.is_approved.label("was_approved"),
+        )
+        .join(ZKProof, ZKProof.application_id == LoanApplication.id)
+        .join(LoanDecision, LoanDecision.application_id == LoanApplication.id, isouter=include_undecided)
+        .distinct(LoanApplication.id)
+        .order_by(LoanApplication.id, ZKProof.generated_at.desc(), LoanDecision.decided_at.desc())
+    )
+    if after is not None:
+        stmt = stmt.where(LoanApplication.id > after)
+    return stmt
+
+
+async def score_chunk(
+    rows: Sequence[Any],
+    run_id: UUID,
+    monthly_income: float = ASSUMED_MONTHLY_INCOME,
+    existing_debt: float = ASSUMED_EXISTING_DEBT,
+) -> List[Dict[str, Any]]:
+    """LoanRescore column values for a chunk of `applications_query` rows."""
+    count = len(rows)
+    assessments = await AuraAgent.assess_risk_batch(
+        proof_valid=[row.is_valid for row in rows],
+        income_sufficient=[row.income_sufficient for row in rows],
+        dti_acceptable=[row.dti_acceptable for row in rows],
+        no_compliance_flags=[row.no_compliance_flags for row in rows],
+        requested_amount=[row.requested_amount for row in rows],
+        tenure_months=[row.tenure_months for row in rows],
+        monthly_income=[monthly_income] * count,
+        existing_debt=[existing_debt] * count,
+        wallet_address=[row.wallet_address for row in rows],
+    )
+    # Concurrent decisions share the pricing model's inference batches
+    decisions = await asyncio.gather(*(
+        LenderAgent.make_decision(assessment, row.requested_amount, row.tenure_months)
+        for assessment, row in zip(assessments, rows)
+    ))
+    
+    scored_at = datetime.utcnow()
+    return [
+        {
+            "id": uuid4(),
+            "run_id": run_id,
+            "application_id": row.application_id,
+            "decision_id": row.decision_id,
+            **loan_decision_values(assessment, decision),
+            "assumed_monthly_income": monthly_income,
+            "assumed_existing_debt": existing_debt,
+            "scored_at": scored_at,
+        }
+        for row, assessment, decision in zip(rows, assessments, decisions)
+    ]
+
+
+def upsert_rescores():
+    """
+    INSERT ... ON CONFLICT (run_id, application_id) DO UPDATE for re-scores.
+    
+    Executed with a chunk's values as parameters, it reaches the driver as
+    one executemany and is compiled once for the whole run. A chunk redone
+    after a crash replaces the rows it wrote before the checkpoint.
+    """
+    stmt = insert(LoanRescore)
+    return stmt.on_conflict_do_update(
+        index_elements=[LoanRescore.run_id, LoanRescore.application_id],
+        set_={column: stmt.excluded[column] for column in UPDATED_COLUMNS},
+    )
+
+
+class Rescore:
+    """One resumable pass over the stored applications."""
+    
+    def __init__(
+        self,
+        chunk_size: int = settings.RESCORE_CHUNK_SIZE,
+        checkpoint_path: str = settings.RESCORE_CHECKPOINT_PATH,
+        limit: Optional[int] = None,
+        include_undecided: bool = False,
+        dry_run: bool = False,
+        assume_income: bool = False,
+        session_maker: async_sessionmaker = async_session_maker,
+    ):
+        if not 1 <= chunk_size <= MAX_CHUNK_SIZE:
+            raise ValueError(f"chunk_size must be between 1 and {MAX_CHUNK_SIZE}")
+        if not (dry_run or assume_income):
+            raise ValueError(
+                "Income is not stored; writing re-scores at the assumed income needs assume_income=True"
+            )
+        self.chunk_size = chunk_size
+        self.checkpoint_path = checkpoint_path
+        self.limit = limit
+        self.include_undecided = include_undecided
+        self.dry_run = dry_run
+        self.session_maker = session_maker
+        self._upsert = upsert_rescores()
+    
+    async def run(self, restart: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Re-score and write chunk by chunk, yielding progress after each.
+        
+        Progress counts this run and, from the checkpoint, earlier runs of
+        the same pass, which share its run id. approvals_changed compares
+        with the stored decisions. Dry runs score and report but neither
+        write nor checkpoint.
+        """
+        state = None if restart else load_checkpoint(self.checkpoint_path)
+        # Checkpoints without a run id are from passes that wrote to loan_decisions
+        if not state or "run_id" not in state:
+            state = {"run_id": str(uuid4()), "last_application_id": None, "rows": 0, "approvals_changed": 0}
+        run_id = UUID(state["run_id"])
+        after = UUID(state["last_application_id"]) if state["last_application_id"] else None
+        
+        start = time.perf_counter()
+        rows_this_run = 0
+        async with self.session_maker() as reader:
+            stmt = applications_query(after, self.include_undecided)
+            if self.limit is not None:
+                stmt = stmt.limit(self.limit)
+            result = await reader.stream(stmt.execution_options(yield_per=self.chunk_size))
+            async for rows in result.partitions():
+                values = await score_chunk(rows, run_id)
+                if not self.dry_run:
+                    await self._write(values)
+                
+                rows_this_run += len(rows)
+                state["rows"] += len(rows)
+                state["approvals_changed"] += sum(
+                    row.was_approved is not None and row.was_approved != value["is_approved"]
+                    for row, value in zip(rows, values)
+                )
+                state["last_application_id"] = str(rows[-1].application_id)
+                if not self.dry_run:
+                    save_checkpoint(self.checkpoint_path, state)
+                yield self._progress(state, rows_this_run, start, complete=False)
+        
+        yield self._progress(state, rows_this_run, start, complete=True)
+    
+    async def _write(self, values: List[Dict[str, Any]]) -> None:
+        # A separate session, so committing never closes the read cursor
+        async with self.session_maker() as session:
+            await session.execute(self._upsert, values)
+            await session.commit()
+    
+    def _progress(self, state: Dict[str, Any], rows_this_run: int, start: float, complete: bool) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - start
+        return {
+            **state,
+            "rows_this_run": rows_this_run,
+            "elapsed_s": round(elapsed, 3),
+            "rows_per_second": round(rows_this_run / elapsed, 1) if elapsed > 0 else None,
+            "dry_run": self.dry_run,
+            "complete": complete,
+        }
+
+
+async def _main(args: argparse.Namespace) -> None:
+    await AuraAgent.load_model()
+    await LenderAgent.load_model()
+    rescore = Rescore(
+        chunk_size=args.chunk_size,
+        checkpoint_path=args.checkpoint,
+        limit=args.limit,
+        include_undecided=args.include_undecided,
+        dry_run=args.dry_run,
+        assume_income=args.assume_income,
+    )
+    try:
+        # One JSON object per line, like the stress test
+        async for progress in rescore.run(restart=args.restart):
+            if progress["complete"] or not args.quiet:
+                print(json.dumps(progress), flush=True)
+            if not args.quiet:
+                print(f"{progress['rows']} rows, {progress['rows_per_second']} rows/s", file=sys.stderr)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=settings.RESCORE_CHUNK_SIZE)
+    parser.add_argument("--checkpoint", default=settings.RESCORE_CHECKPOINT_PATH)
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over")
+    parser.add_argument("--limit", type=int, help="Stop after this many applications")
+    parser.add_argument(
+        "--include-undecided",
+        action="store_true",
+        help="Also score applications that have a proof but no decision yet",
+    )
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--dry-run", action="store_true", help="Score and report without writing")
+    mode.add_argument(
+        "--assume-income",
+        action="store_true",
+        help=f"Write re-scores made at an assumed {ASSUMED_MONTHLY_INCOME:g} income and {ASSUMED_EXISTING_DEBT:g} debt",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Print only the final result")
+    args = parser.parse_args()
+    if not 1 <= args.chunk_size <= MAX_CHUNK_SIZE:
+        parser.error(f"--chunk-size must be between 1 and {MAX_CHUNK_SIZE}")
+    
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Monte Carlo stress test of the lending policy.
+
+Samples applicants (from synthetic distributions, or resampled from a CSV
+of historical applications), runs them through the vectorized Aura and
+Lender rules under both the current and a candidate policy, and reports
+how approval rate, exposure and expected loss move. Applicants are split
+into shards that run in a process pool; running totals are reported as
+each shard lands.
+
+Usage: python -m app.jobs.stress_test [--applicants N] [--base-rate R]
+    [--risk-premium LEVEL=PCT ...] [--risk-thresholds LOW MEDIUM HIGH]
+    [--scenario FILE.json] [--applicants-file FILE.csv] [--workers N]
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import sys
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.agents import AuraAgent, LenderAgent
+
+APPLICANT_COLUMNS = ("monthly_income", "existing_debt", "requested_amount", "tenure_months", "has_compliance_flags")
+
+DEFAULT_SCENARIO: Dict[str, Any] = {
+    "applicants": 100_000,
+    "seed": 0,
+    # Synthetic applicants; ignored when `applicants_file` is set
+    "population": {
+        "monthly_income": {"median": 4000.0, "sigma": 0.6},  # lognormal
+        "existing_debt": {"median": 3000.0, "sigma": 1.2},
+        "requested_amount": {"median": 2500.0, "sigma": 0.9},
+        "tenure_months": [3, 6, 12, 24, 36, 60],
+        "compliance_flag_rate": 0.03,
+    },
+    "applicants_file": None,
+    # Probability of default is logistic in the rule-based risk score, which
+    # does not depend on the policy being tested
+    "credit": {"pd_midpoint": 60.0, "pd_scale": 12.0, "loss_given_default": 0.6},
+    # Candidate policy; omitted fields keep the agents' current values
+    "policy": {},
+}
+
+
+def current_policy() -> Dict[str, Any]:
+    """The policy the agents apply today."""
+    return {
+        "base_rate": LenderAgent.BASE_RATE,
+        "risk_premium": dict(LenderAgent.RISK_PREMIUM),
+        "risk_thresholds": list(AuraAgent.RISK_LEVEL_THRESHOLDS),
+    }
+
+
+def build_scenario(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """DEFAULT_SCENARIO with `overrides` merged in and the policy filled out."""
+    scenario = _merge(copy.deepcopy(DEFAULT_SCENARIO), overrides or {})
+    policy = _merge(current_policy(), scenario["policy"])
+    
+    thresholds = [float(t) for t in policy["risk_thresholds"]]
+    if len(thresholds) != 3 or thresholds != sorted(thresholds):
+        raise ValueError("risk_thresholds must be three ascending scores")
+    unknown = set(policy["risk_premium"]) - set(AuraAgent.RISK_LEVELS)
+    if unknown:
+        raise ValueError(f"Unknown risk levels in risk_premium: {sorted(unknown)}")
+    if int(scenario["applicants"]) < 1:
+        raise ValueError("applicants must be at least 1")
+    
+    scenario["policy"] = dict(policy, risk_thresholds=thresholds)
+    return scenario
+
+
+def _merge(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+@lru_cache(maxsize=2)
+def _load_applicants(path: str) -> Dict[str, np.ndarray]:
+    """Historical applications from a CSV with a header row of APPLICANT_COLUMNS."""
+    data = np.genfromtxt(path, delimiter=",", names=True, dtype=None, encoding="utf-8")
+    missing = set(APPLICANT_COLUMNS) - set(data.dtype.names or ())
+    if missing:
+        raise ValueError(f"{path} is missing columns: {sorted(missing)}")
+    
+    flags = np.atleast_1d(data["has_compliance_flags"])
+    if flags.dtype.kind in "US":
+        flags = np.isin(np.char.lower(flags.astype(str)), ["1", "true", "yes"])
+    columns = {name: np.atleast_1d(data[name]).astype(np.float64) for name in APPLICANT_COLUMNS[:3]}
+    columns["tenure_months"] = np.atleast_1d(data["tenure_months"]).astype(np.int64)
+    columns["has_compliance_flags"] = flags.astype(bool)
+    return columns
+
+
+def _sample_applicants(rng: np.random.Generator, size: int, scenario: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    if scenario["applicants_file"]:
+        history = _load_applicants(scenario["applicants_file"])
+        rows = rng.integers(0, len(history["tenure_months"]), size)
+        return {name: column[rows] for name, column in history.items()}
+    
+    population = scenario["population"]
+    
+    def lognormal(name: str) -> np.ndarray:
+        spec = population[name]
+        return rng.lognormal(np.log(spec["median"]), spec["sigma"], size)
+    
+    return {
+        "monthly_income": lognormal("monthly_income"),
+        "existing_debt": lognormal("existing_debt"),
+        "requested_amount": lognormal("requested_amount"),
+        "tenure_months": rng.choice(np.asarray(population["tenure_months"], dtype=np.int64), size),
+        "has_compliance_flags": rng.random(size) < population["compliance_flag_rate"],
+    }
+
+
+def _evaluate(
+    policy: Dict[str, Any],
+    applicants: Dict[str, np.ndarray],
+    proof_valid: np.ndarray,
+    score: np.ndarray,
+    pd: np.ndarray,
+    defaults: np.ndarray,
+    loss_given_default: float,
+) -> Dict[str, Any]:
+    """Totals for one shard under one policy."""
+    requested, tenure = applicants["requested_amount"], applicants["tenure_months"]
+    level, recommendation, max_amount = AuraAgent._recommend_batch(
+        score, proof_valid, requested, applicants["monthly_income"], policy["risk_thresholds"]
+    )
+    decision = LenderAgent._decide_batch(
+        score, level, recommendation, max_amount, requested, tenure,
+        base_rate=policy["base_rate"],
+        risk_premium=policy["risk_premium"],
+    )
+    
+    approved = decision["is_approved"]
+    exposure = decision["approved_amount"]
+    interest = decision["monthly_payment"] * decision["adjusted_tenure"] - exposure
+    levels = len(AuraAgent.RISK_LEVELS)
+    return {
+        "applicants": len(score),
+        "approved": int(approved.sum()),
+        "reduced": int((recommendation == 1).sum()),
+        "requested": float(requested.sum()),
+        "exposure": float(exposure.sum()),
+        "expected_loss": float((exposure * pd).sum() * loss_given_default),
+        "simulated_loss": float(exposure[defaults].sum() * loss_given_default),
+        "expected_interest": float((interest * (1 - pd)).sum()),
+        "rate_sum": float(decision["interest_rate"].sum()),
+        "by_level": np.bincount(level, minlength=levels).tolist(),
+        "approved_by_level": np.bincount(level[approved], minlength=levels).tolist(),
+    }
+
+
+def run_shard(scenario: Dict[str, Any], size: int, seed: np.random.SeedSequence) -> Dict[str, Any]:
+    """
+    Sample `size` applicants and total them under the current and candidate policy.
+    
+    Both policies see the same applicants and the same simulated defaults.
+    """
+    rng = np.random.default_rng(seed)
+    applicants = _sample_applicants(rng, size, scenario)
+    income, debt = applicants["monthly_income"], applicants["existing_debt"]
+    requested, tenure = applicants["requested_amount"], applicants["tenure_months"]
+    
+    # The conditions ZKProverService.generate_proof proves
+    income_sufficient = income >= (requested / tenure) * 3
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dti = np.where(income > 0, (debt + requested) / (income * 12), 1.0)
+    dti_acceptable = dti < 0.4
+    no_compliance_flags = ~applicants["has_compliance_flags"]
+    proof_valid = income_sufficient & dti_acceptable & no_compliance_flags
+    
+    income_ratio, dti_ratio = AuraAgent._ratios_batch(requested, tenure, income, debt)
+    score = AuraAgent._rule_scores_batch(
+        proof_valid, income_sufficient, dti_acceptable, no_compliance_flags,
+        income_ratio, dti_ratio, tenure,
+    )
+    
+    credit = scenario["credit"]
+    pd = 1 / (1 + np.exp(-(score - credit["pd_midpoint"]) / credit["pd_scale"]))
+    defaults = rng.random(size) < pd
+    
+    return {
+        name: _evaluate(policy, applicants, proof_valid, score, pd, defaults, credit["loss_given_default"])
+        for name, policy in (("baseline", current_policy()), ("scenario", scenario["policy"]))
+    }
+
+
+def _add(totals: Dict[str, Any], shard: Dict[str, Any]) -> None:
+    for key, value in shard.items():
+        if isinstance(value, dict):
+            _add(totals.setdefault(key, {}), value)
+        elif isinstance(value, list):
+            totals[key] = [a + b for a, b in zip(totals.get(key, [0] * len(value)), value)]
+        else:
+            totals[key] = totals.get(key, 0) + value
+
+
+def summarize(totals: Dict[str, Any]) -> Dict[str, Any]:
+    """Rates and means from one policy's running totals."""
+    applicants, approved, exposure = totals["applicants"], totals["approved"], totals["exposure"]
+    return {
+        "applicants": applicants,
+        "approval_rate": round(approved / applicants, 6),
+        "reduced_rate": round(totals["reduced"] / applicants, 6),
+        "exposure": round(exposure, 2),
+        "exposure_share_of_requested": round(exposure / totals["requested"], 6) if totals["requested"] else 0.0,
+        "mean_apr": round(totals["rate_sum"] / approved, 4) if approved else None,
+        "expected_loss": round(totals["expected_loss"], 2),
+        "expected_loss_rate": round(totals["expected_loss"] / exposure, 6) if exposure else 0.0,
+        "simulated_loss": round(totals["simulated_loss"], 2),
+        "expected_interest": round(totals["expected_interest"], 2),
+        "risk_levels": {
+            level: {
+                "share": round(count / applicants, 6),
+                "approval_rate": round(approved_count / count, 6) if count else None,
+            }
+            for level, count, approved_count in zip(
+                AuraAgent.RISK_LEVELS, totals["by_level"], totals["approved_by_level"]
+            )
+        },
+    }
+
+
+class StressTest:
+    """One scenario, split into seeded shards of at most `shard_size` applicants."""
+    
+    def __init__(
+        self,
+        scenario: Optional[Dict[str, Any]] = None,
+        workers: int = settings.STRESS_TEST_WORKERS,
+        shard_size: int = settings.STRESS_TEST_SHARD_SIZE,
+    ):
+        self.scenario = build_scenario(scenario)
+        self.workers = max(0, workers)
+        applicants = int(self.scenario["applicants"])
+        shard_size = max(1, shard_size)
+        sizes = [shard_size] * (applicants // shard_size)
+        if applicants % shard_size:
+            sizes.append(applicants % shard_size)
+        # Results depend on the seed and shard size, not on the worker count
+        seeds = np.random.SeedSequence(self.scenario["seed"]).spawn(len(sizes))
+        self.shards = list(zip(sizes, seeds))
+    
+    def _progress(self, totals: Dict[str, Any], done: int, started: float) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - started
+        baseline, scenario = summarize(totals["baseline"]), summarize(totals["scenario"])
+        return {
+            "shards_done": done,
+            "shards_total": len(self.shards),
+            "applicants_done": baseline["applicants"],
+            "elapsed_s": round(elapsed, 3),
+            "applicants_per_second": round(baseline["applicants"] / elapsed) if elapsed > 0 else None,
+            "complete": done == len(self.shards),
+            "policy": self.scenario["policy"],
+            "baseline": baseline,
+            "scenario": scenario,
+            "delta": {
+                key: round(scenario[key] - baseline[key], 6)
+                for key in ("approval_rate", "exposure", "expected_loss", "expected_loss_rate", "expected_interest")
+            },
+        }
+    
+    def _pool(self) -> Executor:
+        return ProcessPoolExecutor(max_workers=min(self.workers, len(self.shards)))
+    
+    def run(self) -> Iterator[Dict[str, Any]]:
+        """Yield running totals after every shard; the last one is complete."""
+        started = time.perf_counter()
+        totals: Dict[str, Any] = {}
+        if self.workers == 0:
+            for done, (size, seed) in enumerate(self.shards, 1):
+                _add(totals, run_shard(self.scenario, size, seed))
+                yield self._progress(totals, done, started)
+            return
+        
+        with self._pool() as pool:
+            futures: List[Future] = [pool.submit(run_shard, self.scenario, size, seed) for size, seed in self.shards]
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    _add(totals, future.result())
+                    yield self._progress(totals, done, started)
+            finally:
+                for future in futures:
+                    future.cancel()
+    
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """`run` for the event loop; shards stay off the loop even with 0 workers."""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        totals: Dict[str, Any] = {}
+        pool = self._pool() if self.workers else None
+        try:
+            futures = [
+                loop.run_in_executor(pool, run_shard, self.scenario, size, seed)
+                for size, seed in self.shards
+            ]
+            for done, future in enumerate(asyncio.as_completed(futures), 1):
+                _add(totals, await future)
+                yield self._progress(totals, done, started)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", help="JSON file of DEFAULT_SCENARIO overrides")
+    parser.add_argument("--applicants", type=int)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--applicants-file", help="CSV of historical applications to resample")
+    parser.add_argument("--base-rate", type=float)
+    parser.add_argument("--risk-premium", action="append", default=[], metavar="LEVEL=PCT")
+    parser.add_argument("--risk-thresholds", type=float, nargs=3, metavar=("LOW", "MEDIUM", "HIGH"))
+    parser.add_argument("--workers", type=int, default=settings.STRESS_TEST_WORKERS)
+    parser.add_argument("--shard-size", type=int, default=settings.STRESS_TEST_SHARD_SIZE)
+    parser.add_argument("--quiet", action="store_true", help="Print only the final result")
+    args = parser.parse_args()
+    
+    overrides: Dict[str, Any] = {}
+    if args.scenario:
+        with open(args.scenario) as f:
+            overrides = json.load(f)
+    for key in ("applicants", "seed", "applicants_file"):
+        if getattr(args, key) is not None:
+            overrides[key] = getattr(args, key)
+    policy = overrides.setdefault("policy", {})
+    if args.base_rate is not None:
+        policy["base_rate"] = args.base_rate
+    if args.risk_thresholds:
+        policy["risk_thresholds"] = args.risk_thresholds
+    for item in args.risk_premium:
+        level, _, pct = item.partition("=")
+        policy.setdefault("risk_premium", {})[level] = float(pct)
+    
+    try:
+        stress_test = StressTest(overrides, workers=args.workers, shard_size=args.shard_size)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    # One JSON object per line, like the admin endpoint's stream
+    for progress in stress_test.run():
+        if progress["complete"] or not args.quiet:
+            print(json.dumps(progress), flush=True)
+        if not args.quiet:
+            print(
+                f"{progress['shards_done']}/{progress['shards_total']} shards, "
+                f"{progress['applicants_per_second']} applicants/s",
+                file=sys.stderr,
+            )
+
+
+if __name__ == "__main__":
+    # Run the imported module so pool workers can unpickle run_shard by name
+    from app.jobs import stress_test
+    stress_test.main()
@@ -68,11 +68,56 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await AuraAgent.load_model()
     await LenderAgent.load_model()
     logger.info("AI models loaded successfully")
+    # Follow versions rolled out through the admin API on any worker
+    AuraAgent.models.start_sync()
+    LenderAgent.models.start_sync()
+    
+    # Keep wallet feature hashes in step with loan rows
+    from app.services.feature_store import feature_store, install as install_feature_capture
+    install_feature_capture()
+    
+    # Map the current circuit's keys before the prover pool forks, so
+    # workers inherit the shared mapping
+    from app.services.zk_prover import ZKProverService
+    from app.zk.keystore import key_store
+    from app.zk.setup import SetupUnavailable
+    try:
+        key_store.verification_key(
+            ZKProverService.CIRCUIT_ID,
+            ZKProverService.CIRCUIT_VERSION,
+            ZKProverService.NUM_PUBLIC_INPUTS,
+        )
+        # Parse the circuit and plan its witness solver once, off the loop
+        await asyncio.get_running_loop().run_in_executor(
+            None, key_store.circuit, ZKProverService.CIRCUIT_ID, ZKProverService.CIRCUIT_VERSION
+        )
+    except SetupUnavailable as e:
+        logger.error("ZK setup unavailable, affected proof operations will be refused", error=str(e))
+    
+    # Publish the fixed-base tables once for every API and prover worker
+    from app.zk.fixed_base import publish_tables
+    await asyncio.get_running_loop().run_in_executor(None, publish_tables)
+    
+    # Warm up the ZK prover pool
+    from app.services.prover_pool import prover_executor
+    await prover_executor.start()
+    
+    # Background proof job workers
+    from app.services.proof_jobs import proof_job_queue
+    await proof_job_queue.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down Aura Protocol API")
+    await AuraAgent.models.stop_sync()
+    await LenderAgent.models.stop_sync()
+    await proof_job_queue.stop()
+    await feature_store.flush()
+    prover_executor.shutdown()
+    key_store.close()
+    from app.services.chain_client import chain_client
+    await chain_client.close()
     await redis_client.close()
     await engine.dispose()
 
@@ -2,12 +2,13 @@
 Database models package.
 """
 
-from app.models.loan import LoanApplication, LoanDecision, LoanTransaction
+from app.models.loan import LoanApplication, LoanDecision, LoanRescore, LoanTransaction
 from app.models.proof import ZKProof, ProofVerification
 
 __all__ = [
     "LoanApplication",
     "LoanDecision", 
+    "LoanRescore",
     "LoanTransaction",
     "ZKProof",
     "ProofVerification",
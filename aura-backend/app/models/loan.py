@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import uuid4
 
-from sqlalchemy import Column, String, Float, Integer, Enum, DateTime, ForeignKey, Text, Boolean, JSON
+from sqlalchemy import Column, String, Float, Integer, Enum, DateTime, ForeignKey, Text, Boolean, JSON, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -104,6 +104,52 @@ class LoanDecision(Base):
         return f"<LoanDecision {self.id} - approved={self.is_approved}>"
 
 
+class LoanRescore(Base):
+    """
+    Offline re-score of an application (python -m app.jobs.rescore).
+    
+    Kept apart from LoanDecision, whose terms are the ones the applicant
+    was offered; one row per application and run, with the income the run
+    assumed.
+    """
+    
+    __tablename__ = "loan_rescores"
+    __table_args__ = (UniqueConstraint("run_id", "application_id"),)
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    run_id = Column(UUID(as_uuid=True), nullable=False)
+    application_id = Column(UUID(as_uuid=True), ForeignKey("loan_applications.id"), nullable=False)
+    decision_id = Column(UUID(as_uuid=True), ForeignKey("loan_decisions.id"), nullable=True)
+    
+    # Aura Agent Assessment
+    risk_score = Column(Float, nullable=False)
+    risk_level: Column[RiskLevel] = Column(Enum(RiskLevel), nullable=False)
+    aura_recommendation = Column(String(32), nullable=False)
+    aura_max_amount = Column(Float, nullable=True)
+    aura_confidence = Column(Float, nullable=False)
+    aura_reasoning = Column(Text, nullable=True)
+    
+    # Lender Agent Decision
+    is_approved = Column(Boolean, nullable=False)
+    approved_amount = Column(Float, nullable=True)
+    interest_rate = Column(Float, nullable=True)
+    adjusted_tenure = Column(Integer, nullable=True)
+    monthly_payment = Column(Float, nullable=True)
+    lender_explanation = Column(Text, nullable=True)
+    
+    # Model metadata and the inputs income is not stored for
+    aura_model_version = Column(String(32), nullable=False)
+    lender_model_version = Column(String(32), nullable=False)
+    assumed_monthly_income = Column(Float, nullable=False)
+    assumed_existing_debt = Column(Float, nullable=False)
+    
+    # Timestamps
+    scored_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<LoanRescore {self.application_id} run={self.run_id} - approved={self.is_approved}>"
+
+
 class LoanTransaction(Base):
     """Cardano blockchain transaction record."""
     
@@ -5,7 +5,7 @@ Zero-Knowledge Proof models.
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey, Boolean, JSON, Text
+from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey, Boolean, JSON, LargeBinary, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -22,7 +22,7 @@ class ZKProof(Base):
     
     # Proof data
     proof_hash = Column(String(64), nullable=False, unique=True, index=True)
-    proof_data = Column(Text, nullable=False)  # Serialized proof (pi_a, pi_b, pi_c)
+    proof_data = Column(LargeBinary, nullable=False)  # Compressed proof (app.zk.codec, 128 bytes)
     public_signals = Column(JSON, nullable=False)
     
     # Validity
@@ -6,10 +6,16 @@ from app.schemas.loan import (
     LoanApplicationCreate,
     LoanApplicationResponse,
     LoanDecisionResponse,
+    UnderwriteRequest,
 )
 from app.schemas.proof import (
     ProofGenerateRequest,
     ProofGenerateResponse,
+    ProofBatchGenerateRequest,
+    ProofJobRequest,
+    ProofJobResponse,
+    ProofBatchVerifyRequest,
+    ProofBatchVerifyResponse,
 )
 from app.schemas.settlement import (
     DisbursementRequest,
@@ -21,8 +27,14 @@ __all__ = [
     "LoanApplicationCreate",
     "LoanApplicationResponse",
     "LoanDecisionResponse",
+    "UnderwriteRequest",
     "ProofGenerateRequest",
     "ProofGenerateResponse",
+    "ProofBatchGenerateRequest",
+    "ProofJobRequest",
+    "ProofJobResponse",
+    "ProofBatchVerifyRequest",
+    "ProofBatchVerifyResponse",
     "DisbursementRequest",
     "DisbursementResponse",
     "TransactionVerifyResponse",
@@ -8,6 +8,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator
 
+from app.schemas.proof import ProofGenerateRequest
+
 
 class LoanApplicationCreate(BaseModel):
     """Schema for creating a new loan application."""
@@ -48,6 +50,10 @@ class LoanApplicationResponse(BaseModel):
         from_attributes = True
 
 
+class UnderwriteRequest(ProofGenerateRequest):
+    """Request to prove, assess and decide on an application in one call."""
+
+
 class AuraAssessmentResponse(BaseModel):
     """Schema for Aura agent risk assessment."""
     
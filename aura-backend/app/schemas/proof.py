@@ -3,10 +3,12 @@ ZK Proof Pydantic schemas.
 """
 
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from app.core.config import settings
 
 
 class ProofGenerateRequest(BaseModel):
@@ -25,6 +27,23 @@ class ProofGenerateRequest(BaseModel):
     has_compliance_flags: bool = False
 
 
+class ProofBatchGenerateRequest(BaseModel):
+    """Request to generate proofs for several applications at once."""
+    
+    applications: List[ProofGenerateRequest] = Field(
+        ..., min_length=1, max_length=settings.ZK_PROVE_BATCH_MAX
+    )
+
+
+class ProofJobRequest(ProofGenerateRequest):
+    """
+    Request to generate a proof in the background.
+    
+    The queue priority is derived from the application's wallet on the
+    server, never taken from the request.
+    """
+
+
 class ProofCircuitMetadata(BaseModel):
     """ZK circuit metadata."""
     
@@ -45,6 +64,14 @@ class ProofConditions(BaseModel):
     no_compliance_flags: bool
 
 
+class ProofTrace(BaseModel):
+    """Per-phase timings of one proof generation."""
+    
+    phases_ms: Dict[str, float]
+    total_ms: float
+    cache_hit: bool
+
+
 class ProofGenerateResponse(BaseModel):
     """Response schema for ZK proof generation."""
     
@@ -65,6 +92,23 @@ class ProofGenerateResponse(BaseModel):
     public_signals: list
     
     generated_at: datetime
+    
+    # Set when requested with ?trace=true
+    trace: Optional[ProofTrace] = None
+
+
+class ProofJobResponse(BaseModel):
+    """Status of a background proof job; `result` is set once it is done."""
+    
+    job_id: UUID
+    status: Literal["queued", "running", "done", "failed"]
+    priority: str
+    submitted_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    proof_hash: Optional[str] = None
+    error: Optional[str] = None
+    result: Optional[ProofGenerateResponse] = None
 
 
 class ProofVerifyRequest(BaseModel):
@@ -81,3 +125,43 @@ class ProofVerifyResponse(BaseModel):
     verification_time_ms: int
     verifier_type: str
     verified_at: datetime
+
+
+class ProofBatchVerifyItem(BaseModel):
+    """A proof to verify, by cached hash or inline."""
+    
+    proof_hash: Optional[str] = Field(None, min_length=64)
+    proof_data: Optional[Dict[str, Any]] = None
+    public_signals: Optional[list] = None
+    
+    @model_validator(mode="after")
+    def check_source(self) -> "ProofBatchVerifyItem":
+        inline = self.proof_data is not None and self.public_signals is not None
+        if not inline and self.proof_hash is None:
+            raise ValueError("Provide proof_hash or both proof_data and public_signals")
+        return self
+
+
+class ProofBatchVerifyRequest(BaseModel):
+    """Request to verify several proofs in one randomized batch."""
+    
+    proofs: List[ProofBatchVerifyItem] = Field(..., min_length=1, max_length=settings.ZK_VERIFY_BATCH_MAX)
+
+
+class ProofBatchVerifyResult(BaseModel):
+    """Verification outcome for one proof in a batch."""
+    
+    index: int
+    proof_hash: Optional[str] = None
+    is_verified: bool
+    error: Optional[str] = None
+
+
+class ProofBatchVerifyResponse(BaseModel):
+    """Batch proof verification response."""
+    
+    all_verified: bool
+    results: List[ProofBatchVerifyResult]
+    verification_time_ms: int
+    verifier_type: str
+    verified_at: datetime
@@ -2,17 +2,154 @@
 AI Agent services for risk assessment and loan decisions.
 """
 
+import asyncio
+import math
+import os
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence, Set, Tuple
 from uuid import uuid4
 
 import structlog
 import numpy as np
+from prometheus_client import Histogram
 
 from app.core.config import settings
+from app.services.amortization import monthly_payment
+from app.services.assessment_memo import AssessmentMemo
+from app.services.feature_store import WALLET_FEATURES, feature_store
+from app.services.model_registry import ModelRegistry
+from app.services.model_runtime import (
+    MODEL_FALLBACKS,
+    predict_scores,
+    run_inference,
+)
 
 logger = structlog.get_logger(__name__)
 
+MODEL_BATCH_SIZE = Histogram(
+    "aura_model_batch_size",
+    "Rows scored per model call by the inference batcher",
+    ["model"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+MODEL_BATCH_QUEUE_DELAY = Histogram(
+    "aura_model_batch_queue_seconds",
+    "Time a row waited in the inference batcher before its batch was dispatched",
+    ["model"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+
+def _uuid4_batch(count: int) -> List[str]:
+    """`str(uuid4())` for `count` ids, from one urandom call."""
+    raw = np.frombuffer(os.urandom(16 * count), dtype=np.uint8).reshape(count, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    hex_ids = raw.tobytes().hex()
+    return [
+        f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+        for h in (hex_ids[i:i + 32] for i in range(0, 32 * count, 32))
+    ]
+
+
+def _round_batch(values: np.ndarray, digits: int) -> np.ndarray:
+    """
+    Python's round(value, digits) for every element.
+    
+    np.round agrees with round() except when the scaled value lies within
+    rounding error of a .5 boundary; those rows fall back to round().
+    """
+    scale = 10.0 ** digits
+    scaled = values * scale
+    rounded = np.round(scaled) / scale
+    fraction = scaled - np.floor(scaled)
+    near_tie = np.abs(fraction - 0.5) <= 1e-9 * np.maximum(1.0, np.abs(scaled))
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(float(values[i]), digits)
+    return rounded
+
+
+class InferenceBatcher:
+    """
+    Coalesces concurrent single-row predictions into one model call.
+    
+    A row waits at most `max_wait_ms` for others to join its batch, and a
+    batch is dispatched as soon as it holds `max_batch_size` rows. Raising
+    the wait trades p50 latency for fewer, larger calls; with a wait of 0
+    only calls made in the same event loop iteration are combined. Each
+    caller's future resolves to its own row's score.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        max_batch_size: int = settings.MODEL_BATCH_MAX_SIZE,
+        max_wait_ms: float = settings.MODEL_BATCH_MAX_WAIT_MS,
+    ):
+        self.name = name
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._model = None
+        self._rows: List[np.ndarray] = []
+        self._futures: List[asyncio.Future] = []
+        self._enqueued: List[float] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def predict(self, model: Any, row: np.ndarray) -> float:
+        """Score one feature row with `model`, batched with concurrent callers."""
+        if self._rows and model is not self._model:
+            # A batch goes to a single model
+            self._dispatch()
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._model = model
+        self._rows.append(row)
+        self._futures.append(future)
+        self._enqueued.append(time.perf_counter())
+        
+        if len(self._rows) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._dispatch)
+        return await future
+    
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._rows:
+            return
+        
+        model, rows, futures = self._model, self._rows, self._futures
+        now = time.perf_counter()
+        MODEL_BATCH_SIZE.labels(model=self.name).observe(len(rows))
+        for enqueued in self._enqueued:
+            MODEL_BATCH_QUEUE_DELAY.labels(model=self.name).observe(now - enqueued)
+        self._model, self._rows, self._futures, self._enqueued = None, [], [], []
+        
+        task = asyncio.ensure_future(self._run(model, rows, futures))
+        # Hold a reference until the task finishes, or callers could wait forever
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, model: Any, rows: List[np.ndarray], futures: List[asyncio.Future]) -> None:
+        try:
+            scores = await run_inference(self.name, predict_scores, model, np.vstack(rows))
+        except asyncio.CancelledError:
+            for future in futures:
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, score in zip(futures, scores.tolist()):
+            if not future.done():
+                future.set_result(score)
+
 
 class AuraAgent:
     """
@@ -22,20 +159,94 @@ class AuraAgent:
     a comprehensive risk score and lending recommendation.
     """
     
+    # Reported for rule-based scoring and for the model loaded at startup
     MODEL_VERSION = "aura-risk-v2.3.1"
-    _model = None
+    models = ModelRegistry("aura")
+    memo = AssessmentMemo(
+        "aura",
+        steps={
+            "requested_amount": settings.AGENT_MEMO_AMOUNT_STEP,
+            "monthly_income": settings.AGENT_MEMO_INCOME_STEP,
+            "existing_debt": settings.AGENT_MEMO_INCOME_STEP,
+        },
+        id_field="assessment_id",
+        # Never assess a larger loan, more income or less debt than given
+        rounding={"requested_amount": math.floor, "monthly_income": math.floor, "existing_debt": math.ceil},
+    )
+    _batcher = InferenceBatcher("aura")
+    
+    # Model input columns, in order. A classifier's last-class probability
+    # is scaled to 0-100; a regressor predicts the 0-100 score directly.
+    FEATURES = (
+        "proof_valid",
+        "income_sufficient",
+        "dti_acceptable",
+        "no_compliance_flags",
+        "income_ratio",
+        "dti_ratio",
+        "tenure_months",
+    )
+    # A model trained with FEATURES + WALLET_FEATURES also gets the
+    # applicant's history from the feature store
+    WALLET_MODEL_FEATURES = FEATURES + WALLET_FEATURES
+    
+    # Risk levels and the scores below which each of the first three applies
+    RISK_LEVELS = ("low", "medium", "high", "critical")
+    RISK_LEVEL_THRESHOLDS = (25, 50, 75)
+    # Recommendation codes used by the vectorized helpers
+    RECOMMENDATIONS = ("approve", "reduce_amount", "reject")
     
     @classmethod
     async def load_model(cls):
-        """Load the risk assessment ML model."""
+        """Activate the risk model at AURA_MODEL_PATH; without one, scoring uses the rules."""
         try:
-            # In production, load actual model
-            # cls._model = joblib.load(settings.AURA_MODEL_PATH)
-            cls._model = "loaded"  # Placeholder
-            logger.info("Aura model loaded", version=cls.MODEL_VERSION)
+            await cls.models.activate(settings.AURA_MODEL_PATH, cls.MODEL_VERSION)
         except Exception as e:
             logger.warning("Could not load Aura model, using rule-based fallback", error=str(e))
-            cls._model = None
+    
+    @classmethod
+    async def _model_risk_scores(
+        cls,
+        features: np.ndarray,
+        wallets: Optional[Sequence[str]] = None,
+    ) -> Tuple[Optional[np.ndarray], str]:
+        """
+        Model risk scores (0-100) for rows of FEATURES and the version that
+        produced them. Scores are None when the rules should be used.
+        
+        Wallet features for `wallets` are read in one pipelined call, and
+        only when the active model takes them; rows without a wallet score
+        as having no history.
+        """
+        loaded = cls.models.active
+        if loaded is None:
+            MODEL_FALLBACKS.labels(model="aura", reason="not_loaded").inc()
+            return None, cls.MODEL_VERSION
+        model = loaded.model
+        if getattr(model, "n_features_in_", None) == len(cls.WALLET_MODEL_FEATURES):
+            try:
+                if wallets:
+                    history = await feature_store.vectors(wallets)
+                else:
+                    history = np.zeros((len(features), len(WALLET_FEATURES)))
+            except Exception as e:
+                logger.warning("Wallet features unavailable, using rule-based scoring", error=str(e))
+                MODEL_FALLBACKS.labels(model="aura", reason="features").inc()
+                return None, cls.MODEL_VERSION
+            features = np.hstack([features, history])
+        try:
+            if len(features) == 1:
+                scores = np.array([await cls._batcher.predict(model, features[0])])
+            else:
+                scores = await run_inference("aura", predict_scores, model, features)
+        except Exception as e:
+            logger.warning("Aura model inference failed, using rule-based scoring", error=str(e))
+            MODEL_FALLBACKS.labels(model="aura", reason="error").inc()
+            return None, cls.MODEL_VERSION
+        cls.models.shadow(features, scores)
+        if hasattr(model, "predict_proba"):
+            scores = scores * 100
+        return np.minimum(100, np.maximum(0, scores)), loaded.version
     
     @classmethod
     async def assess_risk(
@@ -48,11 +259,14 @@ class AuraAgent:
         tenure_months: int,
         monthly_income: float,
         existing_debt: float,
+        wallet_address: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Perform comprehensive risk assessment.
         
         Returns risk score, level, recommendation, and reasoning.
+        `wallet_address` adds the applicant's history for models trained
+        with wallet features.
         """
         start_time = time.time()
         
@@ -61,23 +275,36 @@ class AuraAgent:
         income_ratio = monthly_repayment / monthly_income if monthly_income > 0 else 1.0
         dti_ratio = (existing_debt + requested_amount) / (monthly_income * 12) if monthly_income > 0 else 1.0
         
-        # Rule-based risk scoring (in production, use ML model)
-        risk_score = cls._calculate_risk_score(
+        # Model scoring, with the rules as fallback
+        model_scores, model_version = await cls._model_risk_scores(np.array([[
             proof_valid,
             income_sufficient,
             dti_acceptable,
             no_compliance_flags,
             income_ratio,
             dti_ratio,
-            tenure_months
-        )
+            tenure_months,
+        ]], dtype=np.float64), [wallet_address] if wallet_address else None)
+        if model_scores is not None:
+            risk_score = float(model_scores[0])
+        else:
+            risk_score = cls._calculate_risk_score(
+                proof_valid,
+                income_sufficient,
+                dti_acceptable,
+                no_compliance_flags,
+                income_ratio,
+                dti_ratio,
+                tenure_months
+            )
         
         # Determine risk level
-        if risk_score < 25:
+        low, medium, high = cls.RISK_LEVEL_THRESHOLDS
+        if risk_score < low:
             risk_level = "low"
-        elif risk_score < 50:
+        elif risk_score < medium:
             risk_level = "medium"
-        elif risk_score < 75:
+        elif risk_score < high:
             risk_level = "high"
         else:
             risk_level = "critical"
@@ -118,7 +345,8 @@ class AuraAgent:
             "max_approved_amount": max_amount,
             "confidence": round(confidence, 3),
             "reasoning": reasoning,
-            "model_version": cls.MODEL_VERSION,
+            "model_version": model_version,
+            "scoring": "rules" if model_scores is None else "model",
             "processing_time_ms": processing_time,
             "factors": {
                 "income_ratio": round(income_ratio, 4),
@@ -128,6 +356,316 @@ class AuraAgent:
             }
         }
     
+    @classmethod
+    async def assess_risk_memoized(
+        cls,
+        wallet_address: Optional[str] = None,
+        **application: Any,
+    ) -> Dict[str, Any]:
+        """
+        `assess_risk` through the memo, on inputs quantized to the
+        AGENT_MEMO_* steps in the direction `memo.rounding` gives.
+        Assessments for a wallet depend on their live history and are not
+        cached.
+        """
+        if wallet_address is not None:
+            return {**await cls.assess_risk(**application, wallet_address=wallet_address), "from_cache": False}
+        loaded = cls.models.active
+        scoring = "model" if loaded else "rules"
+        version = loaded.version if loaded else cls.MODEL_VERSION
+        return await cls.memo.call(
+            (scoring, version),
+            application,
+            cls.assess_risk,
+            # A model failure mid-call falls back to the rules; don't keep that
+            cacheable=lambda result: (result["scoring"], result["model_version"]) == (scoring, version),
+        )
+    
+    @classmethod
+    async def assess_risk_batch(
+        cls,
+        proof_valid: Sequence[bool],
+        income_sufficient: Sequence[bool],
+        dti_acceptable: Sequence[bool],
+        no_compliance_flags: Sequence[bool],
+        requested_amount: Sequence[float],
+        tenure_months: Sequence[int],
+        monthly_income: Sequence[float],
+        existing_debt: Sequence[float],
+        wallet_address: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Risk assessment for many applicants, given as columns.
+        
+        Scores, levels, recommendations and confidence are computed for the
+        whole batch with NumPy masks; each result equals `assess_risk` for
+        the same row apart from its id and timing.
+        """
+        start_time = time.time()
+        
+        inputs = (
+            np.asarray(proof_valid, dtype=bool),
+            np.asarray(income_sufficient, dtype=bool),
+            np.asarray(dti_acceptable, dtype=bool),
+            np.asarray(no_compliance_flags, dtype=bool),
+            np.asarray(requested_amount, dtype=np.float64),
+            np.asarray(tenure_months, dtype=np.int64),
+            np.asarray(monthly_income, dtype=np.float64),
+            np.asarray(existing_debt, dtype=np.float64),
+        )
+        cls._check_columns(*inputs)
+        if wallet_address is not None and len(wallet_address) != len(inputs[0]):
+            raise ValueError("wallet_address must have one entry per applicant")
+        
+        # One inference call for the whole batch
+        income_ratio, dti_ratio = cls._ratios_batch(*inputs[4:])
+        model_scores, model_version = await cls._model_risk_scores(np.column_stack([
+            *inputs[:4], income_ratio, dti_ratio, inputs[5],
+        ]).astype(np.float64), wallet_address)
+        scoring = "rules" if model_scores is None else "model"
+        
+        columns = cls._score_batch(*inputs, risk_score=model_scores)
+        
+        count = len(columns["risk_score"])
+        processing_time = int((time.time() - start_time) * 1000 / max(1, count))
+        # Reduced amounts are rounded to cents; approved ones pass through
+        max_amount = columns["max_approved_amount"]
+        max_amount = np.where(
+            columns["recommendation"] == "reduce_amount", _round_batch(max_amount, 2), max_amount
+        ).astype(object)
+        max_amount[columns["recommendation"] == "reject"] = None
+        
+        rows = zip(
+            _uuid4_batch(count),
+            _round_batch(columns["risk_score"], 2).tolist(),
+            columns["risk_level"].tolist(),
+            columns["recommendation"].tolist(),
+            max_amount.tolist(),
+            _round_batch(columns["confidence"], 3).tolist(),
+            columns["reasoning"],
+            _round_batch(columns["income_ratio"], 4).tolist(),
+            _round_batch(columns["dti_ratio"], 4).tolist(),
+            columns["proof_valid"].tolist(),
+            columns["no_compliance_flags"].tolist(),
+        )
+        results = [
+            {
+                "assessment_id": assessment_id,
+                "risk_score": score,
+                "risk_level": level,
+                "recommendation": recommendation,
+                "max_approved_amount": approved,
+                "confidence": confidence,
+                "reasoning": reasoning,
+                "model_version": model_version,
+                "scoring": scoring,
+                "processing_time_ms": processing_time,
+                "factors": {
+                    "income_ratio": income_ratio,
+                    "dti_ratio": dti_ratio,
+                    "proof_valid": valid,
+                    "compliance_clear": clear,
+                },
+            }
+            for (
+                assessment_id, score, level, recommendation, approved, confidence, reasoning,
+                income_ratio, dti_ratio, valid, clear,
+            ) in rows
+        ]
+        
+        logger.info(
+            "Aura batch assessment complete",
+            count=count,
+            total_time_ms=int((time.time() - start_time) * 1000),
+        )
+        return results
+    
+    @classmethod
+    def _score_batch(
+        cls,
+        proof_valid: np.ndarray,
+        income_sufficient: np.ndarray,
+        dti_acceptable: np.ndarray,
+        no_compliance_flags: np.ndarray,
+        requested_amount: np.ndarray,
+        tenure_months: np.ndarray,
+        monthly_income: np.ndarray,
+        existing_debt: np.ndarray,
+        risk_score: Optional[np.ndarray] = None,
+    ) -> Dict[str, Any]:
+        """
+        Vectorized `_calculate_risk_score`, `_generate_recommendation`,
+        `_calculate_confidence` and `_generate_reasoning`.
+        
+        Uses the same float64 operations in the same order as the scalar
+        helpers. A given `risk_score` (from the model) replaces the rule-based
+        score. max_approved_amount is NaN where the scalar path gives None.
+        """
+        cls._check_columns(
+            proof_valid, income_sufficient, dti_acceptable, no_compliance_flags,
+            requested_amount, tenure_months, monthly_income, existing_debt,
+        )
+        income_ratio, dti_ratio = cls._ratios_batch(requested_amount, tenure_months, monthly_income, existing_debt)
+        
+        if risk_score is not None:
+            score = risk_score
+        else:
+            score = cls._rule_scores_batch(
+                proof_valid, income_sufficient, dti_acceptable, no_compliance_flags,
+                income_ratio, dti_ratio, tenure_months,
+            )
+        
+        level, recommendation, max_approved_amount = cls._recommend_batch(
+            score, proof_valid, requested_amount, monthly_income
+        )
+        risk_level = np.array(cls.RISK_LEVELS)[level]
+        recommendation = np.array(cls.RECOMMENDATIONS)[recommendation]
+        
+        confidence = np.select(
+            [
+                proof_valid & income_sufficient & dti_acceptable,
+                ~proof_valid,
+                income_sufficient | dti_acceptable,
+            ],
+            [0.95, 0.98, 0.88],
+            default=0.82,
+        )
+        
+        return {
+            "risk_score": score,
+            "risk_level": risk_level,
+            "recommendation": recommendation,
+            "max_approved_amount": max_approved_amount,
+            "confidence": confidence,
+            "reasoning": cls._generate_reasoning_batch(
+                score, risk_level, recommendation, income_ratio, dti_ratio, no_compliance_flags
+            ),
+            "income_ratio": income_ratio,
+            "dti_ratio": dti_ratio,
+            "proof_valid": proof_valid,
+            "no_compliance_flags": no_compliance_flags,
+        }
+    
+    @staticmethod
+    def _rule_scores_batch(
+        proof_valid: np.ndarray,
+        income_sufficient: np.ndarray,
+        dti_acceptable: np.ndarray,
+        no_compliance_flags: np.ndarray,
+        income_ratio: np.ndarray,
+        dti_ratio: np.ndarray,
+        tenure_months: np.ndarray,
+    ) -> np.ndarray:
+        """Vectorized `_calculate_risk_score`, accumulated in the scalar order."""
+        score = np.zeros(len(proof_valid))
+        score += np.where(proof_valid, 0.0, 40.0)
+        score += np.where(income_sufficient, np.maximum(0, (income_ratio - 0.2) * 30), 20.0)
+        score += np.where(dti_acceptable, np.maximum(0, (dti_ratio - 0.2) * 25), 20.0)
+        score += np.where(no_compliance_flags, 0.0, 30.0)
+        score += np.minimum(5, tenure_months / 12)
+        return np.minimum(100, np.maximum(0, score))
+    
+    @classmethod
+    def _recommend_batch(
+        cls,
+        score: np.ndarray,
+        proof_valid: np.ndarray,
+        requested_amount: np.ndarray,
+        monthly_income: np.ndarray,
+        thresholds: Optional[Sequence[float]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized risk levels and `_generate_recommendation`.
+        
+        Returns indices into RISK_LEVELS and RECOMMENDATIONS, and the max
+        approved amount (NaN where the scalar path gives None). `thresholds`
+        replaces RISK_LEVEL_THRESHOLDS, e.g. to evaluate a candidate policy.
+        """
+        low, medium, high = cls.RISK_LEVEL_THRESHOLDS if thresholds is None else thresholds
+        level = np.select([score < low, score < medium, score < high], [0, 1, 2], default=3)
+        
+        high_ok = monthly_income * 2 >= requested_amount * 0.3
+        conditions = [~proof_valid, level == 0, level == 1, (level == 2) & high_ok]
+        recommendation = np.select(conditions, [2, 0, 1, 1], default=2)
+        max_approved_amount = np.select(
+            conditions,
+            [np.nan, requested_amount, np.minimum(requested_amount, monthly_income * 4), monthly_income * 2],
+            default=np.nan,
+        )
+        return level, recommendation, max_approved_amount
+    
+    @staticmethod
+    def _check_columns(*columns: np.ndarray) -> None:
+        names = (
+            "proof_valid", "income_sufficient", "dti_acceptable", "no_compliance_flags",
+            "requested_amount", "tenure_months", "monthly_income", "existing_debt",
+        )
+        count = len(columns[0])
+        for name, column in zip(names, columns):
+            if len(column) != count:
+                raise ValueError(f"{name} has {len(column)} rows, expected {count}")
+        if np.any(columns[5] == 0):
+            raise ValueError("tenure_months must be non-zero")
+    
+    @staticmethod
+    def _ratios_batch(
+        requested_amount: np.ndarray,
+        tenure_months: np.ndarray,
+        monthly_income: np.ndarray,
+        existing_debt: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Income and DTI ratios, as in `assess_risk` (1.0 without income)."""
+        monthly_repayment = requested_amount / tenure_months
+        has_income = monthly_income > 0
+        income_ratio = np.ones(len(requested_amount))
+        np.divide(monthly_repayment, monthly_income, out=income_ratio, where=has_income)
+        dti_ratio = np.ones(len(requested_amount))
+        np.divide(existing_debt + requested_amount, monthly_income * 12, out=dti_ratio, where=has_income)
+        return income_ratio, dti_ratio
+    
+    @classmethod
+    def _generate_reasoning_batch(
+        cls,
+        risk_score: np.ndarray,
+        risk_level: np.ndarray,
+        recommendation: np.ndarray,
+        income_ratio: np.ndarray,
+        dti_ratio: np.ndarray,
+        no_compliance_flags: np.ndarray,
+    ) -> List[str]:
+        """`_generate_reasoning` for every row; sentences are picked with masks."""
+        income_text = np.select(
+            [income_ratio < 0.25, income_ratio < 0.33],
+            ["Income coverage is excellent.", "Income coverage is adequate."],
+            default="Income coverage is marginal.",
+        )
+        dti_text = np.select(
+            [dti_ratio < 0.3, dti_ratio < 0.4],
+            ["Debt-to-income ratio is healthy.", "DTI ratio is acceptable but elevated."],
+            default="DTI ratio exceeds acceptable threshold.",
+        )
+        compliance_text = np.where(
+            no_compliance_flags, "", " Compliance flags require additional review."
+        )
+        recommendation_text = np.select(
+            [recommendation == "approve", recommendation == "reduce_amount"],
+            ["Recommendation: Approve at requested terms.", "Recommendation: Approve with reduced principal."],
+            default="Recommendation: Decline application.",
+        )
+        
+        return [
+            f"Risk assessment complete with score {score:.1f}/100 ({level} risk). "
+            f"{income} {dti}{compliance} {rec}"
+            for score, level, income, dti, compliance, rec in zip(
+                risk_score.tolist(),
+                risk_level.tolist(),
+                income_text.tolist(),
+                dti_text.tolist(),
+                compliance_text.tolist(),
+                recommendation_text.tolist(),
+            )
+        ]
+    
     @classmethod
     def _calculate_risk_score(
         cls,
@@ -265,8 +803,21 @@ class LenderAgent:
     determines interest rates, and structures loan terms.
     """
     
+    # Reported for rule-based pricing and for the model loaded at startup
     MODEL_VERSION = "lender-decision-v1.8.2"
-    _model = None
+    models = ModelRegistry("lender")
+    memo = AssessmentMemo(
+        "lender",
+        steps={
+            "risk_score": settings.AGENT_MEMO_SCORE_STEP,
+            "max_approved_amount": settings.AGENT_MEMO_AMOUNT_STEP,
+            "requested_amount": settings.AGENT_MEMO_AMOUNT_STEP,
+        },
+        id_field="decision_id",
+        # Never approve more than was asked for or the assessment allows
+        rounding={"max_approved_amount": math.floor, "requested_amount": math.floor},
+    )
+    _batcher = InferenceBatcher("lender")
     
     # Interest rate configuration
     BASE_RATE = 8.5  # Base APR %
@@ -277,14 +828,58 @@ class LenderAgent:
         "critical": 10.0
     }
     
+    # Pricing model input columns, in order; the model predicts the APR
+    FEATURES = ("risk_score", "risk_premium", "approved_amount", "requested_tenure")
+    
+    # Assessment fields make_decision reads, and so the memo keys on
+    MEMO_ASSESSMENT_FIELDS = ("recommendation", "risk_level", "risk_score", "max_approved_amount", "reasoning")
+    
+    # Score each risk level is quoted at on the price grid (middle of its band);
+    # critical applications are always rejected, so they have no quote
+    QUOTE_RISK_SCORES = {
+        "low": 12.5,
+        "medium": 37.5,
+        "high": 62.5,
+    }
+    
     @classmethod
     async def load_model(cls):
-        """Load the decision ML model."""
+        """Activate the pricing model at LENDER_MODEL_PATH; without one, rates use the rules."""
+        try:
+            await cls.models.activate(settings.LENDER_MODEL_PATH, cls.MODEL_VERSION)
+        except Exception as e:
+            logger.warning("Could not load Lender model, using rule-based pricing", error=str(e))
+    
+    @classmethod
+    async def _model_interest_rate(
+        cls,
+        risk_level: str,
+        risk_score: float,
+        approved_amount: float,
+        requested_tenure: int,
+    ) -> Tuple[Optional[float], str]:
+        """
+        APR from the pricing model, clamped like the rules, and the version
+        that produced it. The rate is None when the rules should be used.
+        """
+        loaded = cls.models.active
+        if loaded is None:
+            MODEL_FALLBACKS.labels(model="lender", reason="not_loaded").inc()
+            return None, cls.MODEL_VERSION
+        features = np.array([
+            risk_score,
+            cls.RISK_PREMIUM.get(risk_level, 5.0),
+            approved_amount,
+            requested_tenure,
+        ], dtype=np.float64)
         try:
-            cls._model = "loaded"
-            logger.info("Lender model loaded", version=cls.MODEL_VERSION)
+            rate = await cls._batcher.predict(loaded.model, features)
         except Exception as e:
-            logger.warning("Could not load Lender model", error=str(e))
+            logger.warning("Lender model inference failed, using rule-based pricing", error=str(e))
+            MODEL_FALLBACKS.labels(model="lender", reason="error").inc()
+            return None, cls.MODEL_VERSION
+        cls.models.shadow(features[None, :], np.array([rate]))
+        return round(min(25.0, max(5.0, rate)), 2), loaded.version
     
     @classmethod
     async def make_decision(
@@ -315,8 +910,13 @@ class LenderAgent:
             else:
                 approved_amount = min(max_amount or requested_amount * 0.7, requested_amount)
             
-            # Calculate interest rate
-            interest_rate = cls._calculate_interest_rate(risk_level, risk_score)
+            # Calculate interest rate (pricing model, with the rules as fallback)
+            interest_rate, model_version = await cls._model_interest_rate(
+                risk_level, risk_score, approved_amount, requested_tenure
+            )
+            pricing = "rules" if interest_rate is None else "model"
+            if interest_rate is None:
+                interest_rate = cls._calculate_interest_rate(risk_level, risk_score)
             
             # Adjust tenure if needed
             adjusted_tenure = cls._adjust_tenure(
@@ -345,6 +945,8 @@ class LenderAgent:
             interest_rate = None
             adjusted_tenure = None
             monthly_payment = None
+            pricing = None
+            model_version = cls.MODEL_VERSION
             explanation = cls._generate_rejection_explanation(
                 aura_assessment["reasoning"],
                 risk_score
@@ -360,7 +962,8 @@ class LenderAgent:
             "adjusted_tenure": adjusted_tenure,
             "monthly_payment": monthly_payment,
             "explanation": explanation,
-            "model_version": cls.MODEL_VERSION,
+            "model_version": model_version,
+            "pricing": pricing,
             "processing_time_ms": processing_time,
             "terms": {
                 "apr": interest_rate,
@@ -369,6 +972,32 @@ class LenderAgent:
             } if is_approved else None
         }
     
+    @classmethod
+    async def make_decision_memoized(
+        cls,
+        aura_assessment: Dict[str, Any],
+        requested_amount: float,
+        requested_tenure: int,
+    ) -> Dict[str, Any]:
+        """`make_decision` through the memo, keyed on the assessment fields it reads."""
+        loaded = cls.models.active
+        pricing = "model" if loaded else "rules"
+        version = loaded.version if loaded else cls.MODEL_VERSION
+        inputs = {name: aura_assessment[name] for name in cls.MEMO_ASSESSMENT_FIELDS if name in aura_assessment}
+        
+        async def decide(requested_amount: float, requested_tenure: int, **assessment: Any) -> Dict[str, Any]:
+            return await cls.make_decision(assessment, requested_amount, requested_tenure)
+        
+        return await cls.memo.call(
+            (pricing, version),
+            {**inputs, "requested_amount": requested_amount, "requested_tenure": requested_tenure},
+            decide,
+            # Rejections are not priced; approvals must be priced the expected way
+            cacheable=lambda result: (
+                result["pricing"] is None or (result["pricing"], result["model_version"]) == (pricing, version)
+            ),
+        )
+    
     @classmethod
     def _calculate_interest_rate(cls, risk_level: str, risk_score: float) -> float:
         """Calculate APR based on risk profile."""
@@ -402,6 +1031,126 @@ class LenderAgent:
         
         return requested_tenure
     
+    @classmethod
+    def _adjust_tenure_batch(
+        cls,
+        requested_tenure: np.ndarray,
+        risk_level: np.ndarray,
+        approved_amount: np.ndarray,
+        requested_amount: np.ndarray,
+    ) -> np.ndarray:
+        """_adjust_tenure for broadcastable arrays."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            adjusted = (requested_tenure * (approved_amount / requested_amount)).astype(np.int64)
+        adjusted = np.maximum(3, np.minimum(adjusted, requested_tenure))
+        reduce = ~np.isin(risk_level, ["low", "medium"]) & (approved_amount < requested_amount)
+        return np.where(reduce, adjusted, requested_tenure)
+    
+    @classmethod
+    def _decide_batch(
+        cls,
+        risk_score: np.ndarray,
+        risk_level: np.ndarray,
+        recommendation: np.ndarray,
+        max_approved_amount: np.ndarray,
+        requested_amount: np.ndarray,
+        requested_tenure: np.ndarray,
+        base_rate: Optional[float] = None,
+        risk_premium: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Rule-based make_decision for arrays of assessments.
+        
+        `risk_level` and `recommendation` are AuraAgent._recommend_batch
+        codes. `base_rate` and `risk_premium` replace BASE_RATE and
+        RISK_PREMIUM, e.g. to evaluate a candidate policy. Terms are zero
+        where the application is rejected.
+        """
+        base = cls.BASE_RATE if base_rate is None else base_rate
+        premiums = cls.RISK_PREMIUM if risk_premium is None else risk_premium
+        premium = np.array([premiums.get(level, 5.0) for level in AuraAgent.RISK_LEVELS])[risk_level]
+        
+        is_approved = recommendation != 2
+        # `max_amount or requested_amount * 0.7` in make_decision
+        fallback = np.where(
+            np.isnan(max_approved_amount) | (max_approved_amount == 0),
+            requested_amount * 0.7,
+            max_approved_amount,
+        )
+        approved = np.where(
+            is_approved,
+            np.where(recommendation == 0, requested_amount, np.minimum(fallback, requested_amount)),
+            0.0,
+        )
+        rate = _round_batch(np.minimum(25.0, np.maximum(5.0, base + premium + (risk_score / 100) * 2)), 2)
+        tenure = cls._adjust_tenure_batch(
+            requested_tenure, np.array(AuraAgent.RISK_LEVELS)[risk_level], approved, requested_amount
+        )
+        payment = _round_batch(monthly_payment(approved, rate, tenure), 2)
+        return {
+            "is_approved": is_approved,
+            "approved_amount": approved,
+            "interest_rate": np.where(is_approved, rate, 0.0),
+            "adjusted_tenure": np.where(is_approved, tenure, 0),
+            "monthly_payment": np.where(is_approved, payment, 0.0),
+        }
+    
+    @classmethod
+    def quote_grid(
+        cls,
+        amounts: Sequence[float],
+        tenures: Sequence[int],
+        risk_levels: Sequence[str] = ("low", "medium"),
+        max_amount: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Rule-based quotes for every risk level × amount × tenure.
+        
+        Cell [l][a][t] holds the terms make_decision would offer at risk
+        level l (scored at QUOTE_RISK_SCORES) for amount a over tenure t,
+        with the amount capped at `max_amount` when given, for an
+        assessment that approves or reduces to that cap. Critical risk is
+        never approved and cannot be quoted. High-risk offers are always
+        capped at the applicant's income-based limit, so "high" needs
+        `max_amount`. The pricing model is not consulted, as its rate
+        depends on the applicant.
+        """
+        unknown = [level for level in risk_levels if level not in cls.QUOTE_RISK_SCORES]
+        if unknown:
+            raise ValueError(f"Risk levels without quotes: {unknown}")
+        if "high" in risk_levels and max_amount is None:
+            raise ValueError("Quoting high risk needs max_amount, the applicant's approved limit")
+        requested = np.asarray(amounts, dtype=np.float64)
+        tenure = np.asarray(tenures, dtype=np.int64)
+        if requested.size == 0 or tenure.size == 0 or not risk_levels:
+            raise ValueError("amounts, tenures and risk_levels must not be empty")
+        if (requested <= 0).any() or (tenure < 1).any():
+            raise ValueError("amounts must be positive and tenures at least 1 month")
+        
+        rates = np.array([
+            cls._calculate_interest_rate(level, cls.QUOTE_RISK_SCORES[level]) for level in risk_levels
+        ])
+        shape = (len(risk_levels), requested.size, tenure.size)
+        requested = np.broadcast_to(requested[None, :, None], shape)
+        approved = requested if max_amount is None else np.minimum(requested, max_amount)
+        adjusted = cls._adjust_tenure_batch(
+            tenure[None, None, :], np.asarray(risk_levels)[:, None, None], approved, requested
+        )
+        
+        payment = _round_batch(monthly_payment(approved, rates[:, None, None], adjusted).ravel(), 2)
+        total = payment * adjusted.ravel()
+        return {
+            "amounts": list(map(float, amounts)),
+            "tenures": list(map(int, tenures)),
+            "risk_levels": list(risk_levels),
+            "interest_rate": dict(zip(risk_levels, rates.tolist())),
+            "approved_amount": approved[0, :, 0].tolist(),
+            "adjusted_tenure": adjusted.tolist(),
+            "monthly_payment": payment.reshape(shape).tolist(),
+            "total_repayment": _round_batch(total, 2).reshape(shape).tolist(),
+            "total_interest": _round_batch(total - approved.ravel(), 2).reshape(shape).tolist(),
+        }
+    
     @classmethod
     def _calculate_monthly_payment(
         cls,
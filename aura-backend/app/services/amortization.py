@@ -0,0 +1,73 @@
+"""
+Vectorized loan amortization.
+
+Functions broadcast over their arguments, so one call prices a whole grid
+of amounts × tenures × rates or builds schedules for many loans at once.
+Rates are APRs in percent, as elsewhere in the lender agent. Amounts are
+not rounded; callers round to cents for display.
+"""
+
+from typing import Dict
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+def monthly_payment(principal: ArrayLike, annual_rate: ArrayLike, tenure_months: ArrayLike) -> np.ndarray:
+    """Level monthly payment that repays `principal` over `tenure_months`."""
+    principal = np.asarray(principal, dtype=np.float64)
+    monthly_rate = np.asarray(annual_rate, dtype=np.float64) / 100 / 12
+    tenure = np.asarray(tenure_months, dtype=np.float64)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (1 + monthly_rate) ** tenure
+        payment = principal * (monthly_rate * growth) / (growth - 1)
+    return np.where(monthly_rate == 0, principal / tenure, payment)
+
+
+def amortization_schedule(
+    principal: ArrayLike,
+    annual_rate: ArrayLike,
+    tenure_months: ArrayLike,
+) -> Dict[str, np.ndarray]:
+    """
+    Month-by-month schedules for a batch of loans.
+    
+    Arguments are broadcast to one value per loan. Returns "month" (1..the
+    longest tenure) and arrays of shape (loans, months) for "payment",
+    "interest", "principal" and the "balance" left after each payment;
+    months past a loan's tenure are zero.
+    """
+    principal, annual_rate, tenure = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(principal, dtype=np.float64)),
+        np.atleast_1d(np.asarray(annual_rate, dtype=np.float64)),
+        np.atleast_1d(np.asarray(tenure_months, dtype=np.int64)),
+    )
+    if tenure.size and tenure.min() < 1:
+        raise ValueError("tenure_months must be at least 1")
+    
+    payment = monthly_payment(principal, annual_rate, tenure)[:, None]
+    monthly_rate = (annual_rate / 100 / 12)[:, None]
+    opening = principal[:, None]
+    months = np.arange(1, int(tenure.max(initial=0)) + 1)
+    
+    # Balance after k payments, in closed form rather than month by month
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (1 + monthly_rate) ** months
+        balance = np.where(
+            monthly_rate == 0,
+            opening - payment * months,
+            opening * growth - payment * (growth - 1) / monthly_rate,
+        )
+    balance[months >= tenure[:, None]] = 0.0  # drop float residue at payoff
+    
+    previous = np.concatenate([opening, balance[:, :-1]], axis=1)
+    interest = previous * monthly_rate
+    active = months <= tenure[:, None]
+    return {
+        "month": months,
+        "payment": np.where(active, payment, 0.0),
+        "interest": np.where(active, interest, 0.0),
+        "principal": np.where(active, payment - interest, 0.0),
+        "balance": np.where(active, balance, 0.0),
+    }
@@ -0,0 +1,142 @@
+"""
+Memoization of agent assessments on quantized inputs.
+
+The agents are pure functions of their inputs and model version, and slider
+traffic repeats near-identical calls. Inputs are moved to a multiple of a
+configured step and the agent is run on the quantized values, so a cached
+result is exactly what that call returns. Amounts an offer is capped by are
+rounded down, so a result never offers more than the caller asked for or
+could afford; keys carry the model version, so a swap stops older entries
+from being served.
+"""
+
+import copy
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+from uuid import uuid4
+
+from prometheus_client import Counter, Gauge
+
+from app.core.config import settings
+
+AGENT_MEMO_LOOKUPS = Counter(
+    "aura_agent_memo_lookups_total",
+    "Agent memo lookups by outcome (hit, miss or expired)",
+    ["agent", "result"],
+)
+AGENT_MEMO_ENTRIES = Gauge(
+    "aura_agent_memo_entries",
+    "Results held in an agent memo",
+    ["agent"],
+)
+
+
+def quantize(value: float, step: float, rounding: Callable[[float], int] = round) -> float:
+    """
+    `value` moved to a multiple of `step` by `rounding` (round, math.floor
+    or math.ceil); unchanged for step 0.
+    """
+    if not step:
+        return value
+    # The inner round keeps 0.3 / 0.1 from flooring to 2; the outer one
+    # drops float residue such as 0.30000000000000004
+    return round(rounding(round(value / step, 9)) * step, 9)
+
+
+class AssessmentMemo:
+    """
+    Size-bounded LRU with a TTL for one agent's results.
+    
+    `steps` maps input names to their rounding step and `rounding` picks
+    the direction for some of them (nearest otherwise); other inputs are
+    part of the key as given and must be hashable.
+    """
+    
+    def __init__(
+        self,
+        agent: str,
+        steps: Mapping[str, float],
+        id_field: str,
+        rounding: Optional[Mapping[str, Callable[[float], int]]] = None,
+        max_entries: int = settings.AGENT_MEMO_SIZE,
+        ttl: int = settings.AGENT_MEMO_TTL,
+        enabled: bool = settings.AGENT_MEMO_ENABLED,
+    ):
+        self.agent = agent
+        self.steps = dict(steps)
+        self.rounding = dict(rounding or {})
+        self.id_field = id_field
+        self.max_entries = max(0, max_entries)
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+    
+    def quantize(self, inputs: Mapping[str, Any]) -> Dict[str, Any]:
+        return {
+            name: (
+                quantize(value, self.steps[name], self.rounding.get(name, round))
+                if name in self.steps and value is not None else value
+            )
+            for name, value in inputs.items()
+        }
+    
+    async def call(
+        self,
+        version: Hashable,
+        inputs: Mapping[str, Any],
+        compute: Callable[..., Awaitable[Dict[str, Any]]],
+        cacheable: Callable[[Dict[str, Any]], bool] = lambda result: True,
+    ) -> Dict[str, Any]:
+        """
+        `compute(**inputs)`, served from the memo when possible.
+        
+        `version` identifies the model the call would use. Results that
+        `cacheable` rejects (e.g. a fallback taken mid-call) are returned but
+        not stored. Every result gets `from_cache`; hits get a new id.
+        """
+        if not self.enabled or not self.max_entries:
+            return {**await compute(**inputs), "from_cache": False}
+        
+        start = time.perf_counter()
+        inputs = self.quantize(inputs)
+        key = (version, tuple(sorted(inputs.items())))
+        cached = self._get(key)
+        if cached is not None:
+            result = copy.deepcopy(cached)
+            result[self.id_field] = str(uuid4())
+            result["processing_time_ms"] = int((time.perf_counter() - start) * 1000)
+            result["from_cache"] = True
+            return result
+        
+        result = await compute(**inputs)
+        if cacheable(result):
+            self._put(key, copy.deepcopy(result))
+        return {**result, "from_cache": False}
+    
+    def _get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            AGENT_MEMO_LOOKUPS.labels(agent=self.agent, result="miss").inc()
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            AGENT_MEMO_ENTRIES.labels(agent=self.agent).set(len(self._entries))
+            AGENT_MEMO_LOOKUPS.labels(agent=self.agent, result="expired").inc()
+            return None
+        self._entries.move_to_end(key)
+        AGENT_MEMO_LOOKUPS.labels(agent=self.agent, result="hit").inc()
+        return result
+    
+    def _put(self, key: Hashable, result: Dict[str, Any]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        AGENT_MEMO_ENTRIES.labels(agent=self.agent).set(len(self._entries))
+    
+    def clear(self) -> None:
+        self._entries.clear()
+        AGENT_MEMO_ENTRIES.labels(agent=self.agent).set(0)
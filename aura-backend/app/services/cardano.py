@@ -2,24 +2,29 @@
 Cardano blockchain integration service.
 """
 
+import asyncio
 import hashlib
 import time
-from typing import Dict, Any, Optional
-from uuid import uuid4
+from functools import partial
+from typing import Dict, Any, List, Optional
 
 import structlog
 from pycardano import (
+    BlockFrostChainContext,
     TransactionBuilder,
+    TransactionInput,
     TransactionOutput,
     PaymentSigningKey,
     PaymentVerificationKey,
     Address,
+    MultiAsset,
     Network,
+    UTxO,
     Value,
 )
-from blockfrost import Api, ApiError
 
 from app.core.config import settings
+from app.services.chain_client import ChainApiError, ChainClient, blockfrost_url, chain_client
 
 logger = structlog.get_logger(__name__)
 
@@ -29,13 +34,16 @@ class CardanoService:
     Cardano blockchain service for transaction management.
     
     Handles wallet operations, transaction building, signing,
-    and submission to the Cardano network via Blockfrost.
+    and submission to the Cardano network via Blockfrost. Chain calls go
+    through the shared async ChainClient; the transaction builder's own
+    protocol-parameter lookups run in a worker thread.
     """
     
-    def __init__(self):
+    def __init__(self, chain: ChainClient = chain_client):
         self.network = self._get_network()
-        self.blockfrost = self._init_blockfrost()
+        self.chain = self._init_chain(chain)
         self.lender_signing_key = self._load_lender_key()
+        self._builder_context: Optional[BlockFrostChainContext] = None
     
     def _get_network(self) -> Network:
         """Get Cardano network from config."""
@@ -47,23 +55,20 @@ class CardanoService:
         }
         return network_map.get(settings.CARDANO_NETWORK, Network.TESTNET)
     
-    def _init_blockfrost(self) -> Optional[Api]:
-        """Initialize Blockfrost API client."""
-        if not settings.BLOCKFROST_PROJECT_ID:
+    def _init_chain(self, chain: ChainClient) -> ChainClient:
+        """Chain client for Blockfrost; calls fail until a project ID is set."""
+        if not chain.configured:
             logger.warning("Blockfrost project ID not configured")
-            return None
-        
-        project_id = settings.BLOCKFROST_PROJECT_ID
-        
-        # Determine API URL based on network
-        if settings.CARDANO_NETWORK == "mainnet":
-            base_url = "https://cardano-mainnet.blockfrost.io/api"
-        elif settings.CARDANO_NETWORK == "preprod":
-            base_url = "https://cardano-preprod.blockfrost.io/api"
-        else:
-            base_url = "https://cardano-preview.blockfrost.io/api"
-        
-        return Api(project_id=project_id, base_url=base_url)
+        return chain
+    
+    def _get_builder_context(self) -> BlockFrostChainContext:
+        """Protocol parameters for the transaction builder (blocking; call in a thread)."""
+        if self._builder_context is None:
+            self._builder_context = BlockFrostChainContext(
+                project_id=self.chain.project_id,
+                base_url=blockfrost_url(),
+            )
+        return self._builder_context
     
     def _load_lender_key(self) -> Optional[PaymentSigningKey]:
         """Load lender's signing key for transaction signing."""
@@ -107,7 +112,9 @@ class CardanoService:
                 raise ValueError("Insufficient funds in lender wallet")
             
             # Build transaction
-            builder = TransactionBuilder(context=self.blockfrost)
+            loop = asyncio.get_running_loop()
+            context = await loop.run_in_executor(None, self._get_builder_context)
+            builder = TransactionBuilder(context=context)
             
             # Add inputs
             for utxo in utxos:
@@ -118,14 +125,15 @@ class CardanoService:
                 TransactionOutput(to_address, Value(amount_lovelace))
             )
             
-            # Build and sign
-            signed_tx = builder.build_and_sign(
+            # Build and sign (fee calculation may fetch protocol parameters)
+            signed_tx = await loop.run_in_executor(None, partial(
+                builder.build_and_sign,
                 signing_keys=[self.lender_signing_key],
                 change_address=lender_address
-            )
+            ))
             
             # Submit to network
-            tx_hash = self.blockfrost.transaction_submit(signed_tx.to_cbor())
+            tx_hash = await self.chain.transaction_submit(signed_tx.to_cbor())
             
             # Get transaction details
             tx_details = await self._get_transaction_details(tx_hash)
@@ -150,35 +158,53 @@ class CardanoService:
                 "details": tx_details,
                 "processing_time_ms": processing_time,
             }
-            
-        except ApiError as e:
+        
+        except ChainApiError as e:
             logger.error("Blockfrost API error", error=str(e))
             raise
         except Exception as e:
             logger.error("Transaction failed", error=str(e))
             raise
     
-    async def _get_utxos(self, address: str) -> list:
+    async def _get_utxos(self, address: str) -> List[UTxO]:
         """Get UTXOs for an address from Blockfrost."""
         try:
-            utxos = self.blockfrost.address_utxos(address)
-            return utxos
-        except ApiError as e:
+            utxos = await self.chain.address_utxos(address)
+        except ChainApiError as e:
             if e.status_code == 404:
                 return []
             raise
+        return [self._to_utxo(utxo) for utxo in utxos]
+    
+    @staticmethod
+    def _to_utxo(utxo: Dict[str, Any]) -> UTxO:
+        """pycardano UTxO for a Blockfrost address UTxO (lovelace and native assets)."""
+        lovelace = 0
+        assets: Dict[bytes, Dict[bytes, int]] = {}
+        for amount in utxo["amount"]:
+            if amount["unit"] == "lovelace":
+                lovelace = int(amount["quantity"])
+            else:
+                # Unit is the 28-byte policy id followed by the asset name, in hex
+                policy, name = amount["unit"][:56], amount["unit"][56:]
+                assets.setdefault(bytes.fromhex(policy), {})[bytes.fromhex(name)] = int(amount["quantity"])
+        value = Value(lovelace, MultiAsset.from_primitive(assets)) if assets else Value(lovelace)
+        return UTxO(
+            TransactionInput.from_primitive([utxo["tx_hash"], utxo["output_index"]]),
+            TransactionOutput(Address.from_primitive(utxo["address"]), value),
+        )
     
     async def _get_transaction_details(self, tx_hash: str) -> Dict[str, Any]:
         """Get transaction details from Blockfrost."""
         try:
-            tx = self.blockfrost.transaction(tx_hash)
+            tx = await self.chain.transaction(tx_hash)
             return {
-                "block_height": tx.block_height,
-                "slot": tx.slot,
-                "index": tx.index,
-                "fees": int(tx.fees) / 1_000_000,
+                "block_height": tx["block_height"],
+                "slot": tx["slot"],
+                "index": tx["index"],
+                "fees": int(tx["fees"]) / 1_000_000,
             }
-        except ApiError:
+        except ChainApiError:
             return {}
     
     async def verify_transaction(self, tx_hash: str) -> Dict[str, Any]:
@@ -188,24 +214,26 @@ class CardanoService:
         Returns confirmation status and block details.
         """
         try:
-            tx = self.blockfrost.transaction(tx_hash)
-            
-            # Get current tip for confirmation count
-            tip = self.blockfrost.blocks_latest()
-            confirmations = tip.height - tx.block_height if tx.block_height else 0
+            # Transaction and current tip (for the confirmation count) together
+            tx, tip = await asyncio.gather(
+                self.chain.transaction(tx_hash),
+                self.chain.blocks_latest(),
+            )
+            block_height = tx["block_height"]
+            confirmations = tip["height"] - block_height if block_height else 0
             
             return {
                 "tx_hash": tx_hash,
                 "is_confirmed": confirmations >= 1,
                 "confirmations": confirmations,
-                "block_height": tx.block_height,
-                "slot_number": tx.slot,
-                "epoch": tx.block_height // 432000 if tx.block_height else None,  # Approximate
-                "fees_ada": int(tx.fees) / 1_000_000,
+                "block_height": block_height,
+                "slot_number": tx["slot"],
+                "epoch": block_height // 432000 if block_height else None,  # Approximate
+                "fees_ada": int(tx["fees"]) / 1_000_000,
                 "status": "confirmed" if confirmations >= 1 else "pending",
             }
-            
-        except ApiError as e:
+        
+        except ChainApiError as e:
             if e.status_code == 404:
                 return {
                     "tx_hash": tx_hash,
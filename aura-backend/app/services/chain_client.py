@@ -0,0 +1,187 @@
+"""
+Async Blockfrost client.
+
+All chain reads and submissions share one aiohttp session per process, so
+connections to Blockfrost are kept alive and reused rather than opened per
+call, and a slow round trip no longer holds the event loop. Each attempt is
+bounded by CHAIN_CLIENT_TIMEOUT; connection errors, timeouts, 429 and 5xx
+responses are retried with exponential backoff and full jitter.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+import structlog
+from prometheus_client import Counter, Histogram
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+CHAIN_REQUESTS = Counter(
+    "aura_chain_requests_total",
+    "Blockfrost request attempts by endpoint and outcome",
+    ["endpoint", "result"],
+)
+CHAIN_REQUEST_SECONDS = Histogram(
+    "aura_chain_request_seconds",
+    "Blockfrost call latency, retries included",
+    ["endpoint"],
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+BLOCKFROST_URLS = {
+    "mainnet": "https://cardano-mainnet.blockfrost.io/api",
+    "preprod": "https://cardano-preprod.blockfrost.io/api",
+    "preview": "https://cardano-preview.blockfrost.io/api",
+}
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Blockfrost's maximum page size
+PAGE_SIZE = 100
+
+
+def blockfrost_url(network: str = settings.CARDANO_NETWORK) -> str:
+    """Blockfrost API root for a network name (preview for anything unknown)."""
+    return BLOCKFROST_URLS.get(network, BLOCKFROST_URLS["preview"])
+
+
+class ChainApiError(Exception):
+    """A Blockfrost error response, or a chain call made without a project ID."""
+    
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Blockfrost error {status_code}: {message}")
+        self.status_code = status_code
+
+
+class ChainClient:
+    """Pooled, retrying client for the Blockfrost endpoints CardanoService uses."""
+    
+    def __init__(
+        self,
+        project_id: str = settings.BLOCKFROST_PROJECT_ID,
+        base_url: Optional[str] = None,
+        pool_size: int = settings.CHAIN_CLIENT_POOL_SIZE,
+        timeout: float = settings.CHAIN_CLIENT_TIMEOUT,
+        retries: int = settings.CHAIN_CLIENT_RETRIES,
+        backoff: float = settings.CHAIN_CLIENT_BACKOFF,
+    ):
+        self.project_id = project_id
+        self.base_url = (base_url or blockfrost_url()).rstrip("/")
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    @property
+    def configured(self) -> bool:
+        return bool(self.project_id)
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created on first use, inside the event loop that will drive it
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={"project_id": self.project_id},
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=30),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                raise_for_status=False,
+            )
+        return self._session
+    
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+    
+    async def request(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        retry_unsent_only: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Decoded JSON of one Blockfrost call, retried on transient failures.
+        
+        `endpoint` labels the metrics. With `retry_unsent_only`, only
+        responses that mean the request was not processed (429) are retried;
+        a timeout or dropped connection might follow a success.
+        """
+        if not self.configured:
+            raise ChainApiError(401, "Blockfrost project ID not configured")
+        session = self._get_session()
+        start = time.perf_counter()
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    async with session.request(method, f"{self.base_url}/v0/{path}", **kwargs) as response:
+                        if response.status < 400:
+                            CHAIN_REQUESTS.labels(endpoint=endpoint, result="ok").inc()
+                            return await response.json(content_type=None)
+                        error = ChainApiError(response.status, await self._error_message(response))
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    CHAIN_REQUESTS.labels(endpoint=endpoint, result="connection_error").inc()
+                    if retry_unsent_only or attempt == self.retries:
+                        raise
+                    logger.warning("Blockfrost request failed, retrying", endpoint=endpoint, error=str(e))
+                else:
+                    CHAIN_REQUESTS.labels(endpoint=endpoint, result=str(error.status_code)).inc()
+                    retryable = error.status_code == 429 or (
+                        not retry_unsent_only and error.status_code in RETRYABLE_STATUSES
+                    )
+                    if not retryable or attempt == self.retries:
+                        raise error
+                    logger.warning("Blockfrost request failed, retrying", endpoint=endpoint, status=error.status_code)
+                
+                # Full jitter keeps concurrent retries from arriving together
+                await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+        finally:
+            CHAIN_REQUEST_SECONDS.labels(endpoint=endpoint).observe(time.perf_counter() - start)
+    
+    @staticmethod
+    async def _error_message(response: aiohttp.ClientResponse) -> str:
+        try:
+            body = await response.json(content_type=None)
+            return str(body.get("message") or body.get("error") or response.reason or "")
+        except Exception:
+            return response.reason or ""
+    
+    async def transaction(self, tx_hash: str) -> Dict[str, Any]:
+        return await self.request("GET", f"txs/{tx_hash}", "txs")
+    
+    async def blocks_latest(self) -> Dict[str, Any]:
+        return await self.request("GET", "blocks/latest", "blocks_latest")
+    
+    async def address_utxos(self, address: str) -> List[Dict[str, Any]]:
+        """Every UTxO at `address`, following Blockfrost's pagination."""
+        utxos: List[Dict[str, Any]] = []
+        page = 1
+        while True:
+            batch = await self.request(
+                "GET",
+                f"addresses/{address}/utxos",
+                "address_utxos",
+                params={"page": page, "count": PAGE_SIZE},
+            )
+            utxos.extend(batch)
+            if len(batch) < PAGE_SIZE:
+                return utxos
+            page += 1
+    
+    async def transaction_submit(self, cbor: bytes) -> str:
+        """Submit a signed transaction; returns its hash."""
+        return await self.request(
+            "POST",
+            "tx/submit",
+            "tx_submit",
+            retry_unsent_only=True,
+            data=cbor,
+            headers={"Content-Type": "application/cbor"},
+        )
+
+
+chain_client = ChainClient()
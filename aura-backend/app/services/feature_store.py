@@ -0,0 +1,322 @@
+"""
+Per-wallet feature store in Redis.
+
+Each wallet's history (applications, decisions, loan outcomes and on-chain
+transactions) is kept as running totals in the Redis hash
+`wallet_features:{wallet_address}`. Totals are updated incrementally from
+ORM flushes: changes to LoanApplication, LoanDecision and LoanTransaction
+rows are captured when a session flushes and applied once it commits, so
+scoring reads one hash per wallet instead of aggregating Postgres.
+"""
+
+import asyncio
+import time
+from datetime import timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+import numpy as np
+import structlog
+from prometheus_client import Counter
+from sqlalchemy import case, event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import instance_state
+
+from app.core.redis import redis_client
+from app.models.loan import LoanApplication, LoanDecision, LoanStatus, LoanTransaction
+
+logger = structlog.get_logger(__name__)
+
+FEATURE_STORE_UPDATES = Counter(
+    "aura_feature_store_updates_total",
+    "Row changes applied to (or dropped from) wallet feature hashes",
+    ["result"],
+)
+
+KEY_PREFIX = "wallet_features:"
+# application_id -> wallet_address, for rows that only carry the application
+WALLET_INDEX_KEY = "wallet_features_index"
+
+# Model input columns derived from the stored totals, in order
+WALLET_FEATURES = (
+    "applications_total",
+    "approval_rate",
+    "mean_risk_score",
+    "requested_amount_total",
+    "loans_completed",
+    "loans_defaulted",
+    "transactions_total",
+    "transacted_ada_total",
+    "days_since_last_application",
+)
+
+_PENDING = "wallet_feature_updates"
+
+
+class FeatureUpdate:
+    """Increments and overwrites for one wallet's hash, from one row change."""
+    
+    __slots__ = ("wallet", "application_id", "increments", "values")
+    
+    def __init__(
+        self,
+        wallet: Optional[str],
+        application_id: Any,
+        increments: Dict[str, float],
+        values: Optional[Dict[str, float]] = None,
+    ):
+        self.wallet = wallet
+        self.application_id = str(application_id) if application_id is not None else None
+        self.increments = increments
+        self.values = values or {}
+
+
+def _wallet_for(session: Session, application_id: Any) -> Optional[str]:
+    """Wallet of an application already in the session, without a query."""
+    application = session.identity_map.get(session.identity_key(LoanApplication, application_id))
+    return application.wallet_address if application is not None else None
+
+
+# Row arguments are Any: without the SQLAlchemy mypy plugin, Column
+# attributes type as the column rather than its value
+def _application_added(application: Any, now: float) -> FeatureUpdate:
+    return FeatureUpdate(
+        application.wallet_address,
+        application.id,
+        {"applications_total": 1, "requested_amount_total": application.requested_amount},
+        {"last_application_at": now},
+    )
+
+
+def _decision_added(session: Session, decision: Any) -> FeatureUpdate:
+    return FeatureUpdate(
+        _wallet_for(session, decision.application_id),
+        decision.application_id,
+        {"decisions_total": 1, "approvals_total": int(decision.is_approved), "risk_score_total": decision.risk_score},
+    )
+
+
+def _transaction_added(session: Session, transaction: Any, now: float) -> FeatureUpdate:
+    return FeatureUpdate(
+        _wallet_for(session, transaction.application_id),
+        transaction.application_id,
+        {"transactions_total": 1, "transacted_ada_total": transaction.amount_ada},
+        {"last_transaction_at": now},
+    )
+
+
+def _application_closed(application: Any) -> Optional[FeatureUpdate]:
+    """Outcome update if the flush moved the application to COMPLETED or DEFAULTED."""
+    added = instance_state(application).attrs.status.history.added
+    status = added[0] if added else None
+    if status == LoanStatus.COMPLETED:
+        return FeatureUpdate(application.wallet_address, application.id, {"loans_completed": 1})
+    if status == LoanStatus.DEFAULTED:
+        return FeatureUpdate(application.wallet_address, application.id, {"loans_defaulted": 1})
+    return None
+
+
+def _capture(session: Session, flush_context: Any) -> None:
+    """after_flush: turn new and changed rows into feature updates for after commit."""
+    now = time.time()
+    updates: List[FeatureUpdate] = session.info.setdefault(_PENDING, [])
+    
+    for obj in session.new:
+        if isinstance(obj, LoanApplication):
+            updates.append(_application_added(obj, now))
+        elif isinstance(obj, LoanDecision):
+            updates.append(_decision_added(session, obj))
+        elif isinstance(obj, LoanTransaction):
+            updates.append(_transaction_added(session, obj, now))
+    
+    for obj in session.dirty:
+        if isinstance(obj, LoanApplication):
+            update = _application_closed(obj)
+            if update is not None:
+                updates.append(update)
+
+
+def _dispatch(session: Session) -> None:
+    """after_commit: hand the captured updates to the store."""
+    updates = session.info.pop(_PENDING, None)
+    if updates:
+        feature_store.submit(updates)
+
+
+def _discard(session: Session) -> None:
+    """after_rollback: flushed changes were undone, so are their updates."""
+    session.info.pop(_PENDING, None)
+
+
+def install(session_class: Any = Session) -> None:
+    """Capture feature updates from every `session_class` (async sessions included)."""
+    listeners: Dict[str, Callable[..., None]] = {
+        "after_flush": _capture,
+        "after_commit": _dispatch,
+        "after_rollback": _discard,
+    }
+    for name, listener in listeners.items():
+        if not event.contains(session_class, name, listener):
+            event.listen(session_class, name, listener)
+
+
+class FeatureStore:
+    """Reads and incremental writes of wallet feature hashes."""
+    
+    def __init__(self, redis=redis_client):
+        self.redis = redis
+        self._tasks: Set[asyncio.Task] = set()
+        self._queued: List[FeatureUpdate] = []
+    
+    def submit(self, updates: List[FeatureUpdate]) -> None:
+        """
+        Apply `updates` in the background.
+        
+        Sessions committed outside an event loop queue their updates until
+        the next `apply` or `flush`.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._queued.extend(updates)
+            return
+        task = loop.create_task(self.apply(updates))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def flush(self) -> None:
+        """Wait for submitted updates and apply any queued ones."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.apply([])
+    
+    async def apply(self, updates: List[FeatureUpdate]) -> None:
+        """Write updates to Redis in one pipelined round trip (two if wallets need resolving)."""
+        updates, self._queued = self._queued + list(updates), []
+        if not updates:
+            return
+        
+        unresolved = sorted({u.application_id for u in updates if u.wallet is None and u.application_id})
+        indexed: Dict[str, Optional[str]] = {}
+        try:
+            if unresolved:
+                indexed = dict(zip(unresolved, await self.redis.hmget(WALLET_INDEX_KEY, unresolved)))
+            
+            applied = dropped = 0
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for update in updates:
+                    wallet = update.wallet
+                    if wallet is None and update.application_id:
+                        wallet = indexed.get(update.application_id)
+                    if wallet is None:
+                        dropped += 1
+                        continue
+                    key = f"{KEY_PREFIX}{wallet}"
+                    for field, amount in update.increments.items():
+                        pipe.hincrbyfloat(key, field, float(amount))
+                    if update.values:
+                        pipe.hset(key, mapping=update.values)
+                    if update.wallet and update.application_id:
+                        pipe.hset(WALLET_INDEX_KEY, update.application_id, wallet)
+                    applied += 1
+                await pipe.execute()
+        except Exception as e:
+            FEATURE_STORE_UPDATES.labels(result="failed").inc(len(updates))
+            logger.warning("Feature store update failed", updates=len(updates), error=str(e))
+            return
+        
+        FEATURE_STORE_UPDATES.labels(result="applied").inc(applied)
+        if dropped:
+            # The application predates the store; a rebuild picks these up
+            FEATURE_STORE_UPDATES.labels(result="unresolved").inc(dropped)
+    
+    async def get_many(self, wallets: Sequence[str]) -> List[Dict[str, float]]:
+        """Stored totals for each wallet, in one pipelined read; {} for unknown wallets."""
+        if not wallets:
+            return []
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for wallet in wallets:
+                pipe.hgetall(f"{KEY_PREFIX}{wallet}")
+            rows = await pipe.execute()
+        return [{field: float(value) for field, value in row.items()} for row in rows]
+    
+    async def vectors(self, wallets: Sequence[str], now: Optional[float] = None) -> np.ndarray:
+        """WALLET_FEATURES rows for `wallets`; wallets without history get zeros."""
+        now = time.time() if now is None else now
+        vectors = np.zeros((len(wallets), len(WALLET_FEATURES)))
+        for row, totals in zip(vectors, await self.get_many(wallets)):
+            if not totals:
+                continue
+            decisions = totals.get("decisions_total", 0.0)
+            last_application = totals.get("last_application_at")
+            row[:] = (
+                totals.get("applications_total", 0.0),
+                totals.get("approvals_total", 0.0) / decisions if decisions else 0.0,
+                totals.get("risk_score_total", 0.0) / decisions if decisions else 0.0,
+                totals.get("requested_amount_total", 0.0),
+                totals.get("loans_completed", 0.0),
+                totals.get("loans_defaulted", 0.0),
+                totals.get("transactions_total", 0.0),
+                totals.get("transacted_ada_total", 0.0),
+                (now - last_application) / 86400 if last_application else 0.0,
+            )
+        return vectors
+    
+    async def rebuild(self, db: AsyncSession, wallet: str) -> Dict[str, float]:
+        """Recompute one wallet's totals from Postgres and replace its hash."""
+        applications = (await db.execute(
+            select(
+                func.count(LoanApplication.id),
+                func.coalesce(func.sum(LoanApplication.requested_amount), 0.0),
+                func.sum(case((LoanApplication.status == LoanStatus.COMPLETED, 1), else_=0)),
+                func.sum(case((LoanApplication.status == LoanStatus.DEFAULTED, 1), else_=0)),
+                func.max(LoanApplication.created_at),
+            ).where(LoanApplication.wallet_address == wallet)
+        )).one()
+        decisions = (await db.execute(
+            select(
+                func.count(LoanDecision.id),
+                func.sum(case((LoanDecision.is_approved, 1), else_=0)),
+                func.coalesce(func.sum(LoanDecision.risk_score), 0.0),
+            ).join(LoanApplication).where(LoanApplication.wallet_address == wallet)
+        )).one()
+        transactions = (await db.execute(
+            select(
+                func.count(LoanTransaction.id),
+                func.coalesce(func.sum(LoanTransaction.amount_ada), 0.0),
+                func.max(LoanTransaction.submitted_at),
+            ).join(LoanApplication).where(LoanApplication.wallet_address == wallet)
+        )).one()
+        application_ids = (await db.execute(
+            select(LoanApplication.id).where(LoanApplication.wallet_address == wallet)
+        )).scalars().all()
+        
+        totals = {
+            "applications_total": applications[0],
+            "requested_amount_total": applications[1],
+            "loans_completed": applications[2] or 0,
+            "loans_defaulted": applications[3] or 0,
+            "decisions_total": decisions[0],
+            "approvals_total": decisions[1] or 0,
+            "risk_score_total": decisions[2],
+            "transactions_total": transactions[0],
+            "transacted_ada_total": transactions[1],
+        }
+        # Timestamps are naive UTC in the database
+        if applications[4] is not None:
+            totals["last_application_at"] = applications[4].replace(tzinfo=timezone.utc).timestamp()
+        if transactions[2] is not None:
+            totals["last_transaction_at"] = transactions[2].replace(tzinfo=timezone.utc).timestamp()
+        totals = {field: float(value) for field, value in totals.items()}
+        
+        key = f"{KEY_PREFIX}{wallet}"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping=totals)
+            if application_ids:
+                pipe.hset(WALLET_INDEX_KEY, mapping={str(app_id): wallet for app_id in application_ids})
+            await pipe.execute()
+        return totals
+
+
+feature_store = FeatureStore()
@@ -0,0 +1,320 @@
+"""
+Versioned, hot-swappable agent models.
+
+Each agent keeps a ModelRegistry with an active version and an optional
+candidate. A new version is loaded in the background and swapped in by
+rebinding one attribute: requests read `registry.active` once and keep
+that version, model included, until they finish, so a swap never drops or
+mixes a request. A fraction of live scoring calls can be repeated against
+the candidate in a separate executor, off the response path, with the
+score deltas recorded for comparison before promotion.
+
+Every API worker holds its own registry. Rollouts through the admin API
+publish the active and candidate versions to Redis under a new revision,
+and each worker's sync loop loads whatever it has not applied yet, so all
+workers converge on the published versions within a sync interval. Shadow
+statistics stay per worker.
+"""
+
+import asyncio
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+from uuid import uuid4
+
+import numpy as np
+import structlog
+from prometheus_client import Counter, Histogram
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.services.model_runtime import load_joblib_model, predict_scores
+
+logger = structlog.get_logger(__name__)
+
+MODEL_SWAPS = Counter(
+    "aura_model_swaps_total",
+    "Model versions activated in a registry",
+    ["model"],
+)
+MODEL_SHADOW_SCORED = Counter(
+    "aura_model_shadow_scored_total",
+    "Rows scored by a candidate model in shadow",
+    ["model", "result"],
+)
+MODEL_SHADOW_DELTA = Histogram(
+    "aura_model_shadow_abs_delta",
+    "Absolute difference between candidate and active model scores",
+    ["model"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+# Shadow scoring never competes with the inference pool for threads
+shadow_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.MODEL_SHADOW_THREADS),
+    thread_name_prefix="aura-shadow",
+)
+
+# Fits LoanDecision.aura_model_version / lender_model_version
+MAX_VERSION_LENGTH = 32
+
+
+class LoadedModel:
+    """One model version and where it came from."""
+    
+    def __init__(self, version: str, model: Any, path: str):
+        self.version = version
+        self.model = model
+        self.path = path
+        self.loaded_at = datetime.utcnow()
+    
+    def describe(self) -> Dict[str, Any]:
+        return {"version": self.version, "path": self.path, "loaded_at": self.loaded_at.isoformat()}
+
+
+def _source(loaded: Optional[LoadedModel]) -> Optional[Dict[str, str]]:
+    """What a published state records of a version: enough to load it again."""
+    return {"version": loaded.version, "path": loaded.path} if loaded else None
+
+
+class ModelRegistry:
+    """Active and candidate versions of one agent's model."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.active: Optional[LoadedModel] = None
+        self.candidate: Optional[LoadedModel] = None
+        self.shadow_fraction = 0.0
+        self.state_key = f"model_registry:{name}"
+        # Published revision this worker serves; None until it applies one
+        self.revision: Optional[str] = None
+        self._sync_task: Optional[asyncio.Task] = None
+        self._shadow_tasks: Set[asyncio.Task] = set()
+        self._shadow_rows = 0
+        self._shadow_abs_delta = 0.0
+        self._shadow_max_delta = 0.0
+        self._shadow_errors = 0
+    
+    async def load(self, path: str, version: str) -> Optional[LoadedModel]:
+        """Load `path` off the event loop; None if no file is deployed there."""
+        if not version or len(version) > MAX_VERSION_LENGTH:
+            raise ValueError(f"Model version must be 1-{MAX_VERSION_LENGTH} characters")
+        start = time.perf_counter()
+        model = await asyncio.get_running_loop().run_in_executor(None, load_joblib_model, path)
+        if model is None:
+            return None
+        logger.info(
+            "Model version loaded",
+            model=self.name,
+            version=version,
+            path=path,
+            load_ms=int((time.perf_counter() - start) * 1000),
+        )
+        return LoadedModel(version, model, path)
+    
+    async def activate(self, path: str, version: str) -> Optional[LoadedModel]:
+        """
+        Load `path` and make it the active version.
+        
+        The current version keeps serving until the new one is loaded; if
+        loading fails it stays active. A missing file deactivates the model
+        so scoring falls back to the rules.
+        """
+        loaded = await self.load(path, version)
+        self.swap(loaded)
+        return loaded
+    
+    def swap(self, loaded: Optional[LoadedModel]) -> None:
+        """Make an already loaded version (or no model) the active one."""
+        previous, self.active = self.active, loaded
+        if loaded is not None:
+            MODEL_SWAPS.labels(model=self.name).inc()
+        logger.info(
+            "Model version activated" if loaded else "No model deployed, using rules",
+            model=self.name,
+            version=loaded.version if loaded else None,
+            previous=previous.version if previous else None,
+        )
+    
+    async def roll_out(self, path: str, version: str) -> LoadedModel:
+        """Load `path` and make it the active version on every worker."""
+        loaded = await self._load_file(path, version)
+        await self.publish(loaded, self.candidate, self.shadow_fraction)
+        self.swap(loaded)
+        return loaded
+    
+    async def set_candidate(self, path: str, version: str, shadow_fraction: float) -> LoadedModel:
+        """
+        Load `path` as the candidate on every worker and shadow-score
+        `shadow_fraction` of calls with it.
+        """
+        if not 0.0 <= shadow_fraction <= 1.0:
+            raise ValueError("shadow_fraction must be between 0 and 1")
+        loaded = await self._load_file(path, version)
+        await self.publish(self.active, loaded, shadow_fraction)
+        self._use_candidate(loaded, shadow_fraction)
+        return loaded
+    
+    async def promote(self) -> LoadedModel:
+        """Make the candidate the active version on every worker."""
+        candidate = self.candidate
+        if candidate is None:
+            raise LookupError(f"No candidate {self.name} model to promote")
+        await self.publish(candidate, None, 0.0)
+        self.clear_candidate()
+        self.swap(candidate)
+        return candidate
+    
+    async def discard_candidate(self) -> None:
+        """Drop the candidate on every worker."""
+        await self.publish(self.active, None, 0.0)
+        self.clear_candidate()
+    
+    async def _load_file(self, path: str, version: str) -> LoadedModel:
+        loaded = await self.load(path, version)
+        if loaded is None:
+            raise FileNotFoundError(f"No model file at {path}")
+        return loaded
+    
+    def _use_candidate(self, loaded: LoadedModel, shadow_fraction: float) -> None:
+        self.clear_candidate()
+        self.candidate, self.shadow_fraction = loaded, shadow_fraction
+        logger.info("Candidate model set", model=self.name, version=loaded.version, shadow_fraction=shadow_fraction)
+    
+    def clear_candidate(self) -> None:
+        """Stop shadow scoring and reset its statistics."""
+        self.candidate, self.shadow_fraction = None, 0.0
+        self._shadow_rows, self._shadow_abs_delta, self._shadow_max_delta, self._shadow_errors = 0, 0.0, 0.0, 0
+    
+    def shadow(self, features: np.ndarray, scores: np.ndarray) -> None:
+        """
+        Sometimes score `features` with the candidate as well, in the background.
+        
+        `scores` are the active model's predict_scores output for the same
+        rows. Returns at once; the comparison runs on the shadow executor.
+        """
+        candidate = self.candidate
+        if candidate is None or random.random() >= self.shadow_fraction:
+            return
+        task = asyncio.ensure_future(self._shadow(candidate, features, scores))
+        # Hold a reference until the task finishes
+        self._shadow_tasks.add(task)
+        task.add_done_callback(self._shadow_tasks.discard)
+    
+    async def _shadow(self, candidate: LoadedModel, features: np.ndarray, scores: np.ndarray) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            shadow_scores = await loop.run_in_executor(shadow_executor, predict_scores, candidate.model, features)
+        except Exception as e:
+            MODEL_SHADOW_SCORED.labels(model=self.name, result="error").inc(len(features))
+            if candidate is self.candidate:
+                self._shadow_errors += len(features)
+            logger.warning("Shadow scoring failed", model=self.name, version=candidate.version, error=str(e))
+            return
+        
+        deltas = np.abs(np.asarray(shadow_scores, dtype=np.float64) - scores)
+        MODEL_SHADOW_SCORED.labels(model=self.name, result="ok").inc(len(deltas))
+        for delta in deltas.tolist():
+            MODEL_SHADOW_DELTA.labels(model=self.name).observe(delta)
+        # Statistics belong to the candidate they were taken against
+        if candidate is self.candidate:
+            self._shadow_rows += len(deltas)
+            self._shadow_abs_delta += float(deltas.sum())
+            self._shadow_max_delta = max(self._shadow_max_delta, float(deltas.max(initial=0.0)))
+    
+    async def publish(
+        self,
+        active: Optional[LoadedModel],
+        candidate: Optional[LoadedModel],
+        shadow_fraction: float,
+    ) -> None:
+        """
+        Record the versions every worker should serve under a new revision.
+        
+        Called before the local change, so a Redis failure changes no worker.
+        """
+        revision = uuid4().hex
+        state = {
+            "revision": revision,
+            "active": _source(active),
+            "candidate": _source(candidate),
+            "shadow_fraction": shadow_fraction if candidate else 0.0,
+        }
+        await redis_client.set(self.state_key, json.dumps(state))
+        self.revision = revision
+    
+    async def sync(self) -> bool:
+        """
+        Apply the published versions if they changed; True if they did.
+        
+        A version whose file cannot be loaded here raises and leaves the
+        revision unapplied, so the next sync tries again.
+        """
+        cached = await redis_client.get(self.state_key)
+        if cached is None:
+            return False
+        state = json.loads(cached)
+        if state["revision"] == self.revision:
+            return False
+        
+        active, candidate = state["active"], state["candidate"]
+        if active != _source(self.active):
+            if active is None:
+                loaded = None
+            elif active == _source(self.candidate):
+                # A promotion; the candidate is already loaded here
+                loaded = self.candidate
+            else:
+                loaded = await self._load_file(active["path"], active["version"])
+            self.swap(loaded)
+        if candidate is None:
+            self.clear_candidate()
+        elif candidate != _source(self.candidate):
+            self._use_candidate(
+                await self._load_file(candidate["path"], candidate["version"]), state["shadow_fraction"]
+            )
+        else:
+            self.shadow_fraction = state["shadow_fraction"]
+        self.revision = state["revision"]
+        return True
+    
+    def start_sync(self, interval: float = settings.MODEL_REGISTRY_SYNC_INTERVAL) -> None:
+        """Follow the published versions in the background."""
+        if self._sync_task is None:
+            self._sync_task = asyncio.create_task(self._sync_forever(interval))
+    
+    async def stop_sync(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            await asyncio.gather(self._sync_task, return_exceptions=True)
+            self._sync_task = None
+    
+    async def _sync_forever(self, interval: float) -> None:
+        failing = False
+        while True:
+            try:
+                await self.sync()
+                failing = False
+            except Exception as e:
+                # Log the first failure of a streak, not every poll
+                if not failing:
+                    logger.error("Model registry sync failed", model=self.name, error=str(e))
+                failing = True
+            await asyncio.sleep(interval)
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            "revision": self.revision,
+            "active": self.active.describe() if self.active else None,
+            "candidate": self.candidate.describe() if self.candidate else None,
+            "shadow": {
+                "fraction": self.shadow_fraction,
+                "rows": self._shadow_rows,
+                "errors": self._shadow_errors,
+                "mean_abs_delta": self._shadow_abs_delta / self._shadow_rows if self._shadow_rows else None,
+                "max_abs_delta": self._shadow_max_delta if self._shadow_rows else None,
+            },
+        }
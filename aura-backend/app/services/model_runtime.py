@@ -0,0 +1,73 @@
+"""
+Loading and running the agents' ML models.
+
+Models are joblib files loaded with `mmap_mode="r"`: NumPy arrays inside
+them (coefficients, lookup tables, network weights) stay in the file's
+page-cache pages, shared by every worker that maps the same file, rather
+than being copied into each worker's heap. Inference runs in a thread pool
+so the event loop keeps serving requests while a model scores.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+import joblib  # type: ignore[import-untyped]
+import numpy as np
+import structlog
+from prometheus_client import Counter, Histogram
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+MODEL_INFERENCE_SECONDS = Histogram(
+    "aura_model_inference_seconds",
+    "Time spent in model inference calls",
+    ["model"],
+)
+MODEL_FALLBACKS = Counter(
+    "aura_model_fallback_total",
+    "Scoring calls served by the rule-based path instead of a model",
+    ["model", "reason"],
+)
+
+inference_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.MODEL_INFERENCE_THREADS),
+    thread_name_prefix="aura-inference",
+)
+
+
+def load_joblib_model(path: str) -> Optional[Any]:
+    """
+    Estimator stored at `path`, memory-mapped, or None if no file is deployed.
+    
+    Only arrays saved uncompressed can be mapped; compressed files still
+    load, as private copies.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    model = joblib.load(path, mmap_mode="r")
+    if not hasattr(model, "predict"):
+        raise ValueError(f"{path} does not contain an estimator with predict()")
+    return model
+
+
+def predict_scores(model: Any, features: np.ndarray) -> np.ndarray:
+    """
+    One float per feature row.
+    
+    Classifiers give the probability of their last class (the adverse
+    outcome by convention); regressors give their prediction.
+    """
+    if hasattr(model, "predict_proba"):
+        return np.asarray(model.predict_proba(features), dtype=np.float64)[:, -1]
+    return np.asarray(model.predict(features), dtype=np.float64).reshape(-1)
+
+
+async def run_inference(name: str, fn: Callable[..., np.ndarray], *args: Any) -> np.ndarray:
+    """Run `fn(*args)` in the inference thread pool, timing it under `name`."""
+    loop = asyncio.get_running_loop()
+    with MODEL_INFERENCE_SECONDS.labels(model=name).time():
+        return await loop.run_in_executor(inference_executor, fn, *args)
@@ -0,0 +1,160 @@
+"""
+Content-addressed cache of proof results, keyed on the witness digest.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import structlog
+from prometheus_client import Counter, Gauge
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+logger = structlog.get_logger(__name__)
+
+PROOF_CACHE_LOOKUPS = Counter(
+    "aura_proof_cache_lookups_total",
+    "Witness-digest cache lookups by outcome (memory, redis or miss)",
+    ["result"],
+)
+PROOF_CACHE_SAVED = Counter(
+    "aura_proof_cache_saved_seconds_total",
+    "Proving time avoided by serving proofs from the witness-digest cache",
+)
+PROOF_CACHE_ENTRIES = Gauge(
+    "aura_proof_cache_memory_entries",
+    "Proof results held in the in-process cache tier",
+)
+
+# Witness fields that vary between otherwise identical submissions
+VOLATILE_WITNESS_FIELDS = ("timestamp",)
+
+
+def witness_digest(circuit_id: str, circuit_version: str, witness: Dict[str, int]) -> str:
+    """
+    Canonical digest of a witness for one circuit version.
+    
+    The submission timestamp is left out, so a retry of the same application
+    maps to the proof generated for the first attempt.
+    """
+    stable = {k: v for k, v in witness.items() if k not in VOLATILE_WITNESS_FIELDS}
+    canonical = json.dumps(
+        {"circuit_id": circuit_id, "circuit_version": circuit_version, "witness": stable},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ProofResultCache:
+    """
+    Two-tier proof result cache: a per-process LRU in front of Redis.
+    
+    Entries are serialized proof results. Both tiers expire after `ttl`
+    seconds, which bounds how old the timestamp signal of a reused proof can
+    be. Redis errors degrade to a miss rather than failing the request.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = settings.ZK_PROOF_CACHE_SIZE,
+        ttl: int = settings.ZK_PROOF_CACHE_TTL,
+    ):
+        self.max_entries = max(0, max_entries)
+        self.ttl = ttl
+        self.key_prefix = "zk_witness:"
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    async def get(self, digest: str, loads: Callable[[str], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Cached result for a witness digest, decoded with `loads`, or None."""
+        return (await self.get_many([digest], loads))[0]
+    
+    async def get_many(
+        self,
+        digests: Sequence[str],
+        loads: Callable[[str], Dict[str, Any]],
+    ) -> List[Optional[Dict[str, Any]]]:
+        """`get` for many digests, with one pipelined Redis round trip for the local misses."""
+        records = [self._get_local(digest) for digest in digests]
+        tiers = ["memory" if record is not None else "miss" for record in records]
+        missing = [i for i, record in enumerate(records) if record is None]
+        if missing:
+            try:
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    for i in missing:
+                        pipe.get(f"{self.key_prefix}{digests[i]}")
+                        pipe.ttl(f"{self.key_prefix}{digests[i]}")
+                    replies = await pipe.execute()
+            except Exception as e:
+                logger.warning("Proof cache lookup failed", error=str(e))
+                replies = []
+            for i, record, remaining in zip(missing, replies[::2], replies[1::2]):
+                if record is not None:
+                    # Keep the Redis expiry so the local copy does not outlive it
+                    self._put_local(digests[i], record, remaining if remaining > 0 else self.ttl)
+                    records[i], tiers[i] = record, "redis"
+        
+        results: List[Optional[Dict[str, Any]]] = []
+        for record, tier in zip(records, tiers):
+            PROOF_CACHE_LOOKUPS.labels(result=tier).inc()
+            if record is None:
+                results.append(None)
+                continue
+            result = loads(record)
+            PROOF_CACHE_SAVED.inc(result.get("proving_time_ms", 0) / 1000)
+            results.append(result)
+        return results
+    
+    async def put(self, digest: str, record: str) -> None:
+        """Store a serialized result in both tiers."""
+        await self.put_many([(digest, record)])
+    
+    async def put_many(self, records: Sequence[Tuple[str, str]]) -> None:
+        """Store (digest, serialized result) pairs in both tiers, in one Redis round trip."""
+        for digest, record in records:
+            self._put_local(digest, record, self.ttl)
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for digest, record in records:
+                    pipe.setex(f"{self.key_prefix}{digest}", self.ttl, record)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Proof cache write failed", error=str(e))
+    
+    def _get_local(self, digest: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            expires_at, record = entry
+            if expires_at <= time.monotonic():
+                del self._entries[digest]
+                PROOF_CACHE_ENTRIES.set(len(self._entries))
+                return None
+            self._entries.move_to_end(digest)
+            return record
+    
+    def _put_local(self, digest: str, record: str, ttl: float) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[digest] = (time.monotonic() + ttl, record)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            PROOF_CACHE_ENTRIES.set(len(self._entries))
+    
+    def clear(self) -> None:
+        """Drop the in-process tier."""
+        with self._lock:
+            self._entries.clear()
+            PROOF_CACHE_ENTRIES.set(0)
+
+
+proof_cache = ProofResultCache()
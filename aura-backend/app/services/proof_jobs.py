@@ -0,0 +1,265 @@
+"""
+Asynchronous proof jobs: submit now, poll for the result later.
+"""
+
+import asyncio
+import itertools
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.models.loan import LoanApplication, LoanStatus
+from app.services.prover_pool import ProverPoolSaturated
+from app.services.zk_prover import ZKProverService
+
+logger = structlog.get_logger(__name__)
+
+PROOF_JOBS_QUEUE_DEPTH = Gauge(
+    "aura_proof_jobs_queue_depth",
+    "Proof jobs waiting for a job worker",
+)
+PROOF_JOBS_RUNNING = Gauge(
+    "aura_proof_jobs_running",
+    "Proof jobs currently being proved",
+)
+PROOF_JOBS_TOTAL = Counter(
+    "aura_proof_jobs_total",
+    "Proof jobs by final status",
+    ["status"],
+)
+PROOF_JOBS_WAIT = Histogram(
+    "aura_proof_job_wait_seconds",
+    "Time a proof job spent queued before a worker picked it up",
+    ["priority"],
+)
+PROOF_JOBS_RUN = Histogram(
+    "aura_proof_job_run_seconds",
+    "Time a proof job spent proving",
+)
+
+# Lower value is served first
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+# Wallets with a loan in one of these states count as pre-approved
+PRE_APPROVED_STATUSES = (LoanStatus.APPROVED, LoanStatus.DISBURSED, LoanStatus.COMPLETED)
+
+
+class ProofJobQueueFull(Exception):
+    """Raised when the job queue is at capacity and a job cannot be accepted."""
+
+
+class ProofJobQueue:
+    """
+    Priority queue of proof jobs drained by a fixed number of async workers.
+    
+    The queue itself lives in this process; job records (status, timings and
+    the resulting proof hash) live in Redis so any API worker can answer a
+    status request. Long polls for jobs owned by this process wake on
+    completion, others re-read Redis until the deadline.
+    """
+    
+    def __init__(
+        self,
+        concurrency: int = settings.ZK_JOB_CONCURRENCY,
+        max_pending: int = settings.ZK_JOB_MAX_PENDING,
+        prover: Optional[ZKProverService] = None,
+        saturated_wait: float = settings.ZK_JOB_SATURATED_WAIT,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.max_pending = max(1, max_pending)
+        self.saturated_wait = saturated_wait
+        self.prover = prover or ZKProverService()
+        self.key_prefix = "zk_job:"
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self._done: Dict[str, asyncio.Event] = {}
+        self._sequence = itertools.count()
+    
+    async def start(self) -> None:
+        """Start the job workers."""
+        if not self._workers:
+            self._start()
+    
+    def _start(self) -> asyncio.PriorityQueue:
+        queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._queue = queue
+        self._workers = [
+            asyncio.create_task(self._worker(i, queue)) for i in range(self.concurrency)
+        ]
+        logger.info("Proof job workers started", concurrency=self.concurrency)
+        return queue
+    
+    async def stop(self) -> None:
+        """Cancel the job workers; queued jobs are marked as failed."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        
+        while self._queue is not None and not self._queue.empty():
+            _, _, job_id, _ = self._queue.get_nowait()
+            await self._update(job_id, status="failed", error="Server shutting down")
+        PROOF_JOBS_QUEUE_DEPTH.set(0)
+        logger.info("Proof job workers stopped")
+    
+    async def submit(self, params: Dict[str, Any], priority: str = "normal") -> Dict[str, Any]:
+        """Queue a proof job and return its record."""
+        queue = self._queue if self._queue is not None else self._start()
+        if queue.qsize() >= self.max_pending:
+            raise ProofJobQueueFull(f"Proof job queue full ({self.max_pending} jobs pending)")
+        
+        job_id = str(uuid4())
+        record = {
+            "job_id": job_id,
+            "status": "queued",
+            "priority": priority,
+            "submitted_at": datetime.utcnow().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "proof_hash": None,
+            "error": None,
+        }
+        await self._save(record)
+        
+        self._done[job_id] = asyncio.Event()
+        queue.put_nowait((PRIORITIES[priority], next(self._sequence), job_id, (params, time.time())))
+        PROOF_JOBS_QUEUE_DEPTH.set(queue.qsize())
+        return record
+    
+    async def get(self, job_id: str, wait: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Job record with its proof result once done.
+        
+        With `wait` > 0, blocks until the job finishes or the wait expires.
+        Returns None for unknown jobs, and for jobs whose record expires
+        during the wait.
+        """
+        record = await self._load(job_id)
+        if record is None:
+            return None
+        
+        deadline = time.time() + min(wait, settings.ZK_JOB_LONG_POLL_MAX)
+        while record["status"] in ("queued", "running") and time.time() < deadline:
+            remaining = deadline - time.time()
+            event = self._done.get(job_id)
+            try:
+                if event is not None:
+                    await asyncio.wait_for(event.wait(), timeout=remaining)
+                else:
+                    await asyncio.sleep(min(0.25, remaining))
+            except asyncio.TimeoutError:
+                pass
+            record = await self._load(job_id)
+            if record is None:
+                return None
+        
+        if record["status"] == "done":
+            result = await self.prover.get_cached_proof(record["proof_hash"])
+            if result is not None:
+                result["generated_at"] = record["finished_at"]
+            record["result"] = result
+        return record
+    
+    async def _worker(self, index: int, queue: asyncio.PriorityQueue) -> None:
+        while True:
+            priority, _, job_id, (params, submitted_at) = await queue.get()
+            PROOF_JOBS_QUEUE_DEPTH.set(queue.qsize())
+            try:
+                await self._run(job_id, params, submitted_at, priority)
+            except asyncio.CancelledError:
+                await self._update(job_id, status="failed", error="Server shutting down")
+                raise
+            finally:
+                queue.task_done()
+    
+    async def _run(self, job_id: str, params: Dict[str, Any], submitted_at: float, priority: int) -> None:
+        started = time.time()
+        PROOF_JOBS_WAIT.labels(priority=_priority_name(priority)).observe(started - submitted_at)
+        await self._update(job_id, status="running", started_at=datetime.utcnow().isoformat())
+        
+        PROOF_JOBS_RUNNING.inc()
+        try:
+            deadline = time.monotonic() + self.saturated_wait
+            while True:
+                try:
+                    result = await self.prover.generate_proof(**params)
+                    break
+                except ProverPoolSaturated as e:
+                    # Other callers share the pool; wait a while for room before failing the job
+                    if time.monotonic() >= deadline:
+                        raise ProverPoolSaturated(
+                            f"Prover pool stayed saturated for {self.saturated_wait:g} s: {e}"
+                        ) from e
+                    await asyncio.sleep(0.1)
+        except Exception as e:
+            logger.error("Proof job failed", job_id=job_id, error=str(e))
+            PROOF_JOBS_TOTAL.labels(status="failed").inc()
+            await self._update(
+                job_id, status="failed", error=str(e), finished_at=datetime.utcnow().isoformat()
+            )
+        else:
+            PROOF_JOBS_TOTAL.labels(status="done").inc()
+            await self._update(
+                job_id,
+                status="done",
+                proof_hash=result["proof_hash"],
+                finished_at=datetime.utcnow().isoformat(),
+            )
+        finally:
+            PROOF_JOBS_RUNNING.dec()
+            PROOF_JOBS_RUN.observe(time.time() - started)
+            event = self._done.pop(job_id, None)
+            if event is not None:
+                event.set()
+    
+    async def _save(self, record: Dict[str, Any]) -> None:
+        await redis_client.setex(
+            f"{self.key_prefix}{record['job_id']}",
+            settings.CACHE_TTL,
+            json.dumps(record),
+        )
+    
+    async def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        cached = await redis_client.get(f"{self.key_prefix}{job_id}")
+        return json.loads(cached) if cached else None
+    
+    async def _update(self, job_id: str, **fields: Any) -> None:
+        record = await self._load(job_id)
+        if record is not None:
+            record.update(fields)
+            await self._save(record)
+
+
+async def job_priority(session: AsyncSession, application_id: UUID) -> str:
+    """
+    Queue priority for an application's proof job, from stored loan state.
+    
+    Applications from pre-approved wallets go first; everything else,
+    including applications not stored yet, is normal. Callers never choose.
+    """
+    wallet = select(LoanApplication.wallet_address).where(LoanApplication.id == application_id).scalar_subquery()
+    pre_approved = await session.scalar(
+        select(
+            exists().where(
+                LoanApplication.wallet_address == wallet,
+                LoanApplication.status.in_(PRE_APPROVED_STATUSES),
+            )
+        )
+    )
+    return "high" if pre_approved else "normal"
+
+
+def _priority_name(value: int) -> str:
+    return next(name for name, rank in PRIORITIES.items() if rank == value)
+
+
+proof_job_queue = ProofJobQueue()
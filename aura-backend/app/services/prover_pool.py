@@ -0,0 +1,199 @@
+"""
+Process pool executor for CPU-bound ZK proving work.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+PROVER_POOL_WORKERS = Gauge(
+    "aura_prover_pool_workers",
+    "Worker processes in the prover pool",
+)
+PROVER_POOL_IN_FLIGHT = Gauge(
+    "aura_prover_pool_in_flight",
+    "Proving jobs currently occupying a worker",
+)
+PROVER_POOL_QUEUED = Gauge(
+    "aura_prover_pool_queued",
+    "Proving jobs admitted and waiting for a free worker",
+)
+PROVER_POOL_SATURATION = Gauge(
+    "aura_prover_pool_saturation_ratio",
+    "Admitted jobs as a fraction of pool capacity (workers + queue depth)",
+)
+PROVER_POOL_REJECTED = Counter(
+    "aura_prover_pool_rejected_total",
+    "Proving jobs rejected because the queue was full",
+)
+PROVER_POOL_TIMEOUTS = Counter(
+    "aura_prover_pool_timeouts_total",
+    "Proving jobs that exceeded the per-job timeout",
+)
+PROVER_POOL_WAIT = Histogram(
+    "aura_prover_pool_wait_seconds",
+    "Time a proving job waited for a worker",
+)
+PROVER_POOL_RUN = Histogram(
+    "aura_prover_pool_run_seconds",
+    "Time a proving job spent executing in a worker",
+)
+
+
+class ProverPoolSaturated(Exception):
+    """Raised when the prover queue is full and a job cannot be admitted."""
+
+
+class ProverJobTimeout(Exception):
+    """Raised when a proving job does not finish within the per-job timeout."""
+
+
+def _warm_worker() -> int:
+    """Pool initializer: build fixed-base tables before the first job arrives."""
+    from app.zk.fixed_base import warm_tables
+    warm_tables()
+    return os.getpid()
+
+
+def _run_job(fn: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[Any, float, float]:
+    """Execute a job inside a worker, returning (result, started_at, run_seconds)."""
+    started_at = time.time()
+    result = fn(*args)
+    return result, started_at, time.time() - started_at
+
+
+class ProverExecutor:
+    """
+    Bounded process pool for Groth16 proving.
+    
+    Keeps curve arithmetic off the event loop. Admission is bounded by
+    `workers + max_queue`; jobs beyond that are rejected immediately rather
+    than piling up behind a saturated pool.
+    """
+    
+    def __init__(
+        self,
+        workers: int = settings.ZK_PROVER_WORKERS,
+        max_queue: int = settings.ZK_PROVER_MAX_QUEUE,
+        job_timeout: float = settings.ZK_PROVER_JOB_TIMEOUT,
+    ):
+        self.workers = max(0, workers)
+        self.max_queue = max(0, max_queue)
+        self.job_timeout = job_timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._start_lock = asyncio.Lock()
+        self._admitted = 0
+        PROVER_POOL_WORKERS.set(self.workers)
+    
+    @property
+    def capacity(self) -> int:
+        """Maximum number of jobs admitted at once."""
+        return self.workers + self.max_queue
+    
+    async def start(self) -> None:
+        """Spawn the worker processes and wait until each one is warm."""
+        if self.workers:
+            await self._started_pool()
+    
+    async def _started_pool(self) -> ProcessPoolExecutor:
+        async with self._start_lock:
+            if self._pool is not None:
+                return self._pool
+            
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_warm_worker,
+            )
+            loop = asyncio.get_running_loop()
+            pids = await asyncio.gather(*[
+                loop.run_in_executor(pool, os.getpid)
+                for _ in range(self.workers)
+            ])
+            self._pool = pool
+            logger.info("Prover pool started", workers=self.workers, pids=sorted(set(pids)))
+            return pool
+    
+    def shutdown(self) -> None:
+        """Stop the worker processes, cancelling jobs that have not started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            logger.info("Prover pool stopped")
+    
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run `fn(*args)` in the pool and await its result.
+        
+        `fn` and its arguments must be picklable. Raises ProverPoolSaturated
+        when the queue is full and ProverJobTimeout when the job overruns.
+        """
+        if self.workers == 0:
+            return fn(*args)
+        
+        if self._admitted >= self.capacity:
+            PROVER_POOL_REJECTED.inc()
+            raise ProverPoolSaturated(
+                f"Prover queue full ({self._admitted}/{self.capacity} jobs admitted)"
+            )
+        
+        self._admitted += 1
+        self._update_gauges()
+        submitted_at = time.time()
+        
+        try:
+            pool = self._pool or await self._started_pool()
+            future = pool.submit(_run_job, fn, args)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is released when the worker is done with the job, not when
+        # the caller stops waiting: a timed-out job keeps its worker busy
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: self._release_threadsafe(loop))
+        
+        try:
+            result, started_at, run_seconds = await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout=self.job_timeout,
+            )
+        except asyncio.TimeoutError:
+            # A job that already started keeps its worker until it returns;
+            # ProcessPoolExecutor cannot interrupt a single task.
+            future.cancel()
+            PROVER_POOL_TIMEOUTS.inc()
+            logger.warning("Proving job timed out", timeout_s=self.job_timeout)
+            raise ProverJobTimeout(f"Proving job exceeded {self.job_timeout}s")
+        
+        PROVER_POOL_WAIT.observe(max(0.0, started_at - submitted_at))
+        PROVER_POOL_RUN.observe(run_seconds)
+        return result
+    
+    def _release(self) -> None:
+        self._admitted -= 1
+        self._update_gauges()
+    
+    def _release_threadsafe(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Done callbacks run on the pool's management thread
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            # Loop already closed; nothing is left to admit against
+            pass
+    
+    def _update_gauges(self) -> None:
+        in_flight = min(self._admitted, self.workers)
+        PROVER_POOL_IN_FLIGHT.set(in_flight)
+        PROVER_POOL_QUEUED.set(self._admitted - in_flight)
+        PROVER_POOL_SATURATION.set(self._admitted / self.capacity if self.capacity else 0.0)
+
+
+prover_executor = ProverExecutor()
@@ -0,0 +1,158 @@
+"""
+Single-call underwriting: ZK proof → Aura assessment → Lender decision.
+
+The stages run in-process and hand each other the service results as
+plain dicts, so an application is validated and serialized once instead
+of once per round trip through `/proof/generate`, `/agents/aura/assess`
+and `/agents/lender/decide`.
+"""
+
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from uuid import UUID
+
+import structlog
+from prometheus_client import Histogram
+
+from app.models.loan import LoanDecision, RiskLevel
+from app.services.agents import AuraAgent, LenderAgent
+from app.services.zk_prover import ZKProverService
+
+logger = structlog.get_logger(__name__)
+
+UNDERWRITE_STAGE_SECONDS = Histogram(
+    "aura_underwrite_stage_seconds",
+    "Time spent in each stage of the underwriting pipeline",
+    ["stage"],
+)
+
+
+class UnderwritingPipeline:
+    """Runs one application through the prover and both agents."""
+    
+    # Stage names, in order; also the keys of the combined result
+    STAGES = ("proof", "aura_assessment", "lender_decision")
+    
+    def __init__(self, prover: Optional[ZKProverService] = None):
+        self.prover = prover or ZKProverService()
+    
+    async def stages(
+        self,
+        monthly_income: float,
+        existing_debt: float,
+        requested_amount: float,
+        tenure_months: int,
+        has_compliance_flags: bool = False,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield `(stage, result)` as each stage finishes.
+        
+        The last item is `("complete", timings)` with per-stage and total
+        wall-clock milliseconds.
+        """
+        start = time.perf_counter()
+        timings: Dict[str, int] = {}
+        
+        def finish(stage: str, stage_start: float) -> None:
+            elapsed = time.perf_counter() - stage_start
+            UNDERWRITE_STAGE_SECONDS.labels(stage=stage).observe(elapsed)
+            timings[stage] = int(elapsed * 1000)
+        
+        stage_start = time.perf_counter()
+        proof = await self.prover.generate_proof(
+            monthly_income=monthly_income,
+            existing_debt=existing_debt,
+            requested_amount=requested_amount,
+            tenure_months=tenure_months,
+            has_compliance_flags=has_compliance_flags,
+        )
+        finish("proof", stage_start)
+        yield "proof", proof
+        
+        stage_start = time.perf_counter()
+        assessment = await AuraAgent.assess_risk(
+            proof_valid=proof["is_valid"],
+            **proof["conditions"],
+            requested_amount=requested_amount,
+            tenure_months=tenure_months,
+            monthly_income=monthly_income,
+            existing_debt=existing_debt,
+        )
+        finish("aura_assessment", stage_start)
+        yield "aura_assessment", assessment
+        
+        stage_start = time.perf_counter()
+        decision = await LenderAgent.make_decision(
+            aura_assessment=assessment,
+            requested_amount=requested_amount,
+            requested_tenure=tenure_months,
+        )
+        finish("lender_decision", stage_start)
+        yield "lender_decision", decision
+        
+        total_ms = int((time.perf_counter() - start) * 1000)
+        logger.info(
+            "Application underwritten",
+            is_approved=decision["is_approved"],
+            total_ms=total_ms,
+            **{f"{stage}_ms": ms for stage, ms in timings.items()},
+        )
+        yield "complete", {"stage_times_ms": timings, "total_time_ms": total_ms}
+    
+    async def run(self, **application: Any) -> Dict[str, Any]:
+        """All stages' results in one dict, keyed by stage, plus the timings."""
+        return await collect_stages(self.stages(**application))
+
+
+async def collect_stages(
+    stages: AsyncIterator[Tuple[str, Dict[str, Any]]],
+    result: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Fold the rest of a `stages` iterator into `result`: each stage's result
+    under its name, the timings at the top level.
+    """
+    result = {} if result is None else result
+    async for stage, payload in stages:
+        if stage == "complete":
+            result.update(payload)
+        else:
+            result[stage] = payload
+    return result
+
+
+def loan_decision_values(assessment: Dict[str, Any], decision: Dict[str, Any]) -> Dict[str, Any]:
+    """LoanDecision column values for an Aura assessment and Lender decision."""
+    return {
+        "risk_score": assessment["risk_score"],
+        "risk_level": RiskLevel(assessment["risk_level"]),
+        "aura_recommendation": assessment["recommendation"],
+        "aura_max_amount": assessment["max_approved_amount"],
+        "aura_confidence": assessment["confidence"],
+        "aura_reasoning": assessment["reasoning"],
+        "is_approved": decision["is_approved"],
+        "approved_amount": decision["approved_amount"],
+        "interest_rate": decision["interest_rate"],
+        "adjusted_tenure": decision["adjusted_tenure"],
+        "monthly_payment": decision["monthly_payment"],
+        "lender_explanation": decision["explanation"],
+        "aura_model_version": assessment["model_version"],
+        "lender_model_version": decision["model_version"],
+    }
+
+
+def loan_decision_record(
+    application_id: UUID,
+    assessment: Dict[str, Any],
+    decision: Dict[str, Any],
+) -> LoanDecision:
+    """
+    LoanDecision row for an Aura assessment and Lender decision.
+    
+    The model versions are the ones that actually scored the application,
+    so decisions made across a model swap stay attributable.
+    """
+    return LoanDecision(application_id=application_id, **loan_decision_values(assessment, decision))
+
+
+underwriting_pipeline = UnderwritingPipeline()
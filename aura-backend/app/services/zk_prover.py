@@ -2,21 +2,51 @@
 Zero-Knowledge Proof generation service using Groth16.
 """
 
+import asyncio
+import base64
 import hashlib
 import json
 import time
-from typing import Dict, Any, Tuple
+from collections import deque
+from typing import Dict, Any, AsyncIterator, List, Optional, Sequence, Tuple
 from uuid import uuid4
 
+import numpy as np
 import structlog
-from py_ecc.bn128 import G1, G2, multiply, add, pairing, curve_order, neg
-from py_ecc.bn128 import FQ, FQ2
+from prometheus_client import Counter, Histogram
+from py_ecc.bn128 import curve_order
 
 from app.core.config import settings
 from app.core.redis import redis_client
+from app.services.proof_cache import proof_cache, witness_digest
+from app.services.prover_pool import prover_executor
+from app.zk import codec
+from app.zk.curve import get_backend
+from app.zk.fixed_base import g1_table, g2_table
+from app.zk.msm import msm
+from app.zk.prover import Groth16Prover
+from app.zk.keystore import key_store
+from app.zk.setup import SetupUnavailable, development_setup
+from app.zk.trace import Trace
+from app.zk.verifier import get_verifier
 
 logger = structlog.get_logger(__name__)
 
+PROOF_PHASE_SECONDS = Histogram(
+    "aura_proof_phase_seconds",
+    "Time spent in each phase of single proof generation",
+    ["phase"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+CONSTRAINT_PRECHECKS = Counter(
+    "aura_zk_constraint_precheck_total",
+    "Batch constraint pre-checks by outcome (checked, skipped with no circuit deployed, unavailable)",
+    ["result"],
+)
+
+# Groth16Prover per (circuit id, version), see ZKProverService._circuit_prover
+_circuit_provers: Dict[Tuple[str, str], Groth16Prover] = {}
+
 
 class ZKProverService:
     """
@@ -36,6 +66,15 @@ class ZKProverService:
     NUM_PUBLIC_INPUTS = 5
     NUM_PRIVATE_INPUTS = 8
     
+    # Witness values wired to the circuit's private inputs, in order
+    CIRCUIT_PRIVATE_INPUTS = (
+        "monthly_income",
+        "existing_debt",
+        "requested_amount",
+        "tenure_months",
+        "compliance_flag",
+    )
+    
     def __init__(self):
         self.cache_prefix = "zk_proof:"
     
@@ -46,6 +85,7 @@ class ZKProverService:
         requested_amount: float,
         tenure_months: int,
         has_compliance_flags: bool = False,
+        include_trace: bool = False,
     ) -> Dict[str, Any]:
         """
         Generate a Groth16 ZK proof for loan eligibility.
@@ -55,61 +95,317 @@ class ZKProverService:
         2. DTI ratio < 40%
         3. No compliance flags
         
-        Without revealing the actual values.
+        Without revealing the actual values. Every phase is recorded in
+        aura_proof_phase_seconds; with `include_trace` the phase timings are
+        also returned under "trace".
         """
         start_time = time.time()
+        trace = Trace()
         
-        # Calculate conditions
-        monthly_repayment = requested_amount / tenure_months
-        income_sufficient = monthly_income >= (monthly_repayment * 3)
-        
-        dti_ratio = (existing_debt + requested_amount) / (monthly_income * 12) if monthly_income > 0 else 1.0
-        dti_acceptable = dti_ratio < 0.4
-        
-        no_compliance_flags = not has_compliance_flags
-        
-        is_valid = income_sufficient and dti_acceptable and no_compliance_flags
-        
-        # Generate witness (private inputs)
-        witness = self._compute_witness(
-            monthly_income,
-            existing_debt,
-            requested_amount,
-            tenure_months,
-            has_compliance_flags
-        )
+        with trace.phase("witness"):
+            # Calculate conditions
+            monthly_repayment = requested_amount / tenure_months
+            income_sufficient = monthly_income >= (monthly_repayment * 3)
+            
+            dti_ratio = (existing_debt + requested_amount) / (monthly_income * 12) if monthly_income > 0 else 1.0
+            dti_acceptable = dti_ratio < 0.4
+            
+            no_compliance_flags = not has_compliance_flags
+            
+            is_valid = income_sufficient and dti_acceptable and no_compliance_flags
+            
+            # Generate witness (private inputs)
+            witness = self._compute_witness(
+                monthly_income,
+                existing_debt,
+                requested_amount,
+                tenure_months,
+                has_compliance_flags
+            )
         
-        # Generate proof components (Groth16)
-        proof_data = self._generate_groth16_proof(witness, is_valid)
+        # Identical applications (e.g. frontend retries) reuse the earlier proof
+        with trace.phase("cache_lookup"):
+            digest = witness_digest(self.CIRCUIT_ID, self.CIRCUIT_VERSION, witness)
+            cached = await proof_cache.get(digest, self._deserialize_cached)
+        if cached is not None:
+            self._observe_phases(trace)
+            logger.info("ZK proof served from cache", proof_hash=cached["proof_hash"][:16])
+            if include_trace:
+                cached["trace"] = dict(trace.as_dict(), cache_hit=True)
+            return cached
         
-        # Compute public signals
+        # Compute public signals (the proof is bound to them)
         public_signals = [
             int(income_sufficient),
             int(dti_acceptable),
             int(no_compliance_flags),
             int(is_valid),
-            int(time.time())
+            witness["timestamp"],
         ]
         
+        # Generate proof components (Groth16) off the event loop
+        prove_start = time.perf_counter()
+        proof_data, worker_phases = await prover_executor.run(
+            self._generate_groth16_proof_traced, witness, is_valid, public_signals
+        )
+        trace.merge(worker_phases)
+        # Whatever the worker did not account for was spent queued or in IPC
+        trace.add("pool", max(0.0, time.perf_counter() - prove_start - sum(worker_phases.values())))
+        
         # Hash for proof identification
-        proof_hash = self._compute_proof_hash(proof_data, public_signals)
+        with trace.phase("hash"):
+            proof_hash = self._compute_proof_hash(proof_data, public_signals)
         
-        # Verification (self-verify)
+        # Verification (self-verify with the pairing check)
         verify_start = time.time()
-        verification_result = self._verify_proof(proof_data, public_signals)
+        with trace.phase("verify"):
+            verification_result = await prover_executor.run(self._verify_proof, proof_data, public_signals)
         verify_time = int((time.time() - verify_start) * 1000)
         
         proving_time = int((time.time() - start_time) * 1000)
-        proof_size = len(json.dumps(proof_data).encode())
         
-        result = {
+        result = self._build_result(
+            proof_data,
+            public_signals,
+            proof_hash,
+            is_valid and verification_result,
+            proving_time,
+            verify_time,
+        )
+        
+        # Cache the proof by hash and by witness digest
+        with trace.phase("serialize"):
+            record = self._serialize_cached(result)
+        with trace.phase("cache_write"):
+            await redis_client.setex(
+                f"{self.cache_prefix}{proof_hash}",
+                settings.CACHE_TTL,
+                record
+            )
+            await proof_cache.put(digest, record)
+        
+        self._observe_phases(trace)
+        logger.info(
+            "ZK proof generated",
+            proof_hash=proof_hash[:16],
+            is_valid=is_valid,
+            proving_time_ms=proving_time,
+            **{f"{name}_ms": ms for name, ms in trace.as_dict()["phases_ms"].items()},
+        )
+        
+        if include_trace:
+            result["trace"] = dict(trace.as_dict(), cache_hit=False)
+        return result
+    
+    @staticmethod
+    def _observe_phases(trace: Trace) -> None:
+        for name, seconds in trace.phases.items():
+            PROOF_PHASE_SECONDS.labels(phase=name).observe(seconds)
+    
+    async def generate_proofs_batch(
+        self,
+        applications: Sequence[Dict[str, Any]],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate proofs for many applications, yielding results in submission order.
+        
+        Each application carries the keyword arguments of `generate_proof`.
+        Conditions and witnesses are computed for the whole batch at once.
+        Applications whose witness digest is in the proof cache are served
+        from it; the rest are proved in chunks that run concurrently in the
+        prover pool (at most one chunk per worker in flight). Each chunk is
+        cached with pipelined Redis writes as soon as it is done, before any
+        of its results are released, so a client that disconnects mid-stream
+        loses nothing already proved.
+        """
+        start_time = time.time()
+        count = len(applications)
+        if count == 0:
+            return
+        
+        income = np.array([a["monthly_income"] for a in applications], dtype=np.float64)
+        debt = np.array([a["existing_debt"] for a in applications], dtype=np.float64)
+        amount = np.array([a["requested_amount"] for a in applications], dtype=np.float64)
+        tenure = [int(a["tenure_months"]) for a in applications]
+        flags = np.array([bool(a.get("has_compliance_flags", False)) for a in applications])
+        
+        conditions = self._compute_conditions_batch(income, debt, amount, np.array(tenure, dtype=np.int64), flags)
+        witnesses = self._compute_witness_batch(income, debt, amount, tenure, flags)
+        signals = np.stack([
+            conditions["income_sufficient"],
+            conditions["dti_acceptable"],
+            conditions["no_compliance_flags"],
+            conditions["is_valid"],
+        ], axis=1).astype(np.int64).tolist()
+        for row, witness in zip(signals, witnesses):
+            row.append(witness["timestamp"])
+        is_valid = conditions["is_valid"].tolist()
+        
+        # Repeated applications reuse the proof generated the first time
+        digests = [witness_digest(self.CIRCUIT_ID, self.CIRCUIT_VERSION, witness) for witness in witnesses]
+        cached = await proof_cache.get_many(digests, self._deserialize_cached)
+        ready = {i: dict(result, index=i) for i, result in enumerate(cached) if result is not None}
+        pending = [i for i in range(count) if i not in ready]
+        
+        # Witnesses that do not satisfy the deployed circuit fail before any curve work
+        try:
+            circuit = await asyncio.get_running_loop().run_in_executor(
+                None, key_store.circuit, self.CIRCUIT_ID, self.CIRCUIT_VERSION
+            )
+        except SetupUnavailable:
+            CONSTRAINT_PRECHECKS.labels(result="unavailable").inc()
+            raise
+        if circuit is None:
+            CONSTRAINT_PRECHECKS.labels(result="skipped").inc()
+        elif pending:
+            satisfied = await prover_executor.run(
+                self._check_constraints_batch,
+                [witnesses[i] for i in pending],
+                [signals[i] for i in pending],
+            )
+            CONSTRAINT_PRECHECKS.labels(result="checked").inc()
+            ready.update(
+                (i, self._rejected_item(i, signals[i]))
+                for i, ok in zip(pending, satisfied) if not ok
+            )
+        accepted = [i for i in pending if i not in ready]
+        
+        workers = max(1, prover_executor.workers)
+        chunk = max(1, min(settings.ZK_PROVE_BATCH_CHUNK, -(-len(accepted) // workers)))
+        starts = iter(range(0, len(accepted), chunk))
+        
+        def submit(start: int) -> asyncio.Task:
+            positions = accepted[start:start + chunk]
+            return asyncio.ensure_future(prover_executor.run(
+                self._prove_batch_chunk,
+                [witnesses[i] for i in positions],
+                [is_valid[i] for i in positions],
+                [signals[i] for i in positions],
+            ))
+        
+        in_flight = deque((start, submit(start)) for _, start in zip(range(workers), starts))
+        proved = []
+        next_index = 0
+        try:
+            while in_flight:
+                start, task = in_flight.popleft()
+                proofs, verified, verify_time = await task
+                next_start = next(starts, None)
+                if next_start is not None:
+                    in_flight.append((next_start, submit(next_start)))
+                
+                positions = accepted[start:start + chunk]
+                results = [
+                    self._build_batch_item(i, proof_data, signals[i], is_valid[i] and ok, prove_time, verify_time)
+                    for i, ((proof_data, prove_time), ok) in zip(positions, zip(proofs, verified))
+                ]
+                # Cache the chunk before any of its results are released
+                await self._cache_results(results, [digests[i] for i in positions])
+                ready.update(zip(positions, results))
+                proved.extend(results)
+                
+                while next_index in ready:
+                    yield ready.pop(next_index)
+                    next_index += 1
+        finally:
+            for _, task in in_flight:
+                task.cancel()
+        
+        while next_index in ready:
+            yield ready.pop(next_index)
+            next_index += 1
+        
+        logger.info(
+            "ZK proof batch generated",
+            count=count,
+            cached=len(cached) - cached.count(None),
+            proved=len(proved),
+            valid=sum(1 for r in proved if r["is_valid"]),
+            total_time_ms=int((time.time() - start_time) * 1000),
+        )
+    
+    def _check_constraints_batch(
+        self,
+        witnesses: List[Dict[str, int]],
+        public_signals: List[List[int]],
+    ) -> List[bool]:
+        """
+        Solve and check the deployed circuit for a batch of witnesses.
+        
+        Circuit inputs are the public inputs (the signals after the outputs)
+        followed by CIRCUIT_PRIVATE_INPUTS from the witness. A witness passes
+        when all constraints hold and the circuit's outputs equal its public
+        signals.
+        """
+        circuit = key_store.circuit(self.CIRCUIT_ID, self.CIRCUIT_VERSION)
+        if circuit is None:
+            return [True] * len(witnesses)
+        if circuit.n_public != self.NUM_PUBLIC_INPUTS or circuit.n_prv_in != len(self.CIRCUIT_PRIVATE_INPUTS):
+            raise ValueError("Deployed circuit does not match the prover's input layout")
+        
+        n_out = circuit.n_pub_out
+        inputs = np.array([
+            signals[n_out:] + [witness[name] for name in self.CIRCUIT_PRIVATE_INPUTS]
+            for witness, signals in zip(witnesses, public_signals)
+        ], dtype=object)
+        solved = circuit.solve_batch(inputs)
+        
+        outputs = np.array([signals[:n_out] for signals in public_signals], dtype=object).reshape(-1, n_out)
+        outputs_match = (solved[:, 1:1 + n_out] == outputs % curve_order).astype(bool).all(axis=1)
+        return (circuit.check_batch(solved) & outputs_match).tolist()
+    
+    def _rejected_item(self, index: int, public_signals: List[int]) -> Dict[str, Any]:
+        return {
+            "index": index,
+            "proof_hash": None,
+            "is_valid": False,
+            "conditions": {
+                "income_sufficient": bool(public_signals[0]),
+                "dti_acceptable": bool(public_signals[1]),
+                "no_compliance_flags": bool(public_signals[2]),
+            },
+            "public_signals": public_signals,
+            "error": "Witness does not satisfy the circuit constraints",
+        }
+    
+    def _build_batch_item(
+        self,
+        index: int,
+        proof_data: Dict[str, Any],
+        public_signals: List[int],
+        is_valid: bool,
+        proving_time: int,
+        verify_time: int,
+    ) -> Dict[str, Any]:
+        result = self._build_result(
+            proof_data,
+            public_signals,
+            self._compute_proof_hash(proof_data, public_signals),
+            is_valid,
+            proving_time,
+            verify_time,
+        )
+        result["index"] = index
+        return result
+    
+    def _build_result(
+        self,
+        proof_data: Dict[str, Any],
+        public_signals: List[int],
+        proof_hash: str,
+        is_valid: bool,
+        proving_time: int,
+        verify_time: int,
+    ) -> Dict[str, Any]:
+        """Assemble the proof response; conditions are read back from the public signals."""
+        return {
             "proof_id": str(uuid4()),
             "proof_hash": proof_hash,
-            "is_valid": is_valid and verification_result,
+            "is_valid": is_valid,
             "conditions": {
-                "income_sufficient": income_sufficient,
-                "dti_acceptable": dti_acceptable,
-                "no_compliance_flags": no_compliance_flags,
+                "income_sufficient": bool(public_signals[0]),
+                "dti_acceptable": bool(public_signals[1]),
+                "no_compliance_flags": bool(public_signals[2]),
             },
             "circuit_metadata": {
                 "circuit_id": self.CIRCUIT_ID,
@@ -121,27 +417,98 @@ class ZKProverService:
                 "num_private_inputs": self.NUM_PRIVATE_INPUTS,
             },
             "proving_time_ms": proving_time,
-            "proof_size_bytes": proof_size,
+            "proof_size_bytes": codec.PROOF_SIZE,
             "verification_time_ms": verify_time,
             "proof_data": proof_data,
             "public_signals": public_signals,
         }
+    
+    async def _cache_results(self, results: List[Dict[str, Any]], digests: List[str]) -> None:
+        """Cache proof results by proof hash and by witness digest, one pipelined round trip each."""
+        records = [self._serialize_cached({k: v for k, v in result.items() if k != "index"}) for result in results]
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for result, record in zip(results, records):
+                pipe.setex(f"{self.cache_prefix}{result['proof_hash']}", settings.CACHE_TTL, record)
+            await pipe.execute()
+        await proof_cache.put_many(list(zip(digests, records)))
+    
+    @staticmethod
+    def _compute_conditions_batch(
+        monthly_income: np.ndarray,
+        existing_debt: np.ndarray,
+        requested_amount: np.ndarray,
+        tenure_months: np.ndarray,
+        has_compliance_flags: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Eligibility conditions for a batch, as boolean arrays.
         
-        # Cache the proof
-        await redis_client.setex(
-            f"{self.cache_prefix}{proof_hash}",
-            settings.CACHE_TTL,
-            json.dumps(result)
-        )
+        Uses the same float64 operations in the same order as `generate_proof`,
+        so every row matches the scalar path exactly.
+        """
+        if np.any(tenure_months == 0):
+            raise ValueError("tenure_months must be non-zero")
         
-        logger.info(
-            "ZK proof generated",
-            proof_hash=proof_hash[:16],
-            is_valid=is_valid,
-            proving_time_ms=proving_time
+        monthly_repayment = requested_amount / tenure_months
+        income_sufficient = monthly_income >= (monthly_repayment * 3)
+        
+        dti_ratio = np.ones_like(monthly_income)
+        np.divide(
+            existing_debt + requested_amount,
+            monthly_income * 12,
+            out=dti_ratio,
+            where=monthly_income > 0,
         )
+        dti_acceptable = dti_ratio < 0.4
         
-        return result
+        no_compliance_flags = ~has_compliance_flags
+        
+        return {
+            "income_sufficient": income_sufficient,
+            "dti_acceptable": dti_acceptable,
+            "no_compliance_flags": no_compliance_flags,
+            "is_valid": income_sufficient & dti_acceptable & no_compliance_flags,
+        }
+    
+    @staticmethod
+    def _compute_witness_batch(
+        monthly_income: np.ndarray,
+        existing_debt: np.ndarray,
+        requested_amount: np.ndarray,
+        tenure_months: List[int],
+        has_compliance_flags: np.ndarray,
+    ) -> List[Dict[str, int]]:
+        """Witnesses for a batch; identical to `_compute_witness` row by row."""
+        scale = 1_000_000
+        timestamp = int(time.time())
+        
+        def scaled(values: np.ndarray) -> List[int]:
+            # int() truncates toward zero, as does np.trunc
+            truncated = np.trunc(values * scale)
+            if np.any(np.abs(truncated) >= 2 ** 63):
+                return [int(v) for v in truncated.tolist()]
+            return truncated.astype(np.int64).tolist()
+        
+        columns = zip(
+            scaled(monthly_income),
+            scaled(existing_debt),
+            scaled(requested_amount),
+            tenure_months,
+            has_compliance_flags.astype(np.int64).tolist(),
+        )
+        return [
+            {
+                "monthly_income": income,
+                "existing_debt": debt,
+                "requested_amount": amount,
+                "tenure_months": tenure,
+                "compliance_flag": flag,
+                "income_threshold_multiplier": 3 * scale,
+                "dti_threshold": int(0.4 * scale),
+                "timestamp": timestamp,
+            }
+            for income, debt, amount, tenure, flag in columns
+        ]
     
     def _compute_witness(
         self,
@@ -166,52 +533,138 @@ class ZKProverService:
             "timestamp": int(time.time()),
         }
     
-    def _generate_groth16_proof(self, witness: Dict[str, int], is_valid: bool) -> Dict[str, Any]:
+    def _generate_groth16_proof_traced(
+        self,
+        witness: Dict[str, int],
+        is_valid: bool,
+        public_signals: List[int],
+    ) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """`_generate_groth16_proof` plus its phase timings, for use in a pool worker."""
+        trace = Trace()
+        proof_data = self._generate_groth16_proof(witness, is_valid, public_signals, trace)
+        return proof_data, trace.phases
+    
+    def _generate_groth16_proof(
+        self,
+        witness: Dict[str, int],
+        is_valid: bool,
+        public_signals: List[int],
+        trace: Optional[Trace] = None,
+    ) -> Dict[str, Any]:
         """
         Generate Groth16 proof components.
         
-        In production, this would use the actual proving key and R1CS constraints.
-        For the MVP, we generate cryptographically valid-looking proof components.
+        When a circuit and proving key are deployed, the full witness is solved
+        from the circuit and proved with app.zk.prover (NTT-based quotient).
+        Otherwise, if the development setup is enabled, A and B are derived from
+        the witness and C is solved with its trapdoor, so the proof passes the
+        real pairing check against the development verification key. As with a
+        real proving key, C is a fixed-base term plus an MSM of the public
+        inputs over query points. Without either, raises SetupUnavailable.
         """
+        trace = trace or Trace()
+        prover = self._circuit_prover()
+        if prover is not None:
+            circuit = prover.circuit
+            inputs = public_signals[circuit.n_pub_out:] + [
+                witness[name] for name in self.CIRCUIT_PRIVATE_INPUTS
+            ]
+            with trace.phase("solve"):
+                full_witness = circuit.solve_batch(np.array([inputs], dtype=object))[0]
+            points = prover.prove(full_witness.tolist(), trace=trace)
+            with trace.phase("encode"):
+                return codec.proof_data_from_points(*points)
+        
+        setup = development_setup(self.CIRCUIT_ID, self.CIRCUIT_VERSION, self.NUM_PUBLIC_INPUTS)
+        
         # Derive deterministic but unpredictable values from witness
-        witness_bytes = json.dumps(witness, sort_keys=True).encode()
-        seed = hashlib.sha256(witness_bytes).digest()
+        with trace.phase("seed"):
+            witness_bytes = json.dumps(witness, sort_keys=True).encode()
+            seed = hashlib.sha256(witness_bytes).digest()
+        
+        # Generate proof elements on BN254 curve (fixed-base tables),
+        # normalizing each point to affine coordinates once at the end
+        backend = get_backend()
         
-        # Generate proof elements on BN254 curve
         # pi_a: G1 point
-        scalar_a = int.from_bytes(seed[:16], 'big') % curve_order
-        pi_a = multiply(G1, scalar_a)
+        with trace.phase("g1"):
+            scalar_a = int.from_bytes(seed[:16], 'big') % curve_order
+            pi_a = backend.g1_affine(g1_table().multiply(scalar_a))
         
         # pi_b: G2 point
-        scalar_b = int.from_bytes(seed[16:32], 'big') % curve_order
-        pi_b = multiply(G2, scalar_b)
+        with trace.phase("g2"):
+            scalar_b = int.from_bytes(seed[16:32], 'big') % curve_order
+            pi_b = backend.g2_affine(g2_table().multiply(scalar_b))
         
         # pi_c: G1 point
-        seed2 = hashlib.sha256(seed).digest()
-        scalar_c = int.from_bytes(seed2[:16], 'big') % curve_order
-        pi_c = multiply(G1, scalar_c)
+        with trace.phase("g1"):
+            pi_c = backend.g1_affine(backend.add(
+                g1_table().multiply(setup.c_base_scalar(scalar_a, scalar_b)),
+                msm(setup.c_query(backend), public_signals, backend),
+            ))
         
-        return {
-            "pi_a": [str(pi_a[0]), str(pi_a[1]), "1"],
-            "pi_b": [
-                [str(pi_b[0].coeffs[0]), str(pi_b[0].coeffs[1])],
-                [str(pi_b[1].coeffs[0]), str(pi_b[1].coeffs[1])],
-                ["1", "0"]
-            ],
-            "pi_c": [str(pi_c[0]), str(pi_c[1]), "1"],
-            "protocol": "groth16",
-            "curve": "bn254",
-        }
+        with trace.phase("encode"):
+            return codec.proof_data_from_points(pi_a, pi_b, pi_c)
+    
+    def _circuit_prover(self) -> Optional[Groth16Prover]:
+        """
+        Prover for the deployed circuit and proving key, if both are present.
+        
+        Built once per circuit version and process, and rebuilt only when the
+        key store hands out a different circuit, key or curve backend.
+        Circuits the witness solver cannot handle raise SetupUnavailable.
+        """
+        circuit = key_store.circuit(self.CIRCUIT_ID, self.CIRCUIT_VERSION)
+        if circuit is None:
+            return None
+        proving_key = key_store.proving_key(self.CIRCUIT_ID, self.CIRCUIT_VERSION)
+        if proving_key is None:
+            return None
+        
+        key = (self.CIRCUIT_ID, self.CIRCUIT_VERSION)
+        prover = _circuit_provers.get(key)
+        if (
+            prover is None
+            or prover.circuit is not circuit
+            or prover.proving_key is not proving_key
+            or prover.backend.name != get_backend().name
+        ):
+            prover = _circuit_provers[key] = Groth16Prover(circuit, proving_key)
+        return prover
+    
+    def _prove_batch_chunk(
+        self,
+        witnesses: List[Dict[str, int]],
+        is_valid: List[bool],
+        public_signals: List[List[int]],
+    ) -> Tuple[List[Tuple[Dict[str, Any], int]], List[bool], int]:
+        """
+        Prove a chunk of a batch and self-verify it with one batched pairing check.
+        
+        Returns (proof_data, proving_time_ms) per item, the per-item verification
+        results and the chunk's verification time amortized per proof.
+        """
+        proofs = []
+        for witness, valid, signals in zip(witnesses, is_valid, public_signals):
+            start = time.time()
+            proof_data = self._generate_groth16_proof(witness, valid, signals)
+            proofs.append((proof_data, int((time.time() - start) * 1000)))
+        
+        verify_start = time.time()
+        verified = self._verify_proof_batch([
+            (proof_data, signals) for (proof_data, _), signals in zip(proofs, public_signals)
+        ])
+        verify_time = int((time.time() - verify_start) * 1000 / max(1, len(proofs)))
+        return proofs, verified, verify_time
     
     def _verify_proof(self, proof_data: Dict[str, Any], public_signals: list) -> bool:
         """
         Verify the Groth16 proof using pairing checks.
         
-        In production, this performs the actual pairing equation check:
+        Performs the pairing equation check against ZK_VERIFICATION_KEY_PATH:
         e(A, B) = e(alpha, beta) * e(sum(public_inputs * IC), gamma) * e(C, delta)
         """
         try:
-            # Simplified verification (in production, use full pairing check)
             pi_a = proof_data.get("pi_a")
             pi_b = proof_data.get("pi_b")
             pi_c = proof_data.get("pi_c")
@@ -220,13 +673,73 @@ class ZKProverService:
             if not all([pi_a, pi_b, pi_c]):
                 return False
             
-            # Verify points are on curve (basic check)
-            return len(pi_a) == 3 and len(pi_b) == 3 and len(pi_c) == 3
+            if not (len(pi_a) == 3 and len(pi_b) == 3 and len(pi_c) == 3):
+                return False
             
+            # Curve/subgroup membership and the pairing equation
+            verifier = self._verifier()
+            points = self._parse_proof_points(proof_data, verifier.backend)
+            return verifier.verify(points, [int(x) for x in public_signals])
+        
         except Exception as e:
             logger.error("Proof verification failed", error=str(e))
             return False
     
+    def _verify_proof_batch(self, proofs: List[Tuple[Dict[str, Any], list]]) -> List[bool]:
+        """
+        Verify many proofs with one randomized pairing product.
+        
+        Malformed proofs are reported as invalid without failing the batch.
+        """
+        verifier = self._verifier()
+        results = [False] * len(proofs)
+        parsed, indices = [], []
+        
+        for i, (proof_data, public_signals) in enumerate(proofs):
+            try:
+                points = self._parse_proof_points(proof_data, verifier.backend)
+                parsed.append((points, [int(x) for x in public_signals]))
+                indices.append(i)
+            except Exception as e:
+                logger.warning("Malformed proof in batch", index=i, error=str(e))
+        
+        for i, ok in zip(indices, verifier.verify_batch(parsed)):
+            results[i] = ok
+        return results
+    
+    async def verify_proofs_batch(self, proofs: List[Tuple[Dict[str, Any], list]]) -> List[bool]:
+        """Batch-verify proofs in the prover pool, one chunk per job."""
+        chunk = max(1, settings.ZK_VERIFY_BATCH_CHUNK)
+        chunks = [proofs[i:i + chunk] for i in range(0, len(proofs), chunk)]
+        
+        chunk_results = await asyncio.gather(*[
+            prover_executor.run(self._verify_proof_batch, part) for part in chunks
+        ])
+        return [ok for part in chunk_results for ok in part]
+    
+    def _verifier(self):
+        vk = key_store.verification_key(
+            self.CIRCUIT_ID,
+            self.CIRCUIT_VERSION,
+            self.NUM_PUBLIC_INPUTS,
+        )
+        return get_verifier(vk, get_backend().name)
+    
+    @staticmethod
+    def _parse_proof_points(proof_data: Dict[str, Any], backend) -> Tuple[Any, Any, Any]:
+        """Decode pi_a, pi_b, pi_c from their decimal-string form into backend points."""
+        pi_a = proof_data["pi_a"]
+        pi_b = proof_data["pi_b"]
+        pi_c = proof_data["pi_c"]
+        
+        a = backend.g1_from_ints(int(pi_a[0]), int(pi_a[1]))
+        b = backend.g2_from_ints(
+            (int(pi_b[0][0]), int(pi_b[0][1])),
+            (int(pi_b[1][0]), int(pi_b[1][1])),
+        )
+        c = backend.g1_from_ints(int(pi_c[0]), int(pi_c[1]))
+        return a, b, c
+    
     def _compute_proof_hash(self, proof_data: Dict[str, Any], public_signals: list) -> str:
         """Compute deterministic hash of proof for identification."""
         data = {
@@ -236,9 +749,37 @@ class ZKProverService:
         serialized = json.dumps(data, sort_keys=True).encode()
         return hashlib.sha256(serialized).hexdigest()
     
+    @staticmethod
+    def _serialize_cached(result: Dict[str, Any]) -> str:
+        """
+        Cache record with the proof in compressed binary form.
+        
+        The shared Redis client decodes responses as text, so the 128-byte
+        proof is stored base64-encoded in place of the decimal-string points.
+        """
+        record = {k: v for k, v in result.items() if k != "proof_data"}
+        record["proof"] = base64.b64encode(codec.encode_proof(result["proof_data"])).decode()
+        record["proof_encoding"] = codec.ENCODING
+        return json.dumps(record)
+    
+    @staticmethod
+    def _deserialize_cached(cached: str) -> Dict[str, Any]:
+        record = json.loads(cached)
+        if "proof" in record:
+            record["proof_data"] = codec.decode_proof(base64.b64decode(record.pop("proof")))
+            record.pop("proof_encoding", None)
+        return record
+    
     async def get_cached_proof(self, proof_hash: str) -> Dict[str, Any] | None:
         """Retrieve cached proof by hash."""
         cached = await redis_client.get(f"{self.cache_prefix}{proof_hash}")
         if cached:
-            return json.loads(cached)
+            return self._deserialize_cached(cached)
         return None
+    
+    async def get_cached_proofs(self, proof_hashes: List[str]) -> List[Dict[str, Any] | None]:
+        """Retrieve several cached proofs in one round trip."""
+        if not proof_hashes:
+            return []
+        cached = await redis_client.mget([f"{self.cache_prefix}{h}" for h in proof_hashes])
+        return [self._deserialize_cached(c) if c else None for c in cached]
@@ -0,0 +1,41 @@
+"""
+Zero-knowledge proving primitives over BN254.
+"""
+
+from app.zk.codec import decode_proof, encode_proof
+from app.zk.curve import CurveBackend, get_backend
+from app.zk.fixed_base import FixedBaseTable, g1_table, g2_table, warm_tables
+from app.zk.keystore import KeyStore, ProvingKey, key_store
+from app.zk.msm import msm
+from app.zk.ntt import Domain, get_domain
+from app.zk.prover import Groth16Prover
+from app.zk.r1cs import R1CS, load_r1cs
+from app.zk.setup import DevelopmentSetup, SetupUnavailable, VerificationKey, load_verification_key
+from app.zk.trace import Trace
+from app.zk.verifier import Groth16Verifier
+
+__all__ = [
+    "encode_proof",
+    "decode_proof",
+    "CurveBackend",
+    "get_backend",
+    "FixedBaseTable",
+    "g1_table",
+    "g2_table",
+    "warm_tables",
+    "KeyStore",
+    "ProvingKey",
+    "key_store",
+    "msm",
+    "Domain",
+    "get_domain",
+    "Groth16Prover",
+    "R1CS",
+    "load_r1cs",
+    "DevelopmentSetup",
+    "SetupUnavailable",
+    "VerificationKey",
+    "load_verification_key",
+    "Trace",
+    "Groth16Verifier",
+]
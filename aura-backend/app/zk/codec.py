@@ -0,0 +1,223 @@
+"""
+Compact binary encoding of Groth16 proofs with compressed BN254 points.
+
+G1 points take 32 bytes (x) and G2 points 64 bytes (x.c1 || x.c0), big
+endian. The field modulus is below 2^254, so the two top bits of the
+first byte carry flags: 0x80 marks the lexicographically larger of the
+two y roots and 0x40 the point at infinity. A proof is A || B || C, 128
+bytes; public signals follow as 32-byte field elements.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from py_ecc.bn128 import curve_order, field_modulus as P
+
+from app.zk.curve import G1Ints, G2Ints
+
+G1_SIZE = 32
+G2_SIZE = 64
+PROOF_SIZE = 2 * G1_SIZE + G2_SIZE
+SIGNAL_SIZE = 32
+
+ENCODING = "bn254-groth16-compressed-v1"
+
+_FLAG_LARGEST = 0x80
+_FLAG_INFINITY = 0x40
+_FLAG_MASK = _FLAG_LARGEST | _FLAG_INFINITY
+
+_HALF_P = (P - 1) // 2
+_SQRT_EXP = (P + 1) // 4  # p = 3 mod 4
+_INV2 = pow(2, -1, P)
+
+# y^2 = x^3 + 3 on G1 and y^2 = x^3 + 3 / (9 + u) on the twist
+_B1 = 3
+_B2 = (27 * pow(82, -1, P) % P, -3 * pow(82, -1, P) % P)
+
+
+def _fp_sqrt(a: int) -> Optional[int]:
+    root = pow(a, _SQRT_EXP, P)
+    return root if root * root % P == a else None
+
+
+def _fp2_mul(a: Tuple[int, int], b: Tuple[int, int]) -> Tuple[int, int]:
+    # Fp2 = Fp[u] / (u^2 + 1)
+    return (a[0] * b[0] - a[1] * b[1]) % P, (a[0] * b[1] + a[1] * b[0]) % P
+
+
+def _fp2_sqrt(a: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+    """
+    Square root in Fp2 through the norm: two Fp square roots and one inversion.
+    
+    For a = a0 + a1*u, with s = sqrt(a0^2 + a1^2), x0 = sqrt((a0 + s) / 2)
+    (or (a0 - s) / 2) and x1 = a1 / (2 * x0).
+    """
+    a0, a1 = a
+    if a1 == 0:
+        root = _fp_sqrt(a0)
+        if root is not None:
+            return root, 0
+        root = _fp_sqrt(-a0 % P)
+        return (0, root) if root is not None else None
+    
+    s = _fp_sqrt((a0 * a0 + a1 * a1) % P)
+    if s is None:
+        return None
+    x0 = _fp_sqrt((a0 + s) * _INV2 % P)
+    if x0 is None:
+        x0 = _fp_sqrt((a0 - s) * _INV2 % P)
+        if x0 is None:
+            return None
+    x1 = a1 * pow(2 * x0, -1, P) % P
+    return x0, x1
+
+
+def _fp2_is_largest(y: Tuple[int, int]) -> bool:
+    # Compare c1 first, then c0
+    if y[1]:
+        return y[1] > _HALF_P
+    return y[0] > _HALF_P
+
+
+def _read_fp(data: bytes) -> int:
+    value = int.from_bytes(data, "big")
+    if value >= P:
+        raise ValueError("Coordinate is not a field element")
+    return value
+
+
+def compress_g1(point: Optional[G1Ints]) -> bytes:
+    """Compress an affine G1 point (None for infinity) to 32 bytes."""
+    if point is None:
+        return bytes([_FLAG_INFINITY]) + bytes(G1_SIZE - 1)
+    
+    x, y = point
+    out = bytearray(x.to_bytes(G1_SIZE, "big"))
+    if y > _HALF_P:
+        out[0] |= _FLAG_LARGEST
+    return bytes(out)
+
+
+def decompress_g1(data: bytes) -> Optional[G1Ints]:
+    """Recover an affine G1 point; raises ValueError if x is not on the curve."""
+    if len(data) != G1_SIZE:
+        raise ValueError(f"G1 point must be {G1_SIZE} bytes, got {len(data)}")
+    
+    flags = data[0] & _FLAG_MASK
+    body = bytes([data[0] & ~_FLAG_MASK & 0xFF]) + data[1:]
+    if flags & _FLAG_INFINITY:
+        if any(body) or flags & _FLAG_LARGEST:
+            raise ValueError("Malformed G1 point at infinity")
+        return None
+    
+    x = _read_fp(body)
+    y = _fp_sqrt((x * x * x + _B1) % P)
+    if y is None:
+        raise ValueError("G1 x-coordinate is not on the curve")
+    if (y > _HALF_P) != bool(flags & _FLAG_LARGEST):
+        y = P - y
+    return x, y
+
+
+def compress_g2(point: Optional[G2Ints]) -> bytes:
+    """Compress an affine G2 point (None for infinity) to 64 bytes."""
+    if point is None:
+        return bytes([_FLAG_INFINITY]) + bytes(G2_SIZE - 1)
+    
+    (x0, x1), y = point
+    out = bytearray(x1.to_bytes(32, "big") + x0.to_bytes(32, "big"))
+    if _fp2_is_largest(y):
+        out[0] |= _FLAG_LARGEST
+    return bytes(out)
+
+
+def decompress_g2(data: bytes) -> Optional[G2Ints]:
+    """Recover an affine G2 point; raises ValueError if x is not on the twist."""
+    if len(data) != G2_SIZE:
+        raise ValueError(f"G2 point must be {G2_SIZE} bytes, got {len(data)}")
+    
+    flags = data[0] & _FLAG_MASK
+    body = bytes([data[0] & ~_FLAG_MASK & 0xFF]) + data[1:]
+    if flags & _FLAG_INFINITY:
+        if any(body) or flags & _FLAG_LARGEST:
+            raise ValueError("Malformed G2 point at infinity")
+        return None
+    
+    x = (_read_fp(body[32:]), _read_fp(body[:32]))
+    x3 = _fp2_mul(_fp2_mul(x, x), x)
+    y = _fp2_sqrt(((x3[0] + _B2[0]) % P, (x3[1] + _B2[1]) % P))
+    if y is None:
+        raise ValueError("G2 x-coordinate is not on the curve")
+    if _fp2_is_largest(y) != bool(flags & _FLAG_LARGEST):
+        y = (-y[0] % P, -y[1] % P)
+    return x, y
+
+
+def encode_proof(proof_data: Dict[str, Any]) -> bytes:
+    """Encode a proof in decimal-string (snarkjs) form as 128 bytes."""
+    pi_a, pi_b, pi_c = proof_data["pi_a"], proof_data["pi_b"], proof_data["pi_c"]
+    a = int(pi_a[0]), int(pi_a[1])
+    b = (int(pi_b[0][0]), int(pi_b[0][1])), (int(pi_b[1][0]), int(pi_b[1][1]))
+    c = int(pi_c[0]), int(pi_c[1])
+    return compress_g1(a) + compress_g2(b) + compress_g1(c)
+
+
+def decode_proof_points(data: bytes) -> Tuple[G1Ints, G2Ints, G1Ints]:
+    """Decode 128 bytes into affine (A, B, C) integer points."""
+    if len(data) != PROOF_SIZE:
+        raise ValueError(f"Proof must be {PROOF_SIZE} bytes, got {len(data)}")
+    
+    a = decompress_g1(data[:G1_SIZE])
+    b = decompress_g2(data[G1_SIZE:G1_SIZE + G2_SIZE])
+    c = decompress_g1(data[G1_SIZE + G2_SIZE:])
+    if a is None or b is None or c is None:
+        raise ValueError("Proof points must not be at infinity")
+    return a, b, c
+
+
+def decode_proof(data: bytes) -> Dict[str, Any]:
+    """Decode 128 bytes back into the decimal-string form served to the frontend."""
+    return proof_data_from_points(*decode_proof_points(data))
+
+
+def proof_data_from_points(a: G1Ints, b: G2Ints, c: G1Ints) -> Dict[str, Any]:
+    """Decimal-string (snarkjs) form of affine proof points."""
+    return {
+        "pi_a": [str(a[0]), str(a[1]), "1"],
+        "pi_b": [
+            [str(b[0][0]), str(b[0][1])],
+            [str(b[1][0]), str(b[1][1])],
+            ["1", "0"]
+        ],
+        "pi_c": [str(c[0]), str(c[1]), "1"],
+        "protocol": "groth16",
+        "curve": "bn254",
+    }
+
+
+def encode_public_signals(public_signals: Sequence[int]) -> bytes:
+    """Encode public signals as consecutive 32-byte big-endian field elements."""
+    out = bytearray()
+    for signal in public_signals:
+        value = int(signal)
+        if not 0 <= value < curve_order:
+            raise ValueError("Public signal is not a scalar field element")
+        out += value.to_bytes(SIGNAL_SIZE, "big")
+    return bytes(out)
+
+
+def decode_public_signals(data: bytes) -> List[int]:
+    if len(data) % SIGNAL_SIZE:
+        raise ValueError(f"Public signals must be a multiple of {SIGNAL_SIZE} bytes")
+    return [
+        int.from_bytes(data[i:i + SIGNAL_SIZE], "big")
+        for i in range(0, len(data), SIGNAL_SIZE)
+    ]
+
+
+def encode_bundle(proof_data: Dict[str, Any], public_signals: Sequence[int]) -> bytes:
+    """Proof followed by its public signals, as served for application/octet-stream."""
+    return encode_proof(proof_data) + encode_public_signals(public_signals)
+
+
+def decode_bundle(data: bytes) -> Tuple[Dict[str, Any], List[int]]:
+    return decode_proof(data[:PROOF_SIZE]), decode_public_signals(data[PROOF_SIZE:])
@@ -0,0 +1,261 @@
+"""
+Pluggable BN254 curve arithmetic backends.
+
+The prover and verifier only talk to a CurveBackend, so the point
+representation (affine or projective) can change without touching the
+proof format: points cross the boundary as plain affine integers.
+"""
+
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple, Type
+
+from py_ecc import bn128, optimized_bn128
+
+from app.core.config import settings
+
+G1Ints = Tuple[int, int]
+G2Ints = Tuple[Tuple[int, int], Tuple[int, int]]
+
+
+class CurveBackend(ABC):
+    """Interface for G1/G2 group operations used by the prover and verifier."""
+    
+    name: str = ""
+    # Generators and identities, in the backend's point representation
+    G1: Any = None
+    G2: Any = None
+    Z1: Any = None
+    Z2: Any = None
+    
+    @abstractmethod
+    def add(self, p, q):
+        raise NotImplementedError
+    
+    @abstractmethod
+    def double(self, p):
+        raise NotImplementedError
+    
+    @abstractmethod
+    def neg(self, p):
+        raise NotImplementedError
+    
+    @abstractmethod
+    def multiply(self, p, scalar: int):
+        raise NotImplementedError
+    
+    @abstractmethod
+    def is_zero(self, p) -> bool:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def identity_like(self, p):
+        """Identity of the group (G1 or G2) that `p` belongs to."""
+        raise NotImplementedError
+    
+    @abstractmethod
+    def g1_to_ints(self, p) -> Optional[G1Ints]:
+        """Normalize a G1 point to affine integers (None for infinity)."""
+        raise NotImplementedError
+    
+    @abstractmethod
+    def g2_to_ints(self, p) -> Optional[G2Ints]:
+        """Normalize a G2 point to affine integers (None for infinity)."""
+        raise NotImplementedError
+    
+    def g1_affine(self, p) -> G1Ints:
+        """g1_to_ints for points that must not be at infinity; raises ValueError if `p` is."""
+        ints = self.g1_to_ints(p)
+        if ints is None:
+            raise ValueError("G1 point must not be at infinity")
+        return ints
+    
+    def g2_affine(self, p) -> G2Ints:
+        """g2_to_ints for points that must not be at infinity; raises ValueError if `p` is."""
+        ints = self.g2_to_ints(p)
+        if ints is None:
+            raise ValueError("G2 point must not be at infinity")
+        return ints
+    
+    @abstractmethod
+    def g1_from_ints(self, x: int, y: int):
+        raise NotImplementedError
+    
+    @abstractmethod
+    def g2_from_ints(self, x: Tuple[int, int], y: Tuple[int, int]):
+        raise NotImplementedError
+    
+    @abstractmethod
+    def is_on_curve_g1(self, p) -> bool:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def is_on_curve_g2(self, p) -> bool:
+        raise NotImplementedError
+    
+    def is_in_g2_subgroup(self, p) -> bool:
+        """G2 has a non-trivial cofactor, so on-curve points must also be checked."""
+        return self.is_zero(self.multiply(p, optimized_bn128.curve_order))
+    
+    @abstractmethod
+    def pairing_check(self, pairs: Iterable[Tuple[Any, Any]]) -> bool:
+        """
+        Return True iff the product of e(P_i, Q_i) over (G1, G2) pairs is 1.
+        
+        Miller loops are multiplied together and share a single final
+        exponentiation.
+        """
+        raise NotImplementedError
+
+
+class AffineBackend(CurveBackend):
+    """
+    py_ecc.bn128 affine arithmetic.
+    
+    Every addition pays a field inversion; kept as the reference
+    implementation.
+    """
+    
+    name = "affine"
+    G1 = bn128.G1
+    G2 = bn128.G2
+    Z1 = None
+    Z2 = None
+    
+    def add(self, p, q):
+        return bn128.add(p, q)
+    
+    def double(self, p):
+        return bn128.double(p)
+    
+    def neg(self, p):
+        return bn128.neg(p)
+    
+    def multiply(self, p, scalar: int):
+        return bn128.multiply(p, scalar)
+    
+    def is_zero(self, p) -> bool:
+        return p is None
+    
+    def identity_like(self, p):
+        return None
+    
+    def g1_to_ints(self, p) -> Optional[G1Ints]:
+        if p is None:
+            return None
+        return p[0].n, p[1].n
+    
+    def g2_to_ints(self, p) -> Optional[G2Ints]:
+        if p is None:
+            return None
+        x, y = p
+        return (x.coeffs[0].n, x.coeffs[1].n), (y.coeffs[0].n, y.coeffs[1].n)
+    
+    def g1_from_ints(self, x: int, y: int):
+        return bn128.FQ(x), bn128.FQ(y)
+    
+    def g2_from_ints(self, x: Tuple[int, int], y: Tuple[int, int]):
+        return bn128.FQ2(list(x)), bn128.FQ2(list(y))
+    
+    def is_on_curve_g1(self, p) -> bool:
+        return bn128.is_on_curve(p, bn128.b)
+    
+    def is_on_curve_g2(self, p) -> bool:
+        return bn128.is_on_curve(p, bn128.b2)
+    
+    def pairing_check(self, pairs: Iterable[Tuple[Any, Any]]) -> bool:
+        # py_ecc.bn128 always final-exponentiates inside its Miller loop, so
+        # products are evaluated on the projective implementation instead.
+        projective = _backend_instance(ProjectiveBackend.name)
+        converted = []
+        for p, q in pairs:
+            g1, g2 = self.g1_to_ints(p), self.g2_to_ints(q)
+            converted.append((
+                projective.g1_from_ints(*g1) if g1 is not None else projective.Z1,
+                projective.g2_from_ints(*g2) if g2 is not None else projective.Z2,
+            ))
+        return projective.pairing_check(converted)
+
+
+class ProjectiveBackend(CurveBackend):
+    """
+    py_ecc.optimized_bn128 projective arithmetic.
+    
+    Points carry a Z coordinate so additions need no inversion; a single
+    normalization happens when a point is converted back to integers.
+    """
+    
+    name = "projective"
+    G1 = optimized_bn128.G1
+    G2 = optimized_bn128.G2
+    Z1 = optimized_bn128.Z1
+    Z2 = optimized_bn128.Z2
+    
+    def add(self, p, q):
+        return optimized_bn128.add(p, q)
+    
+    def double(self, p):
+        return optimized_bn128.double(p)
+    
+    def neg(self, p):
+        return optimized_bn128.neg(p)
+    
+    def multiply(self, p, scalar: int):
+        return optimized_bn128.multiply(p, scalar)
+    
+    def is_zero(self, p) -> bool:
+        return optimized_bn128.is_inf(p)
+    
+    def identity_like(self, p):
+        return self.Z2 if isinstance(p[0], optimized_bn128.FQ2) else self.Z1
+    
+    def g1_to_ints(self, p) -> Optional[G1Ints]:
+        if optimized_bn128.is_inf(p):
+            return None
+        x, y = optimized_bn128.normalize(p)
+        return x.n, y.n
+    
+    def g2_to_ints(self, p) -> Optional[G2Ints]:
+        if optimized_bn128.is_inf(p):
+            return None
+        x, y = optimized_bn128.normalize(p)
+        return tuple(x.coeffs), tuple(y.coeffs)
+    
+    def g1_from_ints(self, x: int, y: int):
+        return optimized_bn128.FQ(x), optimized_bn128.FQ(y), optimized_bn128.FQ.one()
+    
+    def g2_from_ints(self, x: Tuple[int, int], y: Tuple[int, int]):
+        return optimized_bn128.FQ2(list(x)), optimized_bn128.FQ2(list(y)), optimized_bn128.FQ2.one()
+    
+    def is_on_curve_g1(self, p) -> bool:
+        return optimized_bn128.is_on_curve(p, optimized_bn128.b)
+    
+    def is_on_curve_g2(self, p) -> bool:
+        return optimized_bn128.is_on_curve(p, optimized_bn128.b2)
+    
+    def pairing_check(self, pairs: Iterable[Tuple[Any, Any]]) -> bool:
+        product = optimized_bn128.FQ12.one()
+        for p, q in pairs:
+            if optimized_bn128.is_inf(p) or optimized_bn128.is_inf(q):
+                continue
+            product = product * optimized_bn128.pairing(q, p, final_exponentiate=False)
+        return optimized_bn128.final_exponentiate(product) == optimized_bn128.FQ12.one()
+
+
+BACKENDS: Dict[str, Type[CurveBackend]] = {
+    AffineBackend.name: AffineBackend,
+    ProjectiveBackend.name: ProjectiveBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def _backend_instance(name: str) -> CurveBackend:
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown curve backend: {name!r} (expected one of {sorted(BACKENDS)})")
+
+
+def get_backend(name: Optional[str] = None) -> CurveBackend:
+    """Return the curve backend named by `name` or ZK_CURVE_BACKEND."""
+    return _backend_instance(name or settings.ZK_CURVE_BACKEND)
@@ -0,0 +1,297 @@
+"""
+Fixed-base windowed scalar multiplication for BN254.
+
+Generator tables can be published as read-only files under
+ZK_PRECOMPUTE_DIR: the first process to start builds them under a file
+lock, and every API worker and prover pool worker maps the same file
+instead of holding its own copy of the table in its heap. The directory
+must belong to the service user and be closed to everyone else, and each
+mapped table is checked against the generator before it is used.
+"""
+
+import fcntl
+import mmap
+import os
+import stat
+import struct
+import tempfile
+from functools import lru_cache
+from typing import Any, Callable, List, Optional
+
+import structlog
+from py_ecc.bn128 import curve_order
+
+from app.core.config import settings
+from app.zk.curve import CurveBackend, get_backend
+
+logger = structlog.get_logger(__name__)
+
+SCALAR_BITS = curve_order.bit_length()
+
+# Published table file: magic, version, group (1 or 2), window bits,
+# window count, then every entry as big-endian affine coordinates
+TABLE_MAGIC = b"afbt"
+TABLE_VERSION = 1
+_TABLE_HEADER = struct.Struct(">4sIIII")
+_FIELD_BYTES = 32
+
+
+class FixedBaseTable:
+    """
+    Precomputed multiples of a fixed base point.
+    
+    Row i holds j * 2^(w*i) * P for every w-bit digit j, so k * P is the sum
+    of one table entry per non-zero digit of k: no doublings, and roughly
+    SCALAR_BITS / w additions instead of ~1.5 * SCALAR_BITS for double-and-add.
+    Entries are kept in the backend's native representation.
+    """
+    
+    def __init__(
+        self,
+        base,
+        window_bits: int = 5,
+        scalar_bits: int = SCALAR_BITS,
+        backend: Optional[CurveBackend] = None,
+    ):
+        if window_bits < 1:
+            raise ValueError("window_bits must be positive")
+        
+        self.backend = backend or get_backend()
+        self.window_bits = window_bits
+        self.num_windows = -(-scalar_bits // window_bits)
+        self._mask = (1 << window_bits) - 1
+        self._zero = self.backend.identity_like(base)
+        self._rows: List[List[Optional[tuple]]] = []
+        
+        add = self.backend.add
+        row_base = base
+        for _ in range(self.num_windows):
+            row = [self._zero, row_base]
+            for _ in range(2, 1 << window_bits):
+                row.append(add(row[-1], row_base))
+            self._rows.append(row)
+            # 2^w * row_base, the base of the next window
+            row_base = add(row[-1], row_base)
+    
+    def _entry(self, window: int, digit: int):
+        return self._rows[window][digit]
+    
+    def multiply(self, scalar: int):
+        """Return scalar * P in backend form; equal to backend.multiply(P, scalar)."""
+        scalar %= curve_order
+        if scalar >> (self.window_bits * self.num_windows):
+            raise ValueError("Scalar exceeds table range")
+        
+        add = self.backend.add
+        result = self._zero
+        for window in range(self.num_windows):
+            if not scalar:
+                break
+            digit = scalar & self._mask
+            if digit:
+                result = add(result, self._entry(window, digit))
+            scalar >>= self.window_bits
+        return result
+    
+    def to_bytes(self, group: int) -> bytes:
+        """Serialize for MappedFixedBaseTable; `group` is 1 for G1, 2 for G2."""
+        entry_size = 2 * group * _FIELD_BYTES
+        out = bytearray(_TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, group, self.window_bits, self.num_windows))
+        for window in range(self.num_windows):
+            for digit in range(1 << self.window_bits):
+                point = self._entry(window, digit) if digit else None
+                if point is None or self.backend.is_zero(point):
+                    out += bytes(entry_size)
+                elif group == 1:
+                    out += b"".join(c.to_bytes(_FIELD_BYTES, "big") for c in self.backend.g1_affine(point))
+                else:
+                    x, y = self.backend.g2_affine(point)
+                    out += b"".join(c.to_bytes(_FIELD_BYTES, "big") for c in x + y)
+        return bytes(out)
+
+
+class MappedFixedBaseTable(FixedBaseTable):
+    """
+    Fixed-base table read from a published file mapping.
+    
+    Entries are decoded on access, so the table costs each process only the
+    shared page-cache copy of the file. Results equal those of the in-memory
+    table once normalized to affine coordinates.
+    """
+    
+    def __init__(self, path: str, group: int, window_bits: int, backend: Optional[CurveBackend] = None):
+        self.backend = backend or get_backend()
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        try:
+            magic, version, file_group, file_window, num_windows = _TABLE_HEADER.unpack_from(self._buffer)
+            if (magic, version, file_group, file_window) != (TABLE_MAGIC, TABLE_VERSION, group, window_bits):
+                raise ValueError(f"{path} is not a G{group} table with {window_bits}-bit windows")
+            self._entry_size = 2 * group * _FIELD_BYTES
+            if len(self._buffer) != _TABLE_HEADER.size + num_windows * (self._entry_size << window_bits):
+                raise ValueError(f"{path} is truncated")
+        except Exception:
+            self._buffer.close()
+            raise
+        
+        self.path = path
+        self.window_bits = window_bits
+        self.num_windows = num_windows
+        self._mask = (1 << window_bits) - 1
+        base = self.backend.G1 if group == 1 else self.backend.G2
+        self._zero = self.backend.identity_like(base)
+        self._from_ints: Callable[..., Any] = self.backend.g1_from_ints
+        if group != 1:
+            self._from_ints = self._g2_from_ints
+        
+        try:
+            self._check_windows(base, group)
+        except Exception:
+            self._buffer.close()
+            raise
+    
+    def _check_windows(self, base, group: int) -> None:
+        """Check that each window's first entry is 2^(w*i) times the generator."""
+        to_ints = self.backend.g1_to_ints if group == 1 else self.backend.g2_to_ints
+        row_base = base
+        for window in range(self.num_windows):
+            if to_ints(self._entry(window, 1)) != to_ints(row_base):
+                raise ValueError(f"{self.path} does not match the G{group} generator (window {window})")
+            for _ in range(self.window_bits):
+                row_base = self.backend.double(row_base)
+    
+    def _g2_from_ints(self, x0: int, x1: int, y0: int, y1: int):
+        return self.backend.g2_from_ints((x0, x1), (y0, y1))
+    
+    def _entry(self, window: int, digit: int):
+        start = _TABLE_HEADER.size + ((window << self.window_bits) + digit) * self._entry_size
+        return self._from_ints(*(
+            int.from_bytes(self._buffer[offset:offset + _FIELD_BYTES], "big")
+            for offset in range(start, start + self._entry_size, _FIELD_BYTES)
+        ))
+    
+    def close(self) -> None:
+        self._buffer.close()
+
+
+def _check_private(path: str, directory: bool) -> None:
+    """Raise ValueError unless `path` is ours, not a symlink and closed to other users."""
+    info = os.lstat(path)
+    kind_ok = stat.S_ISDIR(info.st_mode) if directory else stat.S_ISREG(info.st_mode)
+    if not kind_ok:
+        raise ValueError(f"{path} is not a {'directory' if directory else 'regular file'}")
+    if info.st_uid != os.geteuid():
+        raise ValueError(f"{path} is owned by uid {info.st_uid}, not {os.geteuid()}")
+    if info.st_mode & (0o077 if directory else 0o022):
+        raise ValueError(f"{path} is accessible to other users (mode {stat.S_IMODE(info.st_mode):o})")
+
+
+def _precompute_dir(create: bool = False) -> Optional[str]:
+    """
+    ZK_PRECOMPUTE_DIR, expanded, if it is a private directory of this user.
+    
+    With `create`, a missing directory is made with mode 0700. Anything
+    else (another owner, group or world access, a symlink) disables the
+    shared tables rather than trusting files another user could plant.
+    """
+    if not settings.ZK_PRECOMPUTE_DIR:
+        return None
+    directory = os.path.expanduser(settings.ZK_PRECOMPUTE_DIR)
+    try:
+        if create:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        elif not os.path.lexists(directory):
+            return None
+        _check_private(directory, directory=True)
+    except (OSError, ValueError) as e:
+        logger.warning("Precompute directory not used", path=directory, error=str(e))
+        return None
+    return directory
+
+
+def _table_path(directory: str, group: int, window_bits: int) -> str:
+    return os.path.join(directory, f"g{group}_w{window_bits}.table")
+
+
+def _shared_table(group: int, backend: CurveBackend) -> Optional[FixedBaseTable]:
+    directory = _precompute_dir()
+    if directory is None:
+        return None
+    path = _table_path(directory, group, settings.ZK_FIXED_BASE_WINDOW)
+    if not os.path.lexists(path):
+        return None
+    try:
+        _check_private(path, directory=False)
+        return MappedFixedBaseTable(path, group, settings.ZK_FIXED_BASE_WINDOW, backend=backend)
+    except ValueError as e:
+        logger.warning("Shared fixed-base table ignored", path=path, error=str(e))
+        return None
+
+
+@lru_cache(maxsize=None)
+def g1_table() -> FixedBaseTable:
+    """Fixed-base table for the G1 generator: the published file, or built on first use."""
+    backend = get_backend()
+    table = _shared_table(1, backend)
+    if table is None:
+        table = FixedBaseTable(backend.G1, settings.ZK_FIXED_BASE_WINDOW, backend=backend)
+        logger.info("G1 fixed-base table built", window_bits=table.window_bits, backend=backend.name)
+    return table
+
+
+@lru_cache(maxsize=None)
+def g2_table() -> FixedBaseTable:
+    """Fixed-base table for the G2 generator: the published file, or built on first use."""
+    backend = get_backend()
+    table = _shared_table(2, backend)
+    if table is None:
+        table = FixedBaseTable(backend.G2, settings.ZK_FIXED_BASE_WINDOW, backend=backend)
+        logger.info("G2 fixed-base table built", window_bits=table.window_bits, backend=backend.name)
+    return table
+
+
+def publish_tables() -> List[str]:
+    """
+    Build the generator tables once and publish them under ZK_PRECOMPUTE_DIR.
+    
+    Safe to call from every worker at startup: the first caller builds the
+    files while holding an exclusive lock, the rest wait and find them in
+    place. Files are written to a temporary name and renamed, so a reader
+    never maps a partial table. Returns the published paths.
+    """
+    directory = _precompute_dir(create=True)
+    if directory is None:
+        return []
+    backend = get_backend()
+    window_bits = settings.ZK_FIXED_BASE_WINDOW
+    paths = []
+    
+    with open(os.path.join(directory, ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            for group, base in ((1, backend.G1), (2, backend.G2)):
+                path = _table_path(directory, group, window_bits)
+                paths.append(path)
+                if os.path.exists(path):
+                    continue
+                
+                table = FixedBaseTable(base, window_bits, backend=backend)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(table.to_bytes(group))
+                os.replace(tmp_path, path)
+                logger.info("Fixed-base table published", path=path, window_bits=window_bits)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+    
+    # Drop any table this process built privately so it maps the shared copy
+    g1_table.cache_clear()
+    g2_table.cache_clear()
+    return paths
+
+
+def warm_tables() -> None:
+    """Build both generator tables ahead of the first proof."""
+    g1_table()
+    g2_table()
@@ -0,0 +1,376 @@
+"""
+Memory-mapped Groth16 key store.
+
+Proving keys are snarkjs `.zkey` files. They are mapped read-only, so every
+process that opens the same file (uvicorn workers, prover pool workers)
+shares one copy in the page cache. Only the section table is read on open:
+the Groth16 header and IC are decoded on first use, and the large point
+sections (A, B1, B2, C, H) are decoded one point at a time on access rather
+than materialized in each worker's heap.
+"""
+
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import structlog
+from py_ecc.bn128 import curve_order, field_modulus
+
+from app.core.config import settings
+from app.zk.curve import G1Ints, G2Ints
+from app.zk.r1cs import R1CS, load_r1cs
+from app.zk.setup import SetupUnavailable, VerificationKey, load_verification_key
+
+logger = structlog.get_logger(__name__)
+
+ZKEY_MAGIC = b"zkey"
+GROTH16_PROTOCOL = 1
+
+# zkey section ids
+SECTION_HEADER = 1
+SECTION_GROTH16_HEADER = 2
+SECTION_IC = 3
+SECTION_COEFFS = 4
+SECTION_A = 5
+SECTION_B1 = 6
+SECTION_B2 = 7
+SECTION_C = 8
+SECTION_H = 9
+
+# Points are stored in Montgomery form (x * 2^256 mod q), little endian
+_R_INV = pow(1 << 256, -1, field_modulus)
+
+
+def _from_montgomery(data: bytes) -> int:
+    return int.from_bytes(data, "little") * _R_INV % field_modulus
+
+
+def _decode_g1(data: bytes) -> Optional[G1Ints]:
+    if not any(data):
+        return None
+    return _from_montgomery(data[:32]), _from_montgomery(data[32:64])
+
+
+def _decode_g2(data: bytes) -> Optional[G2Ints]:
+    if not any(data):
+        return None
+    return (
+        (_from_montgomery(data[:32]), _from_montgomery(data[32:64])),
+        (_from_montgomery(data[64:96]), _from_montgomery(data[96:128])),
+    )
+
+
+class PointSection:
+    """
+    Read-only sequence of curve points backed by the key file mapping.
+    
+    Points are decoded on access and not retained, so iterating a section
+    costs no resident memory beyond the shared mapped pages.
+    """
+    
+    def __init__(self, buffer: mmap.mmap, offset: int, size: int, point_size: int):
+        if size % point_size:
+            raise ValueError("Point section size is not a multiple of the point size")
+        self._buffer = buffer
+        self._offset = offset
+        self._point_size = point_size
+        self._count = size // point_size
+        self._decode = _decode_g1 if point_size == 64 else _decode_g2
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("point index out of range")
+        start = self._offset + index * self._point_size
+        return self._decode(self._buffer[start:start + self._point_size])
+    
+    def __iter__(self) -> Iterator:
+        for index in range(self._count):
+            yield self[index]
+
+
+class Groth16Header:
+    """Decoded zkey Groth16 header section."""
+    
+    def __init__(
+        self,
+        n_vars: int,
+        n_public: int,
+        domain_size: int,
+        alpha_1: G1Ints,
+        beta_1: G1Ints,
+        beta_2: G2Ints,
+        gamma_2: G2Ints,
+        delta_1: G1Ints,
+        delta_2: G2Ints,
+    ):
+        self.n_vars = n_vars
+        self.n_public = n_public
+        self.domain_size = domain_size
+        self.alpha_1 = alpha_1
+        self.beta_1 = beta_1
+        self.beta_2 = beta_2
+        self.gamma_2 = gamma_2
+        self.delta_1 = delta_1
+        self.delta_2 = delta_2
+
+
+class ProvingKey:
+    """Lazily decoded view of a snarkjs Groth16 `.zkey` file."""
+    
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._sections = self._read_section_table()
+            protocol, = struct.unpack_from("<I", self._buffer, self._section(SECTION_HEADER)[0])
+            if protocol != GROTH16_PROTOCOL:
+                raise ValueError(f"Unsupported zkey protocol: {protocol}")
+        except Exception:
+            self._buffer.close()
+            raise
+    
+    def _read_section_table(self) -> Dict[int, Tuple[int, int]]:
+        buf = self._buffer
+        if buf[:4] != ZKEY_MAGIC:
+            raise ValueError(f"{self.path} is not a zkey file")
+        _version, n_sections = struct.unpack_from("<II", buf, 4)
+        
+        sections = {}
+        pos = 12
+        for _ in range(n_sections):
+            section_id, size = struct.unpack_from("<IQ", buf, pos)
+            pos += 12
+            if pos + size > len(buf):
+                raise ValueError(f"zkey section {section_id} is truncated")
+            sections[section_id] = (pos, size)
+            pos += size
+        return sections
+    
+    def _section(self, section_id: int) -> Tuple[int, int]:
+        try:
+            return self._sections[section_id]
+        except KeyError:
+            raise ValueError(f"zkey section {section_id} missing from {self.path}") from None
+    
+    @cached_property
+    def header(self) -> Groth16Header:
+        buf = self._buffer
+        pos, _ = self._section(SECTION_GROTH16_HEADER)
+        
+        n8q, = struct.unpack_from("<I", buf, pos)
+        q = int.from_bytes(buf[pos + 4:pos + 4 + n8q], "little")
+        pos += 4 + n8q
+        n8r, = struct.unpack_from("<I", buf, pos)
+        r = int.from_bytes(buf[pos + 4:pos + 4 + n8r], "little")
+        pos += 4 + n8r
+        if (q, r) != (field_modulus, curve_order):
+            raise ValueError("zkey is not over BN254")
+        
+        n_vars, n_public, domain_size = struct.unpack_from("<III", buf, pos)
+        pos += 12
+        
+        def g1() -> G1Ints:
+            nonlocal pos
+            pos += 64
+            point = _decode_g1(buf[pos - 64:pos])
+            if point is None:
+                raise ValueError("zkey header point is at infinity")
+            return point
+        
+        def g2() -> G2Ints:
+            nonlocal pos
+            pos += 128
+            point = _decode_g2(buf[pos - 128:pos])
+            if point is None:
+                raise ValueError("zkey header point is at infinity")
+            return point
+        
+        return Groth16Header(
+            n_vars=n_vars,
+            n_public=n_public,
+            domain_size=domain_size,
+            alpha_1=g1(),
+            beta_1=g1(),
+            beta_2=g2(),
+            gamma_2=g2(),
+            delta_1=g1(),
+            delta_2=g2(),
+        )
+    
+    @cached_property
+    def ic(self) -> List[G1Ints]:
+        return list(self._points(SECTION_IC, 64))
+    
+    @property
+    def a_query(self) -> PointSection:
+        return self._points(SECTION_A, 64)
+    
+    @property
+    def b1_query(self) -> PointSection:
+        return self._points(SECTION_B1, 64)
+    
+    @property
+    def b2_query(self) -> PointSection:
+        return self._points(SECTION_B2, 128)
+    
+    @property
+    def c_query(self) -> PointSection:
+        return self._points(SECTION_C, 64)
+    
+    @property
+    def h_query(self) -> PointSection:
+        return self._points(SECTION_H, 64)
+    
+    def _points(self, section_id: int, point_size: int) -> PointSection:
+        offset, size = self._section(section_id)
+        return PointSection(self._buffer, offset, size, point_size)
+    
+    def verification_key(self) -> VerificationKey:
+        """Verification key embedded in the proving key."""
+        header = self.header
+        return VerificationKey(
+            alpha_1=header.alpha_1,
+            beta_2=header.beta_2,
+            gamma_2=header.gamma_2,
+            delta_2=header.delta_2,
+            ic=self.ic,
+            source=self.path,
+        )
+    
+    def close(self) -> None:
+        self._buffer.close()
+
+
+class KeyStore:
+    """
+    Resident circuits, proving and verification keys, per circuit id and version.
+    
+    Paths come from ZK_CIRCUIT_PATH, ZK_PROVING_KEY_PATH and
+    ZK_VERIFICATION_KEY_PATH, which may contain `{circuit_id}` and
+    `{circuit_version}` placeholders so several versions can be deployed side
+    by side during a rollout. Up to `max_resident` proving keys stay
+    resident; beyond that the least recently used one is released, and
+    unmapped when no prover holds it any more. Verification keys are small
+    and kept for the life of the process, as are parsed circuits.
+    """
+    
+    def __init__(self, max_resident: int = settings.ZK_KEY_STORE_MAX_RESIDENT):
+        self.max_resident = max(1, max_resident)
+        self._proving_keys: "OrderedDict[Tuple[str, str], ProvingKey]" = OrderedDict()
+        self._verification_keys: Dict[Tuple[str, str], VerificationKey] = {}
+        self._circuits: Dict[Tuple[str, str], Union[R1CS, SetupUnavailable]] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def resolve_path(template: str, circuit_id: str, circuit_version: str) -> str:
+        return template.format(circuit_id=circuit_id, circuit_version=circuit_version)
+    
+    def proving_key(self, circuit_id: str, circuit_version: str) -> Optional[ProvingKey]:
+        """Mapped proving key for a circuit version, or None if none is deployed."""
+        key = (circuit_id, circuit_version)
+        with self._lock:
+            if key in self._proving_keys:
+                self._proving_keys.move_to_end(key)
+                return self._proving_keys[key]
+            
+            path = self.resolve_path(settings.ZK_PROVING_KEY_PATH, circuit_id, circuit_version)
+            if not os.path.exists(path):
+                return None
+            
+            proving_key = ProvingKey(path)
+            logger.info("Proving key mapped", path=path, circuit_version=circuit_version)
+            
+            self._proving_keys[key] = proving_key
+            while len(self._proving_keys) > self.max_resident:
+                # Only the store's reference is dropped: a prover may still
+                # hold the key, and its mapping closes once the last one goes
+                _, evicted = self._proving_keys.popitem(last=False)
+                logger.info("Proving key evicted", path=evicted.path)
+            return proving_key
+    
+    def verification_key(
+        self,
+        circuit_id: str,
+        circuit_version: str,
+        num_public_inputs: int,
+    ) -> VerificationKey:
+        """
+        Verification key for a circuit version.
+        
+        Prefers a deployed verification_key.json, then the key embedded in the
+        proving key, then the development setup.
+        """
+        key = (circuit_id, circuit_version)
+        vk = self._verification_keys.get(key)
+        if vk is not None:
+            return vk
+        
+        vk_path = self.resolve_path(settings.ZK_VERIFICATION_KEY_PATH, circuit_id, circuit_version)
+        proving_key = None if os.path.exists(vk_path) else self.proving_key(circuit_id, circuit_version)
+        if proving_key is not None:
+            vk = proving_key.verification_key()
+        else:
+            vk = load_verification_key(vk_path, circuit_id, circuit_version, num_public_inputs)
+        
+        if vk.num_public_inputs != num_public_inputs:
+            raise ValueError(
+                f"Verification key for {circuit_id} {circuit_version} has "
+                f"{vk.num_public_inputs} public inputs, expected {num_public_inputs}"
+            )
+        return self._verification_keys.setdefault(key, vk)
+    
+    def circuit(self, circuit_id: str, circuit_version: str) -> Optional[R1CS]:
+        """
+        Constraint system at ZK_CIRCUIT_PATH for a circuit version, or None.
+        
+        Parsing and the witness solver's schedule are worked out on first use,
+        which can take a while for large circuits: call this off the event
+        loop. Circuits whose witness the solver cannot derive raise
+        SetupUnavailable, on every call, rather than being proved or checked
+        without their hint signals.
+        """
+        key = (circuit_id, circuit_version)
+        if key not in self._circuits:
+            path = self.resolve_path(settings.ZK_CIRCUIT_PATH, circuit_id, circuit_version)
+            if not os.path.exists(path):
+                return None
+            r1cs = load_r1cs(path)
+            try:
+                r1cs.solver
+            except ValueError as e:
+                error = SetupUnavailable(f"Circuit {path} needs an external witness generator: {e}")
+                logger.error("Circuit rejected", path=path, error=str(error))
+                self._circuits[key] = error
+            else:
+                logger.info("Circuit loaded", path=path, constraints=r1cs.n_constraints, wires=r1cs.n_wires)
+                self._circuits[key] = r1cs
+        
+        circuit = self._circuits[key]
+        if isinstance(circuit, SetupUnavailable):
+            raise SetupUnavailable(str(circuit))
+        return circuit
+    
+    def resident(self) -> List[Tuple[str, str]]:
+        """Circuit versions whose proving keys are currently mapped."""
+        with self._lock:
+            return list(self._proving_keys)
+    
+    def close(self) -> None:
+        """Release every proving key and forget cached verification keys."""
+        with self._lock:
+            self._proving_keys.clear()
+            self._verification_keys.clear()
+            self._circuits.clear()
+
+
+key_store = KeyStore()
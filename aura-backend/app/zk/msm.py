@@ -0,0 +1,75 @@
+"""
+Pippenger (bucket method) multi-scalar multiplication over G1 and G2.
+"""
+
+from typing import Any, Optional, Sequence
+
+from py_ecc.bn128 import curve_order
+
+from app.zk.curve import CurveBackend, get_backend
+
+
+def optimal_window(num_points: int) -> int:
+    """
+    Bucket window width in bits for `num_points` terms.
+    
+    Each window costs about n + 2^(c+1) additions, so c grows with log2(n);
+    the constants were tuned with benchmarks/bench_msm.py.
+    """
+    if num_points < 4:
+        return 1
+    if num_points < 32:
+        return 3
+    return max(4, num_points.bit_length() - 4)
+
+
+def msm(
+    points: Sequence[Any],
+    scalars: Sequence[int],
+    backend: Optional[CurveBackend] = None,
+    window_bits: Optional[int] = None,
+):
+    """
+    Compute sum(scalars[i] * points[i]) in backend representation.
+    
+    All points must belong to the same group. Zero scalars are skipped and
+    the number of windows follows the widest scalar, so short public inputs
+    cost far less than full 254-bit scalars.
+    """
+    if len(points) != len(scalars):
+        raise ValueError("points and scalars must have the same length")
+    
+    backend = backend or get_backend()
+    terms = [(p, k % curve_order) for p, k in zip(points, scalars)]
+    terms = [(p, k) for p, k in terms if k]
+    if not terms:
+        return backend.identity_like(points[0]) if points else backend.Z1
+    
+    zero = backend.identity_like(terms[0][0])
+    add = backend.add
+    c = window_bits or optimal_window(len(terms))
+    mask = (1 << c) - 1
+    num_windows = -(-max(k.bit_length() for _, k in terms) // c)
+    
+    result = zero
+    for window in reversed(range(num_windows)):
+        for _ in range(c):
+            result = backend.double(result)
+        
+        shift = window * c
+        buckets = [zero] * mask
+        for p, k in terms:
+            digit = (k >> shift) & mask
+            if digit:
+                buckets[digit - 1] = add(buckets[digit - 1], p)
+        
+        # sum_j j * bucket_j via running sums, highest bucket first
+        running = zero
+        window_sum = zero
+        for bucket in reversed(buckets):
+            running = add(running, bucket)
+            window_sum = add(window_sum, running)
+        
+        result = add(result, window_sum)
+    
+    return result
@@ -0,0 +1,131 @@
+"""
+Number-theoretic transform over the BN254 scalar field.
+
+The multiplicative group of F_r has 2-adicity 28, so radix-2 domains of up
+to 2^28 elements exist. Transforms are iterative Cooley-Tukey: each of the
+log2(n) butterfly stages is one vectorized operation over NumPy object
+arrays, and a batch of polynomials (a 2-D array, one per row) goes
+through every stage together.
+"""
+
+from functools import cached_property, lru_cache
+from typing import Sequence, Union
+
+import numpy as np
+from py_ecc.bn128 import curve_order
+
+TWO_ADICITY = 28
+GENERATOR = 5  # multiplicative generator of F_r*; default coset shift
+
+# Primitive 2^28-th root of unity
+ROOT_OF_UNITY = pow(GENERATOR, (curve_order - 1) >> TWO_ADICITY, curve_order)
+
+Values = Union[Sequence[int], np.ndarray]
+
+
+def _as_array(values: Values, size: int) -> np.ndarray:
+    array = np.asarray(values, dtype=object)
+    if array.shape[-1] != size:
+        raise ValueError(f"Expected {size} values along the last axis, got {array.shape[-1]}")
+    return array
+
+
+class Domain:
+    """Radix-2 evaluation domain {omega^k} with cached twiddle factors."""
+    
+    def __init__(self, size: int):
+        if size < 1 or size & (size - 1):
+            raise ValueError("Domain size must be a power of two")
+        self.log_size = size.bit_length() - 1
+        if self.log_size > TWO_ADICITY:
+            raise ValueError(f"Domain size exceeds 2^{TWO_ADICITY}")
+        
+        self.size = size
+        self.omega = pow(ROOT_OF_UNITY, 1 << (TWO_ADICITY - self.log_size), curve_order)
+        self.omega_inv = pow(self.omega, -1, curve_order)
+        self.size_inv = pow(size, -1, curve_order)
+    
+    @cached_property
+    def _bit_reverse(self) -> np.ndarray:
+        indices = np.arange(self.size)
+        reversed_ = np.zeros(self.size, dtype=np.int64)
+        for bit in range(self.log_size):
+            reversed_ |= ((indices >> bit) & 1) << (self.log_size - 1 - bit)
+        return reversed_
+    
+    @staticmethod
+    def _stage_twiddles(root: int, size: int) -> list:
+        # Stage with half-width m uses root^(j * size / 2m) for j < m
+        powers = [1] * max(1, size // 2)
+        for j in range(1, len(powers)):
+            powers[j] = powers[j - 1] * root % curve_order
+        table = np.array(powers, dtype=object)
+        
+        stages = []
+        m = 1
+        while m < size:
+            stages.append(table[::size // (2 * m)][:m])
+            m *= 2
+        return stages
+    
+    @cached_property
+    def _twiddles(self) -> list:
+        return self._stage_twiddles(self.omega, self.size)
+    
+    @cached_property
+    def _inverse_twiddles(self) -> list:
+        return self._stage_twiddles(self.omega_inv, self.size)
+    
+    def _transform(self, values: np.ndarray, twiddles: list) -> np.ndarray:
+        batch_shape = values.shape[:-1]
+        a = values.reshape(-1, self.size)[:, self._bit_reverse] % curve_order
+        
+        m = 1
+        for stage in twiddles:
+            blocks = a.reshape(a.shape[0], self.size // (2 * m), 2, m)
+            even = blocks[:, :, 0, :]
+            odd = blocks[:, :, 1, :] * stage % curve_order
+            a = np.stack([even + odd, even - odd], axis=2) % curve_order
+            m *= 2
+        
+        return a.reshape(*batch_shape, self.size)
+    
+    def ntt(self, coefficients: Values) -> np.ndarray:
+        """Evaluations at omega^0 .. omega^(n-1) of polynomial coefficients (last axis)."""
+        return self._transform(_as_array(coefficients, self.size), self._twiddles)
+    
+    def intt(self, evaluations: Values) -> np.ndarray:
+        """Coefficients of the polynomial with the given domain evaluations."""
+        return self._transform(_as_array(evaluations, self.size), self._inverse_twiddles) * self.size_inv % curve_order
+    
+    def coset_ntt(self, coefficients: Values, shift: int = GENERATOR) -> np.ndarray:
+        """Evaluations at shift * omega^k."""
+        return self.ntt(_as_array(coefficients, self.size) * _shift_powers(self.size, shift) % curve_order)
+    
+    def coset_intt(self, evaluations: Values, shift: int = GENERATOR) -> np.ndarray:
+        """Coefficients of the polynomial with the given evaluations at shift * omega^k."""
+        inverse = _shift_powers(self.size, pow(shift, -1, curve_order))
+        return self.intt(evaluations) * inverse % curve_order
+    
+    def vanishing_on_coset(self, shift: int = GENERATOR) -> int:
+        """Z(x) = x^n - 1 at any point of the coset shift * H, where it is constant."""
+        return (pow(shift, self.size, curve_order) - 1) % curve_order
+
+
+@lru_cache(maxsize=32)
+def _shift_powers(size: int, shift: int) -> np.ndarray:
+    powers = [1] * size
+    for i in range(1, size):
+        powers[i] = powers[i - 1] * shift % curve_order
+    return np.array(powers, dtype=object)
+
+
+@lru_cache(maxsize=None)
+def get_domain(size: int) -> Domain:
+    """Domain of exactly `size` elements, shared per process."""
+    return Domain(size)
+
+
+def domain_for(min_size: int) -> Domain:
+    """Smallest radix-2 domain with at least `min_size` elements."""
+    return get_domain(1 << max(0, min_size - 1).bit_length())
@@ -0,0 +1,132 @@
+"""
+Groth16 proving against an R1CS circuit and a snarkjs proving key.
+"""
+
+import secrets
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+import numpy as np
+from py_ecc.bn128 import curve_order
+
+from app.zk.curve import CurveBackend, G1Ints, G2Ints, get_backend
+from app.zk.keystore import PointSection, ProvingKey
+from app.zk.msm import msm
+from app.zk.ntt import Domain, get_domain
+from app.zk.r1cs import R1CS
+from app.zk.trace import Trace
+
+
+class Groth16Prover:
+    """
+    Groth16 prover for one circuit version.
+    
+    Follows the snarkjs layout: the evaluation domain holds one row per
+    constraint plus one row `A = w_i` per public wire (including the
+    constant), and H is evaluated on the odd coset of the 2n-th roots of
+    unity, where Z(x) = -2 and the division is folded into the key's H
+    points.
+    """
+    
+    def __init__(self, circuit: R1CS, proving_key: ProvingKey, backend: Optional[CurveBackend] = None):
+        header = proving_key.header
+        if header.n_vars != circuit.n_wires or header.n_public != circuit.n_public:
+            raise ValueError("Proving key does not match the circuit")
+        if header.domain_size < circuit.n_constraints + circuit.n_public + 1:
+            raise ValueError("Proving key domain is too small for the circuit")
+        
+        self.circuit = circuit
+        self.proving_key = proving_key
+        self.backend = backend or get_backend()
+        self.domain: Domain = get_domain(header.domain_size)
+        # Primitive 2n-th root of unity: shift onto the odd coset
+        self.odd_shift = get_domain(2 * header.domain_size).omega
+    
+    def constraint_evaluations(self, witness: Sequence[int]) -> np.ndarray:
+        """A·w, B·w and C·w over the domain, as a (3, n) object array."""
+        c = self.circuit
+        witnesses = np.asarray([witness], dtype=object)
+        
+        evaluations = np.zeros((3, self.domain.size), dtype=object)
+        evaluations[0, :c.n_constraints] = c.A.dot(witnesses)[0]
+        evaluations[1, :c.n_constraints] = c.B.dot(witnesses)[0]
+        evaluations[2, :c.n_constraints] = c.C.dot(witnesses)[0]
+        evaluations[0, c.n_constraints:c.n_constraints + c.n_public + 1] = witnesses[0, :c.n_public + 1]
+        return evaluations
+    
+    def quotient_evaluations(self, evaluations: np.ndarray) -> np.ndarray:
+        """
+        A(x)B(x) - C(x) on the odd coset, from domain evaluations of A, B, C.
+        
+        One batched inverse NTT recovers the three polynomials and one batched
+        coset NTT evaluates them, O(n log n) in total.
+        """
+        coefficients = self.domain.intt(evaluations)
+        a, b, c = self.domain.coset_ntt(coefficients, self.odd_shift)
+        return (a * b - c) % curve_order
+    
+    def prove(
+        self,
+        witness: Sequence[int],
+        r: Optional[int] = None,
+        s: Optional[int] = None,
+        trace: Optional[Trace] = None,
+    ) -> Tuple[G1Ints, G2Ints, G1Ints]:
+        """
+        Proof (A, B, C) as affine integers for a full witness.
+        
+        `r` and `s` are the blinding scalars; they are drawn at random unless
+        given (fixed values are only useful for tests). Time spent in the
+        quotient, G1 and G2 work is added to `trace` if one is passed.
+        """
+        witness = [int(x) % curve_order for x in witness]
+        if len(witness) != self.circuit.n_wires:
+            raise ValueError(f"Expected {self.circuit.n_wires} witness values, got {len(witness)}")
+        r = secrets.randbelow(curve_order) if r is None else r
+        s = secrets.randbelow(curve_order) if s is None else s
+        
+        b = self.backend
+        pk = self.proving_key
+        header = pk.header
+        trace = trace or Trace()
+        with trace.phase("quotient"):
+            h = self.quotient_evaluations(self.constraint_evaluations(witness)).tolist()
+        
+        alpha_1 = b.g1_from_ints(*header.alpha_1)
+        beta_1 = b.g1_from_ints(*header.beta_1)
+        beta_2 = b.g2_from_ints(*header.beta_2)
+        delta_1 = b.g1_from_ints(*header.delta_1)
+        delta_2 = b.g2_from_ints(*header.delta_2)
+        
+        with trace.phase("g2"):
+            pi_b = b.add(b.add(beta_2, self._msm(pk.b2_query, witness, g2=True)), b.multiply(delta_2, s))
+            pi_b = b.g2_affine(pi_b)
+        
+        with trace.phase("g1"):
+            pi_a = b.add(b.add(alpha_1, self._msm(pk.a_query, witness)), b.multiply(delta_1, r))
+            b1 = b.add(b.add(beta_1, self._msm(pk.b1_query, witness)), b.multiply(delta_1, s))
+            
+            pi_c = b.add(
+                self._msm(pk.c_query, witness[header.n_public + 1:]),
+                self._msm(pk.h_query, h),
+            )
+            pi_c = b.add(pi_c, b.multiply(pi_a, s))
+            pi_c = b.add(pi_c, b.multiply(b1, r))
+            pi_c = b.add(pi_c, b.neg(b.multiply(delta_1, r * s % curve_order)))
+            
+            return b.g1_affine(pi_a), pi_b, b.g1_affine(pi_c)
+    
+    def _msm(self, section: PointSection, scalars: Sequence[int], g2: bool = False) -> Any:
+        b = self.backend
+        from_ints: Callable[..., Any] = b.g1_from_ints
+        if g2:
+            from_ints = b.g2_from_ints
+        points, terms = [], []
+        for i, scalar in enumerate(scalars):
+            if scalar:
+                point = section[i]
+                if point is not None:
+                    points.append(from_ints(*point))
+                    terms.append(scalar)
+        if not points:
+            return b.Z2 if g2 else b.Z1
+        return msm(points, terms, b)
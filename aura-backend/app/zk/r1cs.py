@@ -0,0 +1,295 @@
+"""
+R1CS circuits in the iden3 `.r1cs` binary format and a batched witness solver.
+
+Constraint matrices are held in CSR form with coefficients as NumPy object
+arrays of Python ints, so A·w, B·w and C·w for a whole batch of witnesses
+(one row per witness) are a gather, an elementwise product and a
+`reduceat` per matrix, reduced mod r once at the end.
+"""
+
+import struct
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from py_ecc.bn128 import curve_order
+
+R1CS_MAGIC = b"r1cs"
+
+# .r1cs section ids
+SECTION_HEADER = 1
+SECTION_CONSTRAINTS = 2
+SECTION_WIRE_TO_LABEL = 3
+
+# One linear combination: {wire: coefficient}
+LinearCombination = Dict[int, int]
+
+
+def _signed(coeff: int) -> int:
+    # -1 and other small negatives stay small, which keeps products short
+    coeff %= curve_order
+    return coeff - curve_order if coeff > curve_order // 2 else coeff
+
+
+class SparseMatrix:
+    """Constraint matrix in CSR form over the BN254 scalar field."""
+    
+    def __init__(self, rows: Sequence[LinearCombination], n_wires: int):
+        self.n_rows = len(rows)
+        self.n_wires = n_wires
+        
+        indptr = [0]
+        indices: List[int] = []
+        data: List[int] = []
+        for row in rows:
+            for wire, coeff in sorted(row.items()):
+                if coeff % curve_order:
+                    indices.append(wire)
+                    data.append(_signed(coeff))
+            indptr.append(len(indices))
+        
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.indices = np.array(indices, dtype=np.int64)
+        self.data = np.array(data, dtype=object)
+        self._nonempty = np.flatnonzero(np.diff(self.indptr))
+    
+    @property
+    def nnz(self) -> int:
+        return len(self.indices)
+    
+    def row(self, i: int) -> LinearCombination:
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return dict(zip(self.indices[start:end].tolist(), self.data[start:end].tolist()))
+    
+    def dot(self, witnesses: np.ndarray) -> np.ndarray:
+        """M·w for every witness row of a (batch, n_wires) object array, mod r."""
+        out = np.zeros((witnesses.shape[0], self.n_rows), dtype=object)
+        if self.nnz:
+            products = witnesses[:, self.indices] * self.data
+            out[:, self._nonempty] = np.add.reduceat(
+                products, self.indptr[self._nonempty], axis=1
+            )
+        return out % curve_order
+    
+    def row_dot(self, witnesses: np.ndarray, i: int, skip: Optional[int] = None) -> np.ndarray:
+        """Row `i` of M·w for every witness, optionally leaving out one wire."""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        total = np.zeros(witnesses.shape[0], dtype=object)
+        for wire, coeff in zip(self.indices[start:end].tolist(), self.data[start:end].tolist()):
+            if wire != skip:
+                total = total + witnesses[:, wire] * coeff
+        return total % curve_order
+
+
+class R1CS:
+    """
+    Rank-1 constraint system: A·w * B·w = C·w for every constraint.
+    
+    Wires follow the circom layout: wire 0 is the constant 1, then public
+    outputs, public inputs, private inputs and internal signals.
+    """
+    
+    def __init__(
+        self,
+        n_wires: int,
+        n_pub_out: int,
+        n_pub_in: int,
+        n_prv_in: int,
+        constraints: Sequence[Tuple[LinearCombination, LinearCombination, LinearCombination]],
+    ):
+        self.n_wires = n_wires
+        self.n_pub_out = n_pub_out
+        self.n_pub_in = n_pub_in
+        self.n_prv_in = n_prv_in
+        self.n_constraints = len(constraints)
+        
+        self.A = SparseMatrix([a for a, _, _ in constraints], n_wires)
+        self.B = SparseMatrix([b for _, b, _ in constraints], n_wires)
+        self.C = SparseMatrix([c for _, _, c in constraints], n_wires)
+        self._solver: Union[List[Tuple[str, int, int]], ValueError, None] = None
+    
+    @property
+    def n_public(self) -> int:
+        return self.n_pub_out + self.n_pub_in
+    
+    @property
+    def input_wires(self) -> range:
+        """Wires supplied by the caller: public then private inputs."""
+        start = 1 + self.n_pub_out
+        return range(start, start + self.n_pub_in + self.n_prv_in)
+    
+    def check_batch(self, witnesses: np.ndarray) -> np.ndarray:
+        """Boolean per witness row: whether every constraint is satisfied."""
+        witnesses = np.asarray(witnesses, dtype=object)
+        if witnesses.ndim != 2 or witnesses.shape[1] != self.n_wires:
+            raise ValueError(f"Expected witnesses of shape (batch, {self.n_wires})")
+        
+        residual = (self.A.dot(witnesses) * self.B.dot(witnesses) - self.C.dot(witnesses)) % curve_order
+        return ~residual.astype(bool).any(axis=1)
+    
+    @property
+    def solver(self) -> List[Tuple[str, int, int]]:
+        """
+        Order in which constraints determine the non-input wires.
+        
+        Each step is (side, constraint, wire): the constraint has exactly one
+        unknown wire, which appears either only in C, or in A or B while the
+        other factor is a constant. Circuits whose signals come from hints
+        (bit decompositions, inverses) need an external witness generator
+        and raise ValueError here. The schedule, or the failure, is worked
+        out once per circuit.
+        """
+        solver = self._solver
+        if solver is None:
+            try:
+                solver = self._propagation_schedule()
+            except ValueError as e:
+                solver = e
+            self._solver = solver
+        if isinstance(solver, ValueError):
+            raise ValueError(str(solver))
+        return solver
+    
+    def _propagation_schedule(self) -> List[Tuple[str, int, int]]:
+        known = {0, *self.input_wires}
+        pending = set(range(self.n_constraints))
+        rows = [(self.A.row(i), self.B.row(i), self.C.row(i)) for i in range(self.n_constraints)]
+        schedule = []
+        
+        progress = True
+        while progress and len(known) < self.n_wires:
+            progress = False
+            for i in sorted(pending):
+                a, b, c = rows[i]
+                unknown = (set(a) | set(b) | set(c)) - known
+                if len(unknown) != 1:
+                    continue
+                wire = unknown.pop()
+                if wire in c and wire not in a and wire not in b:
+                    schedule.append(("C", i, wire))
+                elif wire in a and wire not in c and set(b) == {0}:
+                    schedule.append(("A", i, wire))
+                elif wire in b and wire not in c and set(a) == {0}:
+                    schedule.append(("B", i, wire))
+                else:
+                    continue
+                known.add(wire)
+                pending.discard(i)
+                progress = True
+        
+        if len(known) < self.n_wires:
+            raise ValueError(
+                f"{self.n_wires - len(known)} wires cannot be solved by propagation"
+            )
+        return schedule
+    
+    def solve_batch(self, inputs: np.ndarray) -> np.ndarray:
+        """
+        Full witnesses for a (batch, n_inputs) array of public then private inputs.
+        
+        The result should still be passed to `check_batch`: the solver only
+        uses the constraints it needs to determine each wire.
+        """
+        inputs = np.asarray(inputs, dtype=object)
+        if inputs.ndim != 2 or inputs.shape[1] != len(self.input_wires):
+            raise ValueError(f"Expected inputs of shape (batch, {len(self.input_wires)})")
+        
+        witnesses = np.zeros((inputs.shape[0], self.n_wires), dtype=object)
+        witnesses[:, 0] = 1
+        witnesses[:, self.input_wires.start:self.input_wires.stop] = inputs % curve_order
+        
+        for side, i, wire in self.solver:
+            if side == "C":
+                coeff = self.C.row(i)[wire]
+                rest = self.A.row_dot(witnesses, i) * self.B.row_dot(witnesses, i) - self.C.row_dot(witnesses, i, skip=wire)
+            else:
+                # factor * (coeff * w + rest) = C·w with a constant factor
+                lc, other = (self.A, self.B) if side == "A" else (self.B, self.A)
+                factor = other.row(i)[0]
+                coeff = lc.row(i)[wire]
+                rest = self.C.row_dot(witnesses, i) * pow(factor, -1, curve_order) - lc.row_dot(witnesses, i, skip=wire)
+            witnesses[:, wire] = rest * pow(coeff, -1, curve_order) % curve_order
+        
+        return witnesses
+
+
+def parse_r1cs(data: bytes) -> R1CS:
+    """Parse an iden3 `.r1cs` file."""
+    if data[:4] != R1CS_MAGIC:
+        raise ValueError("Not an r1cs file")
+    _version, n_sections = struct.unpack_from("<II", data, 4)
+    
+    sections = {}
+    pos = 12
+    for _ in range(n_sections):
+        section_id, size = struct.unpack_from("<IQ", data, pos)
+        pos += 12
+        sections[section_id] = (pos, size)
+        pos += size
+    
+    if SECTION_HEADER not in sections or SECTION_CONSTRAINTS not in sections:
+        raise ValueError("r1cs file is missing its header or constraints")
+    
+    pos, _ = sections[SECTION_HEADER]
+    n8, = struct.unpack_from("<I", data, pos)
+    prime = int.from_bytes(data[pos + 4:pos + 4 + n8], "little")
+    if prime != curve_order:
+        raise ValueError("r1cs prime is not the BN254 scalar field")
+    pos += 4 + n8
+    n_wires, n_pub_out, n_pub_in, n_prv_in = struct.unpack_from("<IIII", data, pos)
+    _n_labels, n_constraints = struct.unpack_from("<QI", data, pos + 16)
+    
+    pos, _ = sections[SECTION_CONSTRAINTS]
+    
+    def linear_combination() -> LinearCombination:
+        nonlocal pos
+        n_terms, = struct.unpack_from("<I", data, pos)
+        pos += 4
+        terms = {}
+        for _ in range(n_terms):
+            wire, = struct.unpack_from("<I", data, pos)
+            terms[wire] = int.from_bytes(data[pos + 4:pos + 4 + n8], "little")
+            pos += 4 + n8
+        return terms
+    
+    constraints = [
+        (linear_combination(), linear_combination(), linear_combination())
+        for _ in range(n_constraints)
+    ]
+    return R1CS(n_wires, n_pub_out, n_pub_in, n_prv_in, constraints)
+
+
+def dump_r1cs(r1cs: R1CS) -> bytes:
+    """Serialize to the iden3 `.r1cs` format (one label per wire)."""
+    n8 = 32
+    header = (
+        struct.pack("<I", n8) + curve_order.to_bytes(n8, "little")
+        + struct.pack("<IIIIQI", r1cs.n_wires, r1cs.n_pub_out, r1cs.n_pub_in,
+                      r1cs.n_prv_in, r1cs.n_wires, r1cs.n_constraints)
+    )
+    
+    def linear_combination(row: LinearCombination) -> bytes:
+        out = struct.pack("<I", len(row))
+        for wire, coeff in row.items():
+            out += struct.pack("<I", wire) + (coeff % curve_order).to_bytes(n8, "little")
+        return out
+    
+    constraints = b"".join(
+        linear_combination(m.row(i))
+        for i in range(r1cs.n_constraints)
+        for m in (r1cs.A, r1cs.B, r1cs.C)
+    )
+    labels = b"".join(struct.pack("<Q", i) for i in range(r1cs.n_wires))
+    
+    out = R1CS_MAGIC + struct.pack("<II", 1, 3)
+    for section_id, body in (
+        (SECTION_HEADER, header),
+        (SECTION_CONSTRAINTS, constraints),
+        (SECTION_WIRE_TO_LABEL, labels),
+    ):
+        out += struct.pack("<IQ", section_id, len(body)) + body
+    return out
+
+
+def load_r1cs(path: str) -> R1CS:
+    with open(path, "rb") as f:
+        return parse_r1cs(f.read())
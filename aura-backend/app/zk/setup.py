@@ -0,0 +1,231 @@
+"""
+Groth16 verification keys and the development trusted setup.
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence
+
+import structlog
+from py_ecc.bn128 import curve_order
+
+from app.core.config import settings
+from app.zk.curve import CurveBackend, G1Ints, G2Ints, get_backend
+
+logger = structlog.get_logger(__name__)
+
+
+class SetupUnavailable(Exception):
+    """Raised when no key is deployed and the development setup is not enabled."""
+
+
+def development_setup_enabled() -> bool:
+    """Whether ZK_DEVELOPMENT_SETUP is set, in a development environment."""
+    return settings.ZK_DEVELOPMENT_SETUP and settings.ENVIRONMENT == "development"
+
+
+class VerificationKey:
+    """
+    Groth16 verification key with points held as affine integers.
+    
+    Backend-agnostic so the same key can be used by any curve backend.
+    """
+    
+    def __init__(
+        self,
+        alpha_1: G1Ints,
+        beta_2: G2Ints,
+        gamma_2: G2Ints,
+        delta_2: G2Ints,
+        ic: List[G1Ints],
+        source: str = "file",
+    ):
+        self.alpha_1 = alpha_1
+        self.beta_2 = beta_2
+        self.gamma_2 = gamma_2
+        self.delta_2 = delta_2
+        self.ic = ic
+        self.source = source
+    
+    @property
+    def num_public_inputs(self) -> int:
+        return len(self.ic) - 1
+    
+    @classmethod
+    def from_snarkjs(cls, data: Dict[str, Any], source: str = "file") -> "VerificationKey":
+        """Parse a snarkjs `verification_key.json` document."""
+        if data.get("protocol", "groth16") != "groth16":
+            raise ValueError(f"Unsupported proving scheme: {data.get('protocol')}")
+        
+        def g1(point: Sequence[str]) -> G1Ints:
+            return int(point[0]), int(point[1])
+        
+        def g2(point: Sequence[Sequence[str]]) -> G2Ints:
+            return (int(point[0][0]), int(point[0][1])), (int(point[1][0]), int(point[1][1]))
+        
+        return cls(
+            alpha_1=g1(data["vk_alpha_1"]),
+            beta_2=g2(data["vk_beta_2"]),
+            gamma_2=g2(data["vk_gamma_2"]),
+            delta_2=g2(data["vk_delta_2"]),
+            ic=[g1(point) for point in data["IC"]],
+            source=source,
+        )
+    
+    def to_snarkjs(self) -> Dict[str, Any]:
+        """Serialize in snarkjs `verification_key.json` layout."""
+        
+        def g1(point: G1Ints) -> List[str]:
+            return [str(point[0]), str(point[1]), "1"]
+        
+        def g2(point: G2Ints) -> List[List[str]]:
+            return [
+                [str(point[0][0]), str(point[0][1])],
+                [str(point[1][0]), str(point[1][1])],
+                ["1", "0"],
+            ]
+        
+        return {
+            "protocol": "groth16",
+            "curve": "bn128",
+            "nPublic": self.num_public_inputs,
+            "vk_alpha_1": g1(self.alpha_1),
+            "vk_beta_2": g2(self.beta_2),
+            "vk_gamma_2": g2(self.gamma_2),
+            "vk_delta_2": g2(self.delta_2),
+            "IC": [g1(point) for point in self.ic],
+        }
+
+
+class DevelopmentSetup:
+    """
+    Deterministic Groth16 setup whose trapdoor is known to the backend.
+    
+    Knowing alpha, beta, gamma, delta and the IC scalars lets the prover
+    produce proofs that satisfy the real pairing equation for any public
+    inputs (the Groth16 simulator). That provides no soundness, so it is
+    only served through development_setup() while ZK_DEVELOPMENT_SETUP is
+    enabled in development, until a ceremony proving key is configured.
+    """
+    
+    def __init__(self, seed: bytes, num_public_inputs: int):
+        self.num_public_inputs = num_public_inputs
+        self.alpha = self._derive(seed, b"alpha")
+        self.beta = self._derive(seed, b"beta")
+        self.gamma = self._derive(seed, b"gamma")
+        self.delta = self._derive(seed, b"delta")
+        self.ic = [self._derive(seed, b"ic%d" % i) for i in range(num_public_inputs + 1)]
+        self._c_query_points: Dict[str, list] = {}
+    
+    @staticmethod
+    def _derive(seed: bytes, label: bytes) -> int:
+        scalar = int.from_bytes(hashlib.sha256(seed + b":" + label).digest(), "big") % curve_order
+        return scalar or 1
+    
+    def simulate_c(self, scalar_a: int, scalar_b: int, public_inputs: Sequence[int]) -> int:
+        """
+        Scalar c such that (a*G1, b*G2, c*G1) verifies for `public_inputs`.
+        
+        Solves a*b = alpha*beta + gamma*(ic_0 + sum x_i*ic_i) + delta*c.
+        """
+        if len(public_inputs) != self.num_public_inputs:
+            raise ValueError(
+                f"Expected {self.num_public_inputs} public inputs, got {len(public_inputs)}"
+            )
+        
+        c = self.c_base_scalar(scalar_a, scalar_b)
+        for x, q in zip(public_inputs, self.c_query_scalars()):
+            c += int(x) * q
+        return c % curve_order
+    
+    def c_base_scalar(self, scalar_a: int, scalar_b: int) -> int:
+        """Input-independent part of c: (a*b - alpha*beta - gamma*ic_0) / delta."""
+        numerator = scalar_a * scalar_b - self.alpha * self.beta - self.gamma * self.ic[0]
+        return numerator * pow(self.delta, -1, curve_order) % curve_order
+    
+    def c_query_scalars(self) -> List[int]:
+        """Per-public-input coefficients of c: -gamma * ic_i / delta for i >= 1."""
+        delta_inv = pow(self.delta, -1, curve_order)
+        return [-self.gamma * ic * delta_inv % curve_order for ic in self.ic[1:]]
+    
+    def c_query(self, backend: CurveBackend) -> list:
+        """
+        C query points (c_query_scalars * G1) in backend form, built once.
+        
+        Play the role of a proving key's query section: the prover adds
+        MSM(c_query, public_inputs) to the fixed-base part of C.
+        """
+        if backend.name not in self._c_query_points:
+            self._c_query_points[backend.name] = [
+                backend.multiply(backend.G1, q) for q in self.c_query_scalars()
+            ]
+        return self._c_query_points[backend.name]
+    
+    def verification_key(self) -> VerificationKey:
+        """Verification key matching this setup's trapdoor."""
+        backend = get_backend()
+        
+        def g1(scalar: int) -> G1Ints:
+            return backend.g1_affine(backend.multiply(backend.G1, scalar))
+        
+        def g2(scalar: int) -> G2Ints:
+            return backend.g2_affine(backend.multiply(backend.G2, scalar))
+        
+        return VerificationKey(
+            alpha_1=g1(self.alpha),
+            beta_2=g2(self.beta),
+            gamma_2=g2(self.gamma),
+            delta_2=g2(self.delta),
+            ic=[g1(scalar) for scalar in self.ic],
+            source="development",
+        )
+
+
+def development_setup(circuit_id: str, circuit_version: str, num_public_inputs: int) -> DevelopmentSetup:
+    """
+    Development setup for a circuit, derived from its id and version.
+    
+    Anyone can derive the same trapdoor and forge proofs, so this raises
+    SetupUnavailable unless development_setup_enabled().
+    """
+    if not development_setup_enabled():
+        raise SetupUnavailable(
+            f"No keys deployed for {circuit_id} {circuit_version} and the development setup is disabled"
+        )
+    return _development_setup(circuit_id, circuit_version, num_public_inputs)
+
+
+@lru_cache(maxsize=None)
+def _development_setup(circuit_id: str, circuit_version: str, num_public_inputs: int) -> DevelopmentSetup:
+    seed = f"{circuit_id}:{circuit_version}:development-setup".encode()
+    return DevelopmentSetup(seed, num_public_inputs)
+
+
+def load_verification_key(
+    path: str,
+    circuit_id: str,
+    circuit_version: str,
+    num_public_inputs: int,
+) -> VerificationKey:
+    """
+    Load the verification key at `path`.
+    
+    Falls back to the development setup's key when no file is deployed and
+    the development setup is enabled; raises SetupUnavailable otherwise.
+    """
+    if os.path.exists(path):
+        return _read_verification_key(path)
+    
+    vk = development_setup(circuit_id, circuit_version, num_public_inputs).verification_key()
+    logger.warning("Verification key not found, using development setup", path=path)
+    return vk
+
+
+@lru_cache(maxsize=None)
+def _read_verification_key(path: str) -> VerificationKey:
+    with open(path) as f:
+        vk = VerificationKey.from_snarkjs(json.load(f))
+    logger.info("Verification key loaded", path=path, n_public=vk.num_public_inputs)
+    return vk
@@ -0,0 +1,40 @@
+"""
+Phase timing for proof generation.
+
+A Trace is plain data so it can be filled in a prover pool worker and its
+phases returned to the API process, where they are exported as metrics.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Mapping
+
+
+class Trace:
+    """Wall-clock seconds spent in named phases; repeated phases accumulate."""
+    
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+    
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+    
+    def merge(self, phases: Mapping[str, float]) -> None:
+        """Fold in phases recorded elsewhere (e.g. in a pool worker)."""
+        for name, seconds in phases.items():
+            self.add(name, seconds)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Phases in milliseconds, in the order they were first entered."""
+        return {
+            "phases_ms": {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()},
+            "total_ms": round(sum(self.phases.values()) * 1000, 3),
+        }
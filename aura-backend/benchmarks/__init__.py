@@ -0,0 +1,3 @@
+"""
+Performance benchmarks for Aura Protocol backend.
+"""
@@ -0,0 +1,67 @@
+"""
+Microbenchmark: fixed-base tables vs py_ecc double-and-add.
+
+Usage: python -m benchmarks.bench_fixed_base [--rounds N] [--window W] [--backend NAME]
+"""
+
+import argparse
+import hashlib
+import time
+
+from py_ecc.bn128 import G1, G2, curve_order, multiply
+
+from app.zk.curve import AffineBackend, get_backend
+from app.zk.fixed_base import FixedBaseTable
+
+
+def _scalars(rounds: int) -> list:
+    # Same derivation as ZKProverService._generate_groth16_proof (128-bit seeds)
+    return [
+        int.from_bytes(hashlib.sha256(str(i).encode()).digest()[:16], "big") % curve_order
+        for i in range(rounds)
+    ]
+
+
+def _bench(label: str, base, table: FixedBaseTable, scalars: list) -> None:
+    to_ints = f"{label.lower()}_to_ints"
+    reference = getattr(AffineBackend(), to_ints)
+    normalize = getattr(table.backend, to_ints)
+    
+    start = time.perf_counter()
+    expected = [reference(multiply(base, k)) for k in scalars]
+    baseline = (time.perf_counter() - start) / len(scalars)
+    
+    start = time.perf_counter()
+    actual = [normalize(table.multiply(k)) for k in scalars]
+    windowed = (time.perf_counter() - start) / len(scalars)
+    
+    assert actual == expected, f"{label}: fixed-base result differs from multiply()"
+    print(
+        f"{label}: double-and-add {baseline * 1000:8.2f} ms  "
+        f"fixed-base {windowed * 1000:8.2f} ms  "
+        f"speedup {baseline / windowed:5.1f}x  (bit-identical)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--window", type=int, default=5)
+    parser.add_argument("--backend", default=None, help="affine or projective (default: ZK_CURVE_BACKEND)")
+    args = parser.parse_args()
+    
+    backend = get_backend(args.backend)
+    scalars = _scalars(args.rounds)
+    
+    for label, base, table_base in (("G1", G1, backend.G1), ("G2", G2, backend.G2)):
+        start = time.perf_counter()
+        table = FixedBaseTable(table_base, args.window, backend=backend)
+        print(
+            f"{label}: table build {time.perf_counter() - start:.2f} s "
+            f"(window={args.window}, backend={backend.name})"
+        )
+        _bench(label, base, table, scalars)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Microbenchmark: InferenceBatcher wait settings under concurrent load.
+
+Each setting serves `--requests` single-row predictions from `--clients`
+concurrent callers against a small logistic model and reports throughput,
+p50/p99 latency and the mean batch size.
+
+Usage: python -m benchmarks.bench_inference_batcher [--clients N] [--requests N]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from app.services.agents import AuraAgent, InferenceBatcher
+
+WAITS_MS = (0.0, 0.5, 2.0, 5.0)
+
+
+class _Sized:
+    """Wraps a model to record the rows per predict_proba call."""
+    
+    def __init__(self, model):
+        self.model = model
+        self.sizes = []
+    
+    def predict_proba(self, features):
+        self.sizes.append(len(features))
+        return self.model.predict_proba(features)
+
+
+async def _run(clients: int, requests: int, max_batch_size: int) -> None:
+    rng = np.random.default_rng(0)
+    features = rng.random((1000, len(AuraAgent.FEATURES)))
+    model = LogisticRegression().fit(features, (features[:, 4] > 0.5).astype(int))
+    
+    # One row per call first: the unbatched baseline
+    for size, wait_ms in [(1, 0.0)] + [(max_batch_size, wait) for wait in WAITS_MS]:
+        sized = _Sized(model)
+        batcher = InferenceBatcher("bench", max_batch_size=size, max_wait_ms=wait_ms)
+        latencies = []
+        
+        async def client(offset: int) -> None:
+            for i in range(offset, requests, clients):
+                start = time.perf_counter()
+                await batcher.predict(sized, features[i % len(features)])
+                latencies.append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        await asyncio.gather(*(client(c) for c in range(clients)))
+        elapsed = time.perf_counter() - start
+        
+        latencies.sort()
+        print(
+            f"batch <= {size:3d}, wait {wait_ms:4.1f} ms: {requests / elapsed:8.0f} rows/s  "
+            f"p50 {latencies[len(latencies) // 2] * 1000:6.2f} ms  "
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:6.2f} ms  "
+            f"mean batch {statistics.mean(sized.sizes):5.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(_run(args.clients, args.requests, args.max_batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: Pippenger MSM vs naive sum of scalar multiplications.
+
+Usage: python -m benchmarks.bench_msm [--sizes 5,64,1024,4096] [--group G1|G2]
+       [--backend NAME] [--naive-max N] [--window C]
+
+Naive timings above --naive-max are extrapolated from a 64-term sample
+rather than run in full; correctness is always checked against the naive
+result on a prefix of the input.
+"""
+
+import argparse
+import hashlib
+import time
+
+from py_ecc.bn128 import curve_order
+
+from app.zk.curve import get_backend
+from app.zk.msm import msm, optimal_window
+
+
+def _inputs(backend, group: str, n: int):
+    base = backend.G1 if group == "G1" else backend.G2
+    points = [base]
+    for _ in range(n - 1):
+        points.append(backend.add(points[-1], base))
+    scalars = [
+        int.from_bytes(hashlib.sha256(b"msm%d" % i).digest(), "big") % curve_order
+        for i in range(n)
+    ]
+    return points, scalars
+
+
+def _naive(backend, points, scalars):
+    acc = backend.identity_like(points[0])
+    for p, k in zip(points, scalars):
+        acc = backend.add(acc, backend.multiply(p, k))
+    return acc
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="5,64,1024,4096")
+    parser.add_argument("--group", default="G1", choices=["G1", "G2"])
+    parser.add_argument("--backend", default=None)
+    parser.add_argument("--naive-max", type=int, default=1024)
+    parser.add_argument("--window", type=int, default=None)
+    args = parser.parse_args()
+    
+    backend = get_backend(args.backend)
+    to_ints = backend.g1_to_ints if args.group == "G1" else backend.g2_to_ints
+    
+    for n in (int(s) for s in args.sizes.split(",")):
+        points, scalars = _inputs(backend, args.group, n)
+        
+        start = time.perf_counter()
+        fast = msm(points, scalars, backend, args.window)
+        fast_s = time.perf_counter() - start
+        
+        naive_n = min(n, args.naive_max)
+        if naive_n < n:
+            sample = min(64, n)
+            start = time.perf_counter()
+            _naive(backend, points[:sample], scalars[:sample])
+            naive_s = (time.perf_counter() - start) * n / sample
+            check = to_ints(msm(points[:sample], scalars[:sample], backend)) == to_ints(
+                _naive(backend, points[:sample], scalars[:sample])
+            )
+            note = "extrapolated"
+        else:
+            start = time.perf_counter()
+            naive = _naive(backend, points, scalars)
+            naive_s = time.perf_counter() - start
+            check = to_ints(fast) == to_ints(naive)
+            note = "measured"
+        
+        assert check, f"MSM mismatch at n={n}"
+        window = args.window or optimal_window(n)
+        print(
+            f"{args.group} n={n:5d} window={window:2d}: pippenger {fast_s:8.3f} s  "
+            f"naive {naive_s:8.3f} s ({note})  speedup {naive_s / fast_s:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
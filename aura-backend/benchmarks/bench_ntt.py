@@ -0,0 +1,68 @@
+"""
+Benchmark: NTT vs naive O(n^2) evaluation, and the Groth16 quotient step.
+
+Usage: python -m benchmarks.bench_ntt [--sizes 256,1024,4096,16384] [--naive-max N]
+
+The quotient step is what the prover runs per proof: one batched inverse
+NTT of A, B, C and one batched coset NTT. Naive timings above --naive-max
+are extrapolated from 32 evaluation points.
+"""
+
+import argparse
+import time
+
+from py_ecc.bn128 import curve_order
+
+from app.zk.ntt import get_domain
+
+
+def _naive(coefficients, points):
+    out = []
+    for x in points:
+        acc = 0
+        for c in reversed(coefficients):
+            acc = (acc * x + c) % curve_order
+        out.append(acc)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="256,1024,4096,16384")
+    parser.add_argument("--naive-max", type=int, default=1024)
+    args = parser.parse_args()
+    
+    for n in (int(s) for s in args.sizes.split(",")):
+        domain = get_domain(n)
+        coefficients = [(i * 0x9E3779B97F4A7C15 + 7) ** 3 % curve_order for i in range(n)]
+        
+        start = time.perf_counter()
+        domain.ntt(coefficients)
+        first_s = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        evaluations = domain.ntt(coefficients)
+        ntt_s = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        batch = domain.intt([evaluations.tolist()] * 3)
+        domain.coset_ntt(batch)
+        quotient_s = time.perf_counter() - start
+        
+        sample = n if n <= args.naive_max else 32
+        points = [pow(domain.omega, k, curve_order) for k in range(sample)]
+        start = time.perf_counter()
+        naive = _naive(coefficients, points)
+        naive_s = (time.perf_counter() - start) * n / sample
+        assert naive == evaluations.tolist()[:sample], f"NTT mismatch at n={n}"
+        
+        note = "measured" if sample == n else "extrapolated"
+        print(
+            f"n={n:6d}: ntt {ntt_s * 1000:8.1f} ms (first call {first_s * 1000:8.1f} ms)  "
+            f"quotient {quotient_s * 1000:8.1f} ms  naive {naive_s:8.2f} s ({note})  "
+            f"speedup {naive_s / ntt_s:7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
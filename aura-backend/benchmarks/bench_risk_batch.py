@@ -0,0 +1,67 @@
+"""
+Microbenchmark: AuraAgent.assess_risk per row vs assess_risk_batch.
+
+Usage: python -m benchmarks.bench_risk_batch [--rows N] [--seed S]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.services.agents import AuraAgent
+
+VOLATILE = ("assessment_id", "processing_time_ms")
+
+
+def _columns(rows: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    return {
+        "proof_valid": [rng.random() < 0.8 for _ in range(rows)],
+        "income_sufficient": [rng.random() < 0.7 for _ in range(rows)],
+        "dti_acceptable": [rng.random() < 0.7 for _ in range(rows)],
+        "no_compliance_flags": [rng.random() < 0.9 for _ in range(rows)],
+        "requested_amount": [round(rng.uniform(100, 50_000), 2) for _ in range(rows)],
+        "tenure_months": [rng.choice([3, 6, 12, 24, 36, 60]) for _ in range(rows)],
+        "monthly_income": [rng.choice([0.0, round(rng.uniform(500, 20_000), 2)]) for _ in range(rows)],
+        "existing_debt": [round(rng.uniform(0, 100_000), 2) for _ in range(rows)],
+    }
+
+
+async def _run(rows: int, seed: int) -> None:
+    columns = _columns(rows, seed)
+    
+    start = time.perf_counter()
+    scalar = [
+        await AuraAgent.assess_risk(**{name: column[i] for name, column in columns.items()})
+        for i in range(rows)
+    ]
+    scalar_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    batch = await AuraAgent.assess_risk_batch(**columns)
+    batch_time = time.perf_counter() - start
+    
+    for i, (expected, actual) in enumerate(zip(scalar, batch)):
+        for key in VOLATILE:
+            expected.pop(key)
+            actual.pop(key)
+        assert actual == expected, f"row {i}: batch result differs from assess_risk"
+    
+    print(
+        f"{rows} rows: scalar {rows / scalar_time:10.0f} rows/s  "
+        f"batch {rows / batch_time:10.0f} rows/s  "
+        f"speedup {scalar_time / batch_time:4.1f}x  (identical)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    asyncio.run(_run(args.rows, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 -- Aura Protocol Database Initialization Script
 -- PostgreSQL 15+
+-- Runs only on a fresh volume. Databases created while zk_proofs.proof_data
+-- was TEXT need `python -m app.jobs.migrate_proof_data` once.
 
 -- Enable required extensions
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
@@ -48,7 +50,7 @@ CREATE TABLE IF NOT EXISTS zk_proofs (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     application_id UUID NOT NULL REFERENCES loan_applications(id) ON DELETE CASCADE,
     proof_hash VARCHAR(64) NOT NULL UNIQUE,
-    proof_data TEXT NOT NULL,
+    proof_data BYTEA NOT NULL,
     public_signals JSONB NOT NULL,
     is_valid BOOLEAN NOT NULL,
     income_sufficient BOOLEAN NOT NULL,
@@ -92,6 +94,32 @@ CREATE TABLE IF NOT EXISTS loan_decisions (
 
 CREATE INDEX idx_loan_decisions_application ON loan_decisions(application_id);
 
+-- Offline re-scores (python -m app.jobs.rescore), one row per run and application
+CREATE TABLE IF NOT EXISTS loan_rescores (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    run_id UUID NOT NULL,
+    application_id UUID NOT NULL REFERENCES loan_applications(id) ON DELETE CASCADE,
+    decision_id UUID REFERENCES loan_decisions(id) ON DELETE SET NULL,
+    risk_score DECIMAL(5, 2) NOT NULL,
+    risk_level risk_level NOT NULL,
+    aura_recommendation VARCHAR(32) NOT NULL,
+    aura_max_amount DECIMAL(18, 6),
+    aura_confidence DECIMAL(4, 3) NOT NULL,
+    aura_reasoning TEXT,
+    is_approved BOOLEAN NOT NULL,
+    approved_amount DECIMAL(18, 6),
+    interest_rate DECIMAL(5, 2),
+    adjusted_tenure INTEGER,
+    monthly_payment DECIMAL(18, 6),
+    lender_explanation TEXT,
+    aura_model_version VARCHAR(32) NOT NULL,
+    lender_model_version VARCHAR(32) NOT NULL,
+    assumed_monthly_income DECIMAL(18, 6) NOT NULL,
+    assumed_existing_debt DECIMAL(18, 6) NOT NULL,
+    scored_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    UNIQUE (run_id, application_id)
+);
+
 -- Loan Transactions table
 CREATE TABLE IF NOT EXISTS loan_transactions (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -3,6 +3,7 @@ Pytest configuration and fixtures.
 """
 
 import asyncio
+import os
 from typing import AsyncGenerator
 
 import pytest
@@ -10,6 +11,9 @@ import pytest_asyncio
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
+# Proofs in tests use the development setup; set before settings load
+os.environ.setdefault("ZK_DEVELOPMENT_SETUP", "true")
+
 from app.main import app
 from app.core.database import Base, get_db
 
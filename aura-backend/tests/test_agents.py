@@ -4,6 +4,7 @@ Tests for AI agents.
 
 import pytest
 from app.services.agents import AuraAgent, LenderAgent
+from app.services.model_registry import LoadedModel, ModelRegistry
 
 
 @pytest.mark.asyncio
@@ -87,3 +88,262 @@ async def test_lender_rejection_decision():
     
     assert result["is_approved"] is False
     assert result["approved_amount"] is None
+
+
+@pytest.mark.asyncio
+async def test_aura_batch_matches_scalar_assessment():
+    """Test that batch scoring reproduces assess_risk row by row."""
+    rows = [
+        (True, True, True, True, 2000.0, 12, 5000.0, 1000.0),
+        (True, False, False, True, 5000.0, 12, 2000.0, 5000.0),
+        (False, True, True, True, 2000.0, 12, 5000.0, 1000.0),
+        (True, True, True, False, 9000.0, 36, 4000.0, 20000.0),
+        (True, False, True, True, 1000.0, 6, 0.0, 0.0),
+        (True, True, False, True, 12345.67, 60, 3210.5, 45000.0),
+        (True, True, True, True, 40000.0, 24, 1500.0, 0.0),
+    ]
+    names = [
+        "proof_valid", "income_sufficient", "dti_acceptable", "no_compliance_flags",
+        "requested_amount", "tenure_months", "monthly_income", "existing_debt",
+    ]
+    
+    batch = await AuraAgent.assess_risk_batch(**{name: list(col) for name, col in zip(names, zip(*rows))})
+    
+    assert len(batch) == len(rows)
+    for row, result in zip(rows, batch):
+        expected = await AuraAgent.assess_risk(**dict(zip(names, row)))
+        for key in ("assessment_id", "processing_time_ms"):
+            expected.pop(key)
+            result.pop(key)
+        assert result == expected
+
+
+@pytest.mark.asyncio
+async def test_aura_batch_rejects_ragged_columns():
+    """Test that columns of different lengths are rejected."""
+    with pytest.raises(ValueError):
+        await AuraAgent.assess_risk_batch(
+            proof_valid=[True, True],
+            income_sufficient=[True],
+            dti_acceptable=[True, True],
+            no_compliance_flags=[True, True],
+            requested_amount=[1000.0, 2000.0],
+            tenure_months=[12, 12],
+            monthly_income=[5000.0, 5000.0],
+            existing_debt=[0.0, 0.0],
+        )
+
+
+@pytest.mark.asyncio
+async def test_agents_score_with_memory_mapped_models(tmp_path, monkeypatch):
+    """Test that deployed joblib models are memory-mapped and used for scoring."""
+    import joblib
+    import numpy as np
+    from sklearn.linear_model import LinearRegression, LogisticRegression
+    from app.services import agents
+    
+    rng = np.random.default_rng(0)
+    features = rng.random((200, len(AuraAgent.FEATURES)))
+    labels = (features[:, 4] + features[:, 5] > 1).astype(int)
+    aura_path = tmp_path / "aura.joblib"
+    joblib.dump(LogisticRegression().fit(features, labels), aura_path)
+    
+    pricing = rng.random((50, len(LenderAgent.FEATURES))) * [100, 10, 10000, 60]
+    lender_path = tmp_path / "lender.joblib"
+    joblib.dump(LinearRegression().fit(pricing, 8.5 + pricing[:, 0] / 10), lender_path)
+    
+    monkeypatch.setattr(agents.settings, "AURA_MODEL_PATH", str(aura_path))
+    monkeypatch.setattr(agents.settings, "LENDER_MODEL_PATH", str(lender_path))
+    monkeypatch.setattr(AuraAgent, "models", ModelRegistry("aura"))
+    monkeypatch.setattr(LenderAgent, "models", ModelRegistry("lender"))
+    await AuraAgent.load_model()
+    await LenderAgent.load_model()
+    
+    assert isinstance(AuraAgent.models.active.model.coef_, np.memmap)
+    
+    application = dict(
+        proof_valid=True,
+        income_sufficient=True,
+        dti_acceptable=True,
+        no_compliance_flags=True,
+        requested_amount=2000.0,
+        tenure_months=12,
+        monthly_income=5000.0,
+        existing_debt=1000.0,
+    )
+    assessment = await AuraAgent.assess_risk(**application)
+    batch = await AuraAgent.assess_risk_batch(**{k: [v, v] for k, v in application.items()})
+    
+    assert assessment["scoring"] == "model"
+    assert [r["scoring"] for r in batch] == ["model", "model"]
+    assert batch[0]["risk_score"] == pytest.approx(assessment["risk_score"], abs=0.01)
+    
+    decision = await LenderAgent.make_decision(
+        aura_assessment={**assessment, "recommendation": "approve", "risk_level": "low"},
+        requested_amount=2000.0,
+        requested_tenure=12,
+    )
+    assert decision["pricing"] == "model"
+    assert 5.0 <= decision["interest_rate"] <= 25.0
+
+
+@pytest.mark.asyncio
+async def test_agents_fall_back_to_rules_without_model(tmp_path, monkeypatch):
+    """Test that missing model files leave the rule-based path in place."""
+    from app.services import agents
+    
+    monkeypatch.setattr(agents.settings, "AURA_MODEL_PATH", str(tmp_path / "missing.joblib"))
+    registry = ModelRegistry("aura")
+    registry.active = LoadedModel("stale", object(), "old.joblib")
+    monkeypatch.setattr(AuraAgent, "models", registry)
+    await AuraAgent.load_model()
+    
+    assert AuraAgent.models.active is None
+    result = await AuraAgent.assess_risk(
+        proof_valid=True,
+        income_sufficient=True,
+        dti_acceptable=True,
+        no_compliance_flags=True,
+        requested_amount=2000.0,
+        tenure_months=12,
+        monthly_income=5000.0,
+        existing_debt=1000.0,
+    )
+    assert result["scoring"] == "rules"
+    assert result["risk_level"] == "low"
+
+
+class _CountingModel:
+    """Regressor stub that records the size of every predict call."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def predict(self, features):
+        self.calls.append(len(features))
+        return features[:, 0] * 2
+
+
+@pytest.mark.asyncio
+async def test_batcher_coalesces_concurrent_calls():
+    """Test that concurrent predictions share one model call and get their own rows."""
+    import asyncio
+    import numpy as np
+    from app.services.agents import InferenceBatcher
+    
+    model = _CountingModel()
+    batcher = InferenceBatcher("test", max_batch_size=8, max_wait_ms=5.0)
+    
+    scores = await asyncio.gather(*(batcher.predict(model, np.array([float(i)])) for i in range(20)))
+    
+    assert scores == [i * 2.0 for i in range(20)]
+    assert model.calls == [8, 8, 4]
+
+
+@pytest.mark.asyncio
+async def test_batcher_holds_dispatched_batches():
+    """Test that a dispatched batch is referenced until it completes."""
+    import asyncio
+    import gc
+    import numpy as np
+    from app.services.agents import InferenceBatcher
+    
+    model = _CountingModel()
+    batcher = InferenceBatcher("test", max_batch_size=2, max_wait_ms=1000.0)
+    pending = asyncio.gather(*(batcher.predict(model, np.array([float(i)])) for i in range(2)))
+    await asyncio.sleep(0)
+    
+    assert len(batcher._tasks) == 1
+    gc.collect()
+    assert await pending == [0.0, 2.0]
+    assert not batcher._tasks
+
+
+@pytest.mark.asyncio
+async def test_batcher_propagates_model_errors():
+    """Test that a failed batch fails every caller in it."""
+    import asyncio
+    import numpy as np
+    from app.services.agents import InferenceBatcher
+    
+    class Broken:
+        def predict(self, features):
+            raise RuntimeError("bad model")
+    
+    batcher = InferenceBatcher("test", max_batch_size=4, max_wait_ms=0)
+    results = await asyncio.gather(
+        *(batcher.predict(Broken(), np.array([1.0])) for _ in range(2)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_quote_grid_matches_decisions():
+    """Test that every price grid cell agrees with the terms make_decision offers."""
+    amounts, tenures = [1000.0, 2500.0, 8000.0], [3, 12, 36]
+    levels = ("low", "medium", "high")
+    grid = LenderAgent.quote_grid(amounts, tenures, levels, max_amount=2500.0)
+    
+    assert grid["approved_amount"] == [1000.0, 2500.0, 2500.0]
+    for l, level in enumerate(levels):
+        for a, amount in enumerate(amounts):
+            for t, tenure in enumerate(tenures):
+                decision = await LenderAgent.make_decision(
+                    aura_assessment={
+                        "recommendation": "reduce_amount",
+                        "risk_level": level,
+                        "risk_score": LenderAgent.QUOTE_RISK_SCORES[level],
+                        "max_approved_amount": 2500.0,
+                        "reasoning": "",
+                    },
+                    requested_amount=amount,
+                    requested_tenure=tenure,
+                )
+                assert grid["interest_rate"][level] == decision["interest_rate"]
+                assert grid["adjusted_tenure"][l][a][t] == decision["adjusted_tenure"]
+                assert grid["monthly_payment"][l][a][t] == decision["monthly_payment"]
+                assert grid["total_interest"][l][a][t] == decision["terms"]["total_interest"]
+    
+    with pytest.raises(ValueError):
+        LenderAgent.quote_grid(amounts, tenures, ["unknown"])
+    with pytest.raises(ValueError):
+        LenderAgent.quote_grid(amounts, tenures, ["critical"], max_amount=2500.0)
+    with pytest.raises(ValueError):
+        LenderAgent.quote_grid(amounts, tenures, ["low", "high"])
+
+
+@pytest.mark.asyncio
+async def test_lender_batch_decisions_match_make_decision():
+    """Test that vectorized decisions give make_decision's terms row by row."""
+    import numpy as np
+    
+    rng = np.random.default_rng(3)
+    count = 200
+    score = rng.uniform(0, 100, count)
+    requested = np.round(rng.uniform(100, 20_000, count), 2)
+    tenure = rng.choice([3, 6, 12, 24, 36, 60], count)
+    income = rng.uniform(0, 5000, count)
+    proof_valid = rng.random(count) < 0.8
+    level, recommendation, max_amount = AuraAgent._recommend_batch(score, proof_valid, requested, income)
+    
+    batch = LenderAgent._decide_batch(score, level, recommendation, max_amount, requested, tenure)
+    
+    for i in range(count):
+        decision = await LenderAgent.make_decision(
+            aura_assessment={
+                "recommendation": AuraAgent.RECOMMENDATIONS[recommendation[i]],
+                "risk_level": AuraAgent.RISK_LEVELS[level[i]],
+                "risk_score": float(score[i]),
+                "max_approved_amount": None if np.isnan(max_amount[i]) else float(max_amount[i]),
+                "reasoning": "",
+            },
+            requested_amount=float(requested[i]),
+            requested_tenure=int(tenure[i]),
+        )
+        assert bool(batch["is_approved"][i]) == decision["is_approved"]
+        if decision["is_approved"]:
+            assert batch["approved_amount"][i] == decision["approved_amount"]
+            assert batch["interest_rate"][i] == decision["interest_rate"]
+            assert batch["adjusted_tenure"][i] == decision["adjusted_tenure"]
+            assert batch["monthly_payment"][i] == decision["monthly_payment"]
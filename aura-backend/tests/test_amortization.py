@@ -0,0 +1,46 @@
+"""
+Tests for the vectorized amortization engine.
+"""
+
+import numpy as np
+import pytest
+from app.services.agents import LenderAgent
+from app.services.amortization import amortization_schedule, monthly_payment
+
+
+def test_payment_matches_scalar_formula():
+    """Test that vectorized payments round to the Lender agent's scalar payments."""
+    principal = np.array([[500.0], [2000.0], [49_999.99]])
+    rates = np.array([0.0, 8.5, 11.25, 25.0])
+    tenures = np.array([3, 12, 60])
+    
+    payments = monthly_payment(principal[:, :, None], rates[None, :, None], tenures[None, None, :])
+    
+    assert payments.shape == (3, 4, 3)
+    for (i, j, k), payment in np.ndenumerate(payments):
+        expected = LenderAgent._calculate_monthly_payment(principal[i, 0], rates[j], int(tenures[k]))
+        assert round(payment, 2) == expected
+
+
+def test_schedule_repays_principal():
+    """Test that each schedule splits payments into interest and principal and pays off."""
+    schedule = amortization_schedule([2000.0, 10_000.0, 600.0], [8.5, 12.0, 0.0], [12, 36, 6])
+    
+    assert schedule["month"].tolist() == list(range(1, 37))
+    assert schedule["principal"].sum(axis=1) == pytest.approx([2000.0, 10_000.0, 600.0])
+    np.testing.assert_allclose(schedule["interest"] + schedule["principal"], schedule["payment"])
+    
+    # First month's interest is on the full principal
+    assert schedule["interest"][0, 0] == pytest.approx(2000.0 * 0.085 / 12)
+    assert schedule["interest"][2].sum() == 0
+    
+    # Balances fall to zero at each loan's own tenure and stay there
+    assert (np.diff(schedule["balance"][1]) < 0).all()
+    assert schedule["balance"][0, 11] == 0 and schedule["payment"][0, 12:].sum() == 0
+    assert schedule["balance"][2, 4] == pytest.approx(100.0)
+
+
+def test_schedule_rejects_zero_tenure():
+    """Test that a loan without payments is rejected."""
+    with pytest.raises(ValueError):
+        amortization_schedule(1000.0, 8.5, 0)
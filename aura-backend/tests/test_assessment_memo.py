@@ -0,0 +1,150 @@
+"""
+Tests for memoized agent assessments.
+"""
+
+import math
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from app.services.agents import AuraAgent, LenderAgent
+from app.services.assessment_memo import AGENT_MEMO_LOOKUPS, AssessmentMemo, quantize
+from app.services.model_registry import ModelRegistry
+
+APPLICATION = dict(
+    proof_valid=True,
+    income_sufficient=True,
+    dti_acceptable=True,
+    no_compliance_flags=True,
+    requested_amount=2000.0,
+    tenure_months=12,
+    monthly_income=5000.0,
+    existing_debt=1000.0,
+)
+
+
+def _lookups(agent: str, result: str) -> float:
+    return AGENT_MEMO_LOOKUPS.labels(agent=agent, result=result)._value.get()
+
+
+@pytest.fixture
+def aura_memo(monkeypatch):
+    memo = AssessmentMemo(
+        "aura", AuraAgent.memo.steps, "assessment_id", AuraAgent.memo.rounding, max_entries=4, ttl=60, enabled=True
+    )
+    monkeypatch.setattr(AuraAgent, "memo", memo)
+    return memo
+
+
+def test_quantize():
+    """Test that values round to the nearest step without float residue."""
+    assert quantize(1999.6, 1.0) == 2000.0
+    assert quantize(5004.9, 10.0) == 5000.0
+    assert quantize(0.1 + 0.2, 0.1) == 0.3
+    assert quantize(12.345, 0) == 12.345
+    assert quantize(1999.6, 1.0, math.floor) == 1999.0
+    assert quantize(0.3, 0.1, math.floor) == 0.3
+    assert quantize(1000.1, 10.0, math.ceil) == 1010.0
+
+
+@pytest.mark.asyncio
+async def test_slider_drag_is_served_from_cache(aura_memo):
+    """Test that inputs within one step share a result computed on the quantized inputs."""
+    hits = _lookups("aura", "hit")
+    first = await AuraAgent.assess_risk_memoized(**dict(APPLICATION, requested_amount=2000.3))
+    second = await AuraAgent.assess_risk_memoized(**dict(APPLICATION, requested_amount=2000.8, monthly_income=5007.0))
+    direct = await AuraAgent.assess_risk(**APPLICATION)
+    
+    assert (first["from_cache"], second["from_cache"]) == (False, True)
+    assert _lookups("aura", "hit") == hits + 1
+    assert second["assessment_id"] != first["assessment_id"]
+    for field in ("risk_score", "risk_level", "recommendation", "max_approved_amount", "factors", "reasoning"):
+        assert second[field] == first[field] == direct[field]
+    
+    # Caller mutations do not reach the cached copy
+    second["factors"]["dti_ratio"] = -1
+    third = await AuraAgent.assess_risk_memoized(**APPLICATION)
+    assert third["from_cache"] and third["factors"] == direct["factors"]
+
+
+@pytest.mark.asyncio
+async def test_model_swap_invalidates(aura_memo, monkeypatch, tmp_path):
+    """Test that entries from one model version are not served for the next."""
+    registry = ModelRegistry("aura")
+    monkeypatch.setattr(AuraAgent, "models", registry)
+    rng = np.random.default_rng(0)
+    features = rng.random((200, len(AuraAgent.FEATURES)))
+    for version, column in (("aura-risk-v1", 4), ("aura-risk-v2", 5)):
+        path = tmp_path / f"{version}.joblib"
+        joblib.dump(LogisticRegression().fit(features, (features[:, column] > 0.5).astype(int)), path)
+        await registry.activate(str(path), version)
+        
+        first = await AuraAgent.assess_risk_memoized(**APPLICATION)
+        second = await AuraAgent.assess_risk_memoized(**APPLICATION)
+        assert (first["from_cache"], second["from_cache"]) == (False, True)
+        assert first["model_version"] == second["model_version"] == version
+
+
+@pytest.mark.asyncio
+async def test_size_and_ttl_bounds(aura_memo):
+    """Test that the memo evicts least recently used entries and expires old ones."""
+    for amount in (1000.0, 2000.0, 3000.0, 4000.0, 5000.0):
+        await AuraAgent.assess_risk_memoized(**dict(APPLICATION, requested_amount=amount))
+    assert len(aura_memo._entries) == 4
+    assert not (await AuraAgent.assess_risk_memoized(**dict(APPLICATION, requested_amount=1000.0)))["from_cache"]
+    
+    aura_memo.ttl = 0
+    expired = _lookups("aura", "expired")
+    await AuraAgent.assess_risk_memoized(**dict(APPLICATION, requested_amount=6000.0))
+    assert not (await AuraAgent.assess_risk_memoized(**dict(APPLICATION, requested_amount=6000.0)))["from_cache"]
+    assert _lookups("aura", "expired") == expired + 1
+
+
+@pytest.mark.asyncio
+async def test_disabled_and_wallet_calls_bypass_the_memo(aura_memo):
+    """Test that calls outside the memo still report from_cache."""
+    aura_memo.enabled = False
+    assert not (await AuraAgent.assess_risk_memoized(**APPLICATION))["from_cache"]
+    assert not (await AuraAgent.assess_risk_memoized(**APPLICATION))["from_cache"]
+    
+    aura_memo.enabled = True
+    await AuraAgent.assess_risk_memoized(**APPLICATION)
+    wallet = await AuraAgent.assess_risk_memoized(**APPLICATION, wallet_address="addr_test1" + "q" * 50)
+    assert not wallet["from_cache"]
+
+
+@pytest.mark.asyncio
+async def test_lender_decisions_are_memoized(monkeypatch):
+    """Test that decisions for the same quantized terms come from the memo."""
+    memo = AssessmentMemo("lender", LenderAgent.memo.steps, "decision_id", LenderAgent.memo.rounding, ttl=60, enabled=True)
+    monkeypatch.setattr(LenderAgent, "memo", memo)
+    assessment = await AuraAgent.assess_risk(**APPLICATION)
+    
+    first = await LenderAgent.make_decision_memoized(assessment, 2000.2, 12)
+    second = await LenderAgent.make_decision_memoized(dict(assessment, assessment_id="other"), 2000.9, 12)
+    longer = await LenderAgent.make_decision_memoized(assessment, 2000.0, 24)
+    direct = await LenderAgent.make_decision(assessment, 2000.0, 12)
+    
+    assert (first["from_cache"], second["from_cache"], longer["from_cache"]) == (False, True, False)
+    assert second["decision_id"] != first["decision_id"]
+    for field in ("is_approved", "approved_amount", "interest_rate", "monthly_payment", "terms"):
+        assert second[field] == first[field] == direct[field]
+
+
+@pytest.mark.asyncio
+async def test_offers_never_exceed_the_request(aura_memo, monkeypatch):
+    """Test that quantization never rounds an amount up past what was asked for."""
+    memo = AssessmentMemo("lender", LenderAgent.memo.steps, "decision_id", LenderAgent.memo.rounding, ttl=60, enabled=True)
+    monkeypatch.setattr(LenderAgent, "memo", memo)
+    
+    for requested in (1999.6, 1999.4):
+        assessment = await AuraAgent.assess_risk_memoized(**dict(APPLICATION, requested_amount=requested))
+        assert assessment["recommendation"] == "approve"
+        assert assessment["max_approved_amount"] <= requested
+        for max_amount in (assessment["max_approved_amount"], requested):
+            decision = await LenderAgent.make_decision_memoized(
+                dict(assessment, max_approved_amount=max_amount), requested, 12
+            )
+            assert decision["is_approved"] and decision["approved_amount"] <= requested
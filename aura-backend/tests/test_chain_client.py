@@ -0,0 +1,196 @@
+"""
+Tests for the pooled async Blockfrost client.
+"""
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from pycardano import MultiAsset
+
+from app.services.cardano import CardanoService
+from app.services.chain_client import ChainApiError, ChainClient
+
+TX_HASH = "ab" * 32
+ADDRESS = "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
+
+
+class FakeBlockfrost:
+    """Blockfrost endpoints served locally, failing on demand."""
+    
+    def __init__(self):
+        self.failures = []  # statuses returned, in order, before succeeding
+        self.delay = 0.0
+        self.calls = 0
+        self.peers = set()
+        self.utxo_count = 150
+    
+    async def _maybe_fail(self, request: web.Request):
+        self.calls += 1
+        self.peers.add(request.transport.get_extra_info("peername"))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.failures:
+            status = self.failures.pop(0)
+            return web.json_response({"status_code": status, "message": "failure"}, status=status)
+        return None
+    
+    async def transaction(self, request: web.Request) -> web.Response:
+        failure = await self._maybe_fail(request)
+        if failure is not None:
+            return failure
+        if request.match_info["tx_hash"] != TX_HASH:
+            return web.json_response({"status_code": 404, "message": "Not found"}, status=404)
+        return web.json_response({"hash": TX_HASH, "block_height": 1000, "slot": 5000, "index": 1, "fees": "170000"})
+    
+    async def blocks_latest(self, request: web.Request) -> web.Response:
+        failure = await self._maybe_fail(request)
+        if failure is not None:
+            return failure
+        return web.json_response({"height": 1005})
+    
+    async def address_utxos(self, request: web.Request) -> web.Response:
+        failure = await self._maybe_fail(request)
+        if failure is not None:
+            return failure
+        page, count = int(request.query["page"]), int(request.query["count"])
+        indexes = range((page - 1) * count, min(page * count, self.utxo_count))
+        return web.json_response([
+            {
+                "address": ADDRESS,
+                "tx_hash": TX_HASH,
+                "output_index": i,
+                "amount": [{"unit": "lovelace", "quantity": "2000000"}, {"unit": "11" * 28 + "6161", "quantity": "5"}],
+            }
+            for i in indexes
+        ])
+    
+    async def submit(self, request: web.Request) -> web.Response:
+        failure = await self._maybe_fail(request)
+        if failure is not None:
+            return failure
+        assert request.content_type == "application/cbor"
+        await request.read()
+        return web.json_response(TX_HASH)
+
+
+@pytest_asyncio.fixture
+async def blockfrost():
+    fake = FakeBlockfrost()
+    app = web.Application()
+    app.router.add_get("/api/v0/txs/{tx_hash}", fake.transaction)
+    app.router.add_get("/api/v0/blocks/latest", fake.blocks_latest)
+    app.router.add_get("/api/v0/addresses/{address}/utxos", fake.address_utxos)
+    app.router.add_post("/api/v0/tx/submit", fake.submit)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    client = ChainClient(project_id="preprodtest", base_url=f"http://127.0.0.1:{port}/api", backoff=0.01)
+    yield fake, client
+    await client.close()
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried(blockfrost):
+    """Test that 5xx and 429 responses are retried until one succeeds."""
+    fake, client = blockfrost
+    fake.failures = [503, 429, 502]
+    tx = await client.transaction(TX_HASH)
+    assert tx["block_height"] == 1000
+    assert fake.calls == 4
+    
+    fake.failures = [503] * 4
+    with pytest.raises(ChainApiError) as e:
+        await client.blocks_latest()
+    assert e.value.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(blockfrost):
+    """Test that a 404 surfaces at once."""
+    fake, client = blockfrost
+    with pytest.raises(ChainApiError) as e:
+        await client.transaction("cd" * 32)
+    assert e.value.status_code == 404
+    assert fake.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_submit_retries_only_unprocessed_requests(blockfrost):
+    """Test that a submission is retried after a 429 but not after a 5xx."""
+    fake, client = blockfrost
+    fake.failures = [429]
+    assert await client.transaction_submit(b"\x84") == TX_HASH
+    assert fake.calls == 2
+    
+    fake.failures = [503]
+    with pytest.raises(ChainApiError):
+        await client.transaction_submit(b"\x84")
+    assert fake.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_connections_are_kept_alive(blockfrost):
+    """Test that sequential calls reuse one pooled connection."""
+    fake, client = blockfrost
+    for _ in range(10):
+        await client.blocks_latest()
+    assert fake.calls == 10
+    assert len(fake.peers) == 1
+
+
+@pytest.mark.asyncio
+async def test_chain_calls_do_not_block_the_loop(blockfrost):
+    """Test that other coroutines keep running during a slow chain call."""
+    fake, client = blockfrost
+    fake.delay = 0.2
+    ticks = 0
+    
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+    
+    task = asyncio.ensure_future(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(client.blocks_latest() for _ in range(5)))
+    elapsed = time.perf_counter() - start
+    task.cancel()
+    
+    assert elapsed < 0.5  # concurrent, not 5 x 0.2 s
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_cardano_service_keeps_its_shapes(blockfrost):
+    """Test verify_transaction and UTxO lookups through the client."""
+    fake, client = blockfrost
+    service = CardanoService(chain=client)
+    
+    verified = await service.verify_transaction(TX_HASH)
+    assert verified == {
+        "tx_hash": TX_HASH,
+        "is_confirmed": True,
+        "confirmations": 5,
+        "block_height": 1000,
+        "slot_number": 5000,
+        "epoch": 0,
+        "fees_ada": 0.17,
+        "status": "confirmed",
+    }
+    assert (await service.verify_transaction("cd" * 32))["status"] == "not_found"
+    assert await service._get_transaction_details(TX_HASH) == {
+        "block_height": 1000, "slot": 5000, "index": 1, "fees": 0.17,
+    }
+    
+    utxos = await service._get_utxos(ADDRESS)
+    assert len(utxos) == 150  # two pages
+    assert utxos[149].input.index == 149
+    assert utxos[0].output.amount.coin == 2_000_000
+    assert utxos[0].output.amount.multi_asset == MultiAsset.from_primitive({bytes.fromhex("11" * 28): {b"aa": 5}})
@@ -0,0 +1,81 @@
+"""
+Tests for the compressed binary proof encoding.
+"""
+
+import pytest
+from py_ecc.bn128 import curve_order, field_modulus
+
+from app.services.zk_prover import ZKProverService
+from app.zk import codec
+from app.zk.curve import get_backend
+
+
+@pytest.mark.parametrize("k", [1, 2, 7, curve_order - 1, 0x9E3779B97F4A7C15 ** 3 % curve_order])
+def test_compressed_points_roundtrip(k):
+    """Test that G1 and G2 points survive compression, including both y roots."""
+    backend = get_backend()
+    g1 = backend.g1_to_ints(backend.multiply(backend.G1, k))
+    g2 = backend.g2_to_ints(backend.multiply(backend.G2, k))
+    
+    assert len(codec.compress_g1(g1)) == codec.G1_SIZE
+    assert len(codec.compress_g2(g2)) == codec.G2_SIZE
+    assert codec.decompress_g1(codec.compress_g1(g1)) == g1
+    assert codec.decompress_g2(codec.compress_g2(g2)) == g2
+
+
+def test_point_at_infinity_roundtrip():
+    """Test the infinity flag for both groups."""
+    assert codec.decompress_g1(codec.compress_g1(None)) is None
+    assert codec.decompress_g2(codec.compress_g2(None)) is None
+
+
+def test_invalid_points_rejected():
+    """Test that off-curve and out-of-range x-coordinates are rejected."""
+    with pytest.raises(ValueError):
+        codec.decompress_g1((field_modulus).to_bytes(32, "big"))
+    
+    # x = 0 gives y^2 = 3, which is not a square mod p
+    with pytest.raises(ValueError):
+        codec.decompress_g1(bytes(32))
+    
+    with pytest.raises(ValueError):
+        codec.decode_proof_points(bytes(127))
+
+
+def test_proof_bundle_roundtrip():
+    """Test that a generated proof encodes to 128 bytes and decodes to its JSON form."""
+    prover = ZKProverService()
+    witness = {"monthly_income": 5_000_000_000, "tenure_months": 12, "timestamp": 1700000000}
+    signals = [1, 1, 1, 1, 1700000000]
+    proof_data = prover._generate_groth16_proof(witness, True, signals)
+    
+    encoded = codec.encode_proof(proof_data)
+    assert len(encoded) == codec.PROOF_SIZE == 128
+    assert codec.decode_proof(encoded) == proof_data
+    
+    bundle = codec.encode_bundle(proof_data, signals)
+    assert len(bundle) == 128 + 32 * len(signals)
+    assert codec.decode_bundle(bundle) == (proof_data, signals)
+    
+    cached = prover._deserialize_cached(prover._serialize_cached({"proof_data": proof_data}))
+    assert cached["proof_data"] == proof_data
+    assert prover._verify_proof(cached["proof_data"], signals) is True
+
+
+def test_legacy_text_proofs_migrate_to_compressed_form():
+    """Test that proofs stored as snarkjs JSON text re-encode losslessly."""
+    import json
+    from app.jobs.migrate_proof_data import encode_legacy_proof
+    
+    backend = get_backend()
+    a = backend.g1_to_ints(backend.multiply(backend.G1, 5))
+    b = backend.g2_to_ints(backend.multiply(backend.G2, 6))
+    c = backend.g1_to_ints(backend.multiply(backend.G1, 7))
+    proof_data = codec.proof_data_from_points(a, b, c)
+    
+    encoded = encode_legacy_proof(json.dumps(proof_data))
+    assert len(encoded) == codec.PROOF_SIZE
+    assert codec.decode_proof(encoded) == proof_data
+    
+    with pytest.raises(ValueError):
+        encode_legacy_proof('{"pi_a": ["1"]}')
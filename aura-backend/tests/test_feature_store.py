@@ -0,0 +1,178 @@
+"""
+Tests for the per-wallet Redis feature store.
+"""
+
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.database import Base
+from app.models.loan import LoanApplication, LoanDecision, LoanStatus, LoanTransaction, RiskLevel
+from app.services.agents import AuraAgent
+from app.services.feature_store import WALLET_FEATURES, feature_store, install
+from app.services.model_registry import LoadedModel, ModelRegistry
+
+
+@compiles(UUID, "sqlite")
+def _uuid_on_sqlite(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+class _CapturingSession(Session):
+    """Listeners go on a subclass so other tests' sessions are untouched."""
+
+
+@pytest.fixture
+def session_maker():
+    install(_CapturingSession)
+    engine = create_engine("sqlite://")
+    tables = [model.__table__ for model in (LoanApplication, LoanDecision, LoanTransaction)]
+    Base.metadata.create_all(engine, tables=tables)
+    yield sessionmaker(engine, class_=_CapturingSession, expire_on_commit=False)
+    engine.dispose()
+
+
+def _wallet() -> str:
+    return f"addr_test1{uuid4().hex}{uuid4().hex}"
+
+
+def _application(wallet: str, amount: float) -> LoanApplication:
+    return LoanApplication(
+        id=uuid4(),
+        wallet_address=wallet,
+        ipfs_cid="bafy",
+        data_hash="0" * 64,
+        encryption_nonce="0" * 24,
+        requested_amount=amount,
+        tenure_months=12,
+    )
+
+
+def _decision(application: LoanApplication, risk_score: float, approved: bool) -> LoanDecision:
+    return LoanDecision(
+        application_id=application.id,
+        risk_score=risk_score,
+        risk_level=RiskLevel.LOW,
+        aura_recommendation="approve",
+        aura_confidence=0.9,
+        is_approved=approved,
+        aura_model_version="aura-risk-v2.3.1",
+        lender_model_version="lender-v1.5.0",
+    )
+
+
+def _transaction(application: LoanApplication, amount: float) -> LoanTransaction:
+    return LoanTransaction(
+        application_id=application.id,
+        tx_hash=uuid4().hex,
+        from_address="addr_lender",
+        to_address=application.wallet_address,
+        amount_ada=amount,
+        amount_lovelace=int(amount * 1_000_000),
+        network="preprod",
+    )
+
+
+@pytest.mark.asyncio
+async def test_commits_update_wallet_features(session_maker):
+    """Test that committed row changes are folded into the wallet's hash incrementally."""
+    wallet = _wallet()
+    first, second = _application(wallet, 1000.0), _application(wallet, 3000.0)
+    
+    with session_maker() as session:
+        session.add_all([first, second])
+        session.flush()
+        session.add_all([_decision(first, 10.0, True), _decision(second, 30.0, False)])
+        session.commit()
+    
+    # The application is not in this session, so its wallet comes from the index
+    with session_maker() as session:
+        session.add(_transaction(first, 1000.0))
+        session.commit()
+    
+    with session_maker() as session:
+        application = session.get(LoanApplication, first.id)
+        application.status = LoanStatus.DEFAULTED
+        session.commit()
+    await feature_store.flush()
+    
+    [totals] = await feature_store.get_many([wallet])
+    assert totals["applications_total"] == 2
+    assert totals["requested_amount_total"] == 4000.0
+    assert totals["decisions_total"] == 2
+    assert totals["approvals_total"] == 1
+    assert totals["transacted_ada_total"] == 1000.0
+    assert totals["loans_defaulted"] == 1
+    
+    [vector] = await feature_store.vectors([wallet], now=totals["last_application_at"])
+    features = dict(zip(WALLET_FEATURES, vector))
+    assert features["approval_rate"] == 0.5
+    assert features["mean_risk_score"] == 20.0
+    assert features["transactions_total"] == 1
+    assert features["days_since_last_application"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_changes_are_not_applied(session_maker):
+    """Test that rows flushed and then rolled back leave no trace in the store."""
+    wallet = _wallet()
+    with session_maker() as session:
+        session.add(_application(wallet, 1000.0))
+        session.flush()
+        session.rollback()
+    await feature_store.flush()
+    
+    assert await feature_store.get_many([wallet]) == [{}]
+    assert not (await feature_store.vectors([wallet])).any()
+
+
+@pytest.mark.asyncio
+async def test_wallet_model_gets_history(monkeypatch, session_maker):
+    """Test that a model trained with wallet features scores applicants by their history."""
+    width = len(AuraAgent.WALLET_MODEL_FEATURES)
+    rng = np.random.default_rng(0)
+    features = rng.random((300, width))
+    # Adverse outcome driven by the wallet's default count
+    features[:, AuraAgent.WALLET_MODEL_FEATURES.index("loans_defaulted")] *= 4
+    labels = (features[:, AuraAgent.WALLET_MODEL_FEATURES.index("loans_defaulted")] > 2).astype(int)
+    registry = ModelRegistry("aura")
+    registry.swap(LoadedModel("aura-wallet-v1", LogisticRegression().fit(features, labels), "memory"))
+    monkeypatch.setattr(AuraAgent, "models", registry)
+    
+    wallet = _wallet()
+    with session_maker() as session:
+        for _ in range(3):
+            application = _application(wallet, 1000.0)
+            session.add(application)
+            session.flush()
+            application.status = LoanStatus.DEFAULTED
+            session.flush()
+        session.commit()
+    await feature_store.flush()
+    
+    application = dict(
+        proof_valid=True,
+        income_sufficient=True,
+        dti_acceptable=True,
+        no_compliance_flags=True,
+        requested_amount=2000.0,
+        tenure_months=12,
+        monthly_income=5000.0,
+        existing_debt=1000.0,
+    )
+    known = await AuraAgent.assess_risk(**application, wallet_address=wallet)
+    new = await AuraAgent.assess_risk(**application)
+    batch = await AuraAgent.assess_risk_batch(
+        **{name: [value, value] for name, value in application.items()},
+        wallet_address=[wallet, _wallet()],
+    )
+    
+    assert known["scoring"] == new["scoring"] == "model"
+    assert known["risk_score"] > new["risk_score"]
+    assert [r["risk_score"] for r in batch] == [known["risk_score"], new["risk_score"]]
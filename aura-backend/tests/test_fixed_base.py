@@ -0,0 +1,102 @@
+"""
+Tests for fixed-base scalar multiplication tables.
+"""
+
+import pytest
+from py_ecc.bn128 import G1, G2, curve_order, multiply
+
+from app.zk.curve import AffineBackend, get_backend
+from app.zk import fixed_base
+from app.zk.fixed_base import FixedBaseTable, MappedFixedBaseTable, g1_table
+
+
+@pytest.mark.parametrize("scalar", [0, 1, 2, 31, 32, 2**128 - 1, curve_order - 1, curve_order + 5])
+def test_g1_table_matches_multiply(scalar):
+    """Test that G1 table lookups are bit-identical to double-and-add."""
+    table = g1_table()
+    expected = AffineBackend().g1_to_ints(multiply(G1, scalar % curve_order))
+    
+    assert table.backend.g1_to_ints(table.multiply(scalar)) == expected
+
+
+@pytest.mark.parametrize("backend_name", ["affine", "projective"])
+def test_g2_table_matches_multiply(backend_name):
+    """Test that G2 table lookups are bit-identical to double-and-add on every backend."""
+    backend = get_backend(backend_name)
+    table = FixedBaseTable(backend.G2, window_bits=4, scalar_bits=130, backend=backend)
+    scalar = 0x1234_5678_9ABC_DEF0_0FED_CBA9_8765_4321
+    
+    expected = AffineBackend().g2_to_ints(multiply(G2, scalar))
+    assert backend.g2_to_ints(table.multiply(scalar)) == expected
+
+
+def test_table_rejects_out_of_range_scalar():
+    """Test that scalars wider than the table are rejected."""
+    table = FixedBaseTable(get_backend().G1, window_bits=4, scalar_bits=8)
+    
+    with pytest.raises(ValueError):
+        table.multiply(1 << 9)
+
+
+@pytest.mark.parametrize("backend_name", ["affine", "projective"])
+def test_published_tables_match_multiply(backend_name, tmp_path, monkeypatch):
+    """Test that mapped tables give the same points as the in-memory ones."""
+    monkeypatch.setattr(fixed_base.settings, "ZK_PRECOMPUTE_DIR", str(tmp_path))
+    monkeypatch.setattr(fixed_base.settings, "ZK_FIXED_BASE_WINDOW", 4)
+    monkeypatch.setattr(fixed_base.settings, "ZK_CURVE_BACKEND", backend_name)
+    try:
+        paths = fixed_base.publish_tables()
+        assert len(paths) == 2
+        mtimes = [p.stat().st_mtime_ns for p in sorted(tmp_path.glob("*.table"))]
+        
+        # A second worker finds the files in place and leaves them alone
+        assert fixed_base.publish_tables() == paths
+        assert [p.stat().st_mtime_ns for p in sorted(tmp_path.glob("*.table"))] == mtimes
+        
+        g1, g2 = fixed_base.g1_table(), fixed_base.g2_table()
+        assert isinstance(g1, MappedFixedBaseTable) and isinstance(g2, MappedFixedBaseTable)
+        
+        scalar = curve_order - 12345
+        affine = AffineBackend()
+        assert g1.backend.g1_to_ints(g1.multiply(scalar)) == affine.g1_to_ints(multiply(G1, scalar))
+        assert g2.backend.g2_to_ints(g2.multiply(scalar)) == affine.g2_to_ints(multiply(G2, scalar))
+    finally:
+        fixed_base.g1_table.cache_clear()
+        fixed_base.g2_table.cache_clear()
+
+
+def test_mapped_table_rejects_other_window(tmp_path):
+    """Test that a table published with another window size is not mapped."""
+    path = tmp_path / "g1.table"
+    path.write_bytes(FixedBaseTable(get_backend().G1, window_bits=3, scalar_bits=16).to_bytes(1))
+    
+    with pytest.raises(ValueError):
+        MappedFixedBaseTable(str(path), 1, window_bits=4)
+    assert MappedFixedBaseTable(str(path), 1, window_bits=3).num_windows == 6
+
+
+def test_mapped_table_rejects_other_base(tmp_path):
+    """Test that a table for anything but the generator is not mapped."""
+    backend = get_backend()
+    path = tmp_path / "g1.table"
+    path.write_bytes(FixedBaseTable(backend.double(backend.G1), window_bits=3, scalar_bits=16).to_bytes(1))
+    
+    with pytest.raises(ValueError):
+        MappedFixedBaseTable(str(path), 1, window_bits=3)
+
+
+def test_shared_tables_need_a_private_directory(tmp_path, monkeypatch):
+    """Test that tables in a directory other users can write are neither published nor mapped."""
+    shared = tmp_path / "shared"
+    monkeypatch.setattr(fixed_base.settings, "ZK_PRECOMPUTE_DIR", str(shared))
+    monkeypatch.setattr(fixed_base.settings, "ZK_FIXED_BASE_WINDOW", 4)
+    try:
+        assert len(fixed_base.publish_tables()) == 2
+        assert shared.stat().st_mode & 0o777 == 0o700
+        
+        shared.chmod(0o777)
+        assert fixed_base.publish_tables() == []
+        assert not isinstance(fixed_base.g1_table(), MappedFixedBaseTable)
+    finally:
+        fixed_base.g1_table.cache_clear()
+        fixed_base.g2_table.cache_clear()
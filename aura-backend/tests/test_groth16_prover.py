@@ -0,0 +1,210 @@
+"""
+Tests for NTT-based Groth16 proving against an R1CS circuit and zkey.
+"""
+
+import struct
+
+import numpy as np
+import pytest
+from py_ecc.bn128 import curve_order as R, field_modulus
+
+from app.services.zk_prover import ZKProverService
+from app.zk import keystore
+from app.zk.curve import get_backend
+from app.zk.keystore import ProvingKey
+from app.zk.ntt import domain_for, get_domain
+from app.zk.prover import Groth16Prover
+from app.zk.r1cs import R1CS
+from app.zk.verifier import Groth16Verifier
+
+
+def _mul_add_circuit() -> R1CS:
+    # out = x * y + 5 with wires [1, out, x, y, z]
+    return R1CS(
+        n_wires=5, n_pub_out=1, n_pub_in=0, n_prv_in=2,
+        constraints=[
+            ({2: 1}, {3: 1}, {4: 1}),
+            ({4: 1, 0: 5}, {0: 1}, {1: 1}),
+        ],
+    )
+
+
+def _mont(x: int) -> bytes:
+    return (x * (1 << 256) % field_modulus).to_bytes(32, "little")
+
+
+def _write_test_zkey(path, circuit: R1CS, tau=11, alpha=3, beta=5, gamma=7, delta=13):
+    """Groth16 setup for `circuit` with a known toxic waste, in zkey layout."""
+    backend = get_backend()
+    domain = domain_for(circuit.n_constraints + circuit.n_public + 1)
+    n = domain.size
+    inv = lambda x: pow(x % R, -1, R)
+    
+    def g1(k):
+        return backend.g1_to_ints(backend.multiply(backend.G1, k % R))
+    
+    def g2(k):
+        return backend.g2_to_ints(backend.multiply(backend.G2, k % R))
+    
+    def enc_g1(p):
+        return _mont(p[0]) + _mont(p[1]) if p else bytes(64)
+    
+    def enc_g2(p):
+        return _mont(p[0][0]) + _mont(p[0][1]) + _mont(p[1][0]) + _mont(p[1][1]) if p else bytes(128)
+    
+    # Lagrange basis on the domain at tau
+    z_tau = pow(tau, n, R) - 1
+    lagrange = [pow(domain.omega, k, R) * z_tau * inv(n * (tau - pow(domain.omega, k, R))) % R for k in range(n)]
+    
+    u = [0] * circuit.n_wires
+    v = [0] * circuit.n_wires
+    w = [0] * circuit.n_wires
+    for k in range(circuit.n_constraints):
+        for wire, coeff in circuit.A.row(k).items():
+            u[wire] += coeff * lagrange[k]
+        for wire, coeff in circuit.B.row(k).items():
+            v[wire] += coeff * lagrange[k]
+        for wire, coeff in circuit.C.row(k).items():
+            w[wire] += coeff * lagrange[k]
+    for i in range(circuit.n_public + 1):
+        u[i] += lagrange[circuit.n_constraints + i]
+    
+    n_pub = circuit.n_public
+    combined = [beta * u[i] + alpha * v[i] + w[i] for i in range(circuit.n_wires)]
+    
+    # H points on the odd coset x_j = c * omega^j with c^n = -1
+    c = get_domain(2 * n).omega
+    h_points = []
+    for j in range(n):
+        x = c * pow(domain.omega, j, R) % R
+        coset_lagrange = -(pow(tau, n, R) + 1) * x * inv(n * (tau - x))
+        h_points.append(g1(coset_lagrange * z_tau * inv(-2 * delta)))
+    
+    header = (
+        struct.pack("<I", 32) + field_modulus.to_bytes(32, "little")
+        + struct.pack("<I", 32) + R.to_bytes(32, "little")
+        + struct.pack("<III", circuit.n_wires, n_pub, n)
+        + enc_g1(g1(alpha)) + enc_g1(g1(beta)) + enc_g2(g2(beta)) + enc_g2(g2(gamma))
+        + enc_g1(g1(delta)) + enc_g2(g2(delta))
+    )
+    sections = [
+        (keystore.SECTION_HEADER, struct.pack("<I", keystore.GROTH16_PROTOCOL)),
+        (keystore.SECTION_GROTH16_HEADER, header),
+        (keystore.SECTION_IC, b"".join(enc_g1(g1(combined[i] * inv(gamma))) for i in range(n_pub + 1))),
+        (keystore.SECTION_A, b"".join(enc_g1(g1(x)) for x in u)),
+        (keystore.SECTION_B1, b"".join(enc_g1(g1(x)) for x in v)),
+        (keystore.SECTION_B2, b"".join(enc_g2(g2(x)) for x in v)),
+        (keystore.SECTION_C, b"".join(enc_g1(g1(combined[i] * inv(delta))) for i in range(n_pub + 1, circuit.n_wires))),
+        (keystore.SECTION_H, b"".join(enc_g1(p) for p in h_points)),
+    ]
+    with open(path, "wb") as f:
+        f.write(b"zkey" + struct.pack("<II", 1, len(sections)))
+        for section_id, data in sections:
+            f.write(struct.pack("<IQ", section_id, len(data)) + data)
+
+
+def test_quotient_vanishes_off_the_witness():
+    """Test that A*B - C is zero on the domain only for a satisfying witness."""
+    circuit = _mul_add_circuit()
+    witness = circuit.solve_batch(np.array([[3, 4]], dtype=object))[0].tolist()
+    
+    class _Header:
+        n_vars, n_public, domain_size = 5, 1, 4
+    
+    class _Key:
+        header = _Header()
+    
+    prover = Groth16Prover(circuit, _Key())
+    evaluations = prover.constraint_evaluations(witness)
+    a, b, c = evaluations
+    assert ((a * b - c) % R).tolist() == [0, 0, 0, 0]
+    
+    # On the odd coset the quotient is h(x) * Z(x) with Z = -2
+    odd = prover.quotient_evaluations(evaluations)
+    h = prover.domain.coset_intt(odd * pow(-2, -1, R) % R, prover.odd_shift)
+    assert h.tolist()[3:] == [0]
+    
+    witness[4] += 1
+    a, b, c = prover.constraint_evaluations(witness)
+    assert ((a * b - c) % R).tolist() != [0, 0, 0, 0]
+
+
+@pytest.mark.parametrize("blinding", [(0, 0), (1234567, 7654321)])
+def test_prover_produces_verifying_proof(tmp_path, blinding):
+    """Test that a proof from the zkey prover passes the pairing check."""
+    circuit = _mul_add_circuit()
+    path = tmp_path / "circuit.zkey"
+    _write_test_zkey(path, circuit)
+    pk = ProvingKey(str(path))
+    
+    prover = Groth16Prover(circuit, pk)
+    witness = circuit.solve_batch(np.array([[3, 4]], dtype=object))[0].tolist()
+    a, b, c = prover.prove(witness, *blinding)
+    
+    backend = get_backend()
+    verifier = Groth16Verifier(pk.verification_key(), backend)
+    proof = (backend.g1_from_ints(*a), backend.g2_from_ints(*b), backend.g1_from_ints(*c))
+    assert verifier.verify(proof, [17]) is True
+    assert verifier.verify(proof, [18]) is False
+    pk.close()
+
+
+def test_service_uses_deployed_circuit_and_key(tmp_path, monkeypatch):
+    """Test that the prover service proves with a deployed circuit and zkey."""
+    from app.zk.r1cs import dump_r1cs
+    from tests.test_r1cs import _layout_circuit
+    
+    circuit = _layout_circuit()
+    (tmp_path / "eligibility.r1cs").write_bytes(dump_r1cs(circuit))
+    _write_test_zkey(tmp_path / "eligibility.zkey", circuit)
+    monkeypatch.setattr(keystore.settings, "ZK_CIRCUIT_PATH", str(tmp_path / "eligibility.r1cs"))
+    monkeypatch.setattr(keystore.settings, "ZK_PROVING_KEY_PATH", str(tmp_path / "eligibility.zkey"))
+    monkeypatch.setattr(keystore.settings, "ZK_VERIFICATION_KEY_PATH", str(tmp_path / "missing.json"))
+    keystore.key_store.close()
+    
+    try:
+        prover = ZKProverService()
+        witness = {
+            "monthly_income": 5, "existing_debt": 1, "requested_amount": 2,
+            "tenure_months": 12, "compliance_flag": 0,
+        }
+        signals = [1, 1, 1, 1, 1700000000]
+        proof_data = prover._generate_groth16_proof(witness, True, signals)
+        
+        assert prover._circuit_prover() is ZKProverService()._circuit_prover()
+        assert prover._verifier().vk.source.endswith("eligibility.zkey")
+        assert prover._verify_proof(proof_data, signals) is True
+        assert prover._verify_proof(proof_data, [1, 1, 1, 1, 1700000001]) is False
+    finally:
+        keystore.key_store.close()
+
+
+def test_service_refuses_circuit_it_cannot_solve(tmp_path, monkeypatch):
+    """Test that a deployed key with a hint-based circuit is refused, not proved or simulated."""
+    from app.zk.r1cs import dump_r1cs
+    from app.zk.setup import SetupUnavailable
+    
+    # The compliance flag is pinned to a bit through a hint-style internal wire
+    circuit = R1CS(
+        n_wires=12, n_pub_out=4, n_pub_in=1, n_prv_in=5,
+        constraints=[
+            ({0: 1}, {0: 1}, {1: 1}),
+            ({0: 1}, {0: 1}, {2: 1}),
+            ({0: 1}, {0: 1}, {3: 1}),
+            ({0: 1}, {0: 1}, {4: 1}),
+            ({11: 1}, {11: 1, 0: R - 1}, {}),
+        ],
+    )
+    (tmp_path / "eligibility.r1cs").write_bytes(dump_r1cs(circuit))
+    monkeypatch.setattr(keystore.settings, "ZK_CIRCUIT_PATH", str(tmp_path / "eligibility.r1cs"))
+    keystore.key_store.close()
+    
+    try:
+        witness = {
+            "monthly_income": 5, "existing_debt": 1, "requested_amount": 2,
+            "tenure_months": 12, "compliance_flag": 0,
+        }
+        with pytest.raises(SetupUnavailable):
+            ZKProverService()._generate_groth16_proof(witness, True, [1, 1, 1, 1, 1700000000])
+    finally:
+        keystore.key_store.close()
@@ -0,0 +1,105 @@
+"""
+Tests for the memory-mapped key store.
+"""
+
+import struct
+
+import pytest
+from py_ecc.bn128 import curve_order, field_modulus
+
+from app.services.zk_prover import ZKProverService
+from app.zk import keystore
+from app.zk.keystore import KeyStore, ProvingKey
+from app.zk.setup import development_setup
+
+
+def _mont(x: int) -> bytes:
+    return (x * (1 << 256) % field_modulus).to_bytes(32, "little")
+
+
+def _g1(point) -> bytes:
+    return _mont(point[0]) + _mont(point[1])
+
+
+def _g2(point) -> bytes:
+    (x0, x1), (y0, y1) = point
+    return _mont(x0) + _mont(x1) + _mont(y0) + _mont(y1)
+
+
+def _write_zkey(path, vk, a_query):
+    """Write a minimal snarkjs-layout Groth16 zkey for `vk`."""
+    header = (
+        struct.pack("<I", 32) + field_modulus.to_bytes(32, "little")
+        + struct.pack("<I", 32) + curve_order.to_bytes(32, "little")
+        + struct.pack("<III", len(a_query), vk.num_public_inputs, 8)
+        + _g1(vk.alpha_1) + _g1(vk.alpha_1) + _g2(vk.beta_2) + _g2(vk.gamma_2)
+        + _g1(vk.alpha_1) + _g2(vk.delta_2)
+    )
+    sections = [
+        (keystore.SECTION_HEADER, struct.pack("<I", keystore.GROTH16_PROTOCOL)),
+        (keystore.SECTION_GROTH16_HEADER, header),
+        (keystore.SECTION_IC, b"".join(_g1(p) for p in vk.ic)),
+        (keystore.SECTION_A, b"".join(_g1(p) if p else bytes(64) for p in a_query)),
+    ]
+    with open(path, "wb") as f:
+        f.write(b"zkey" + struct.pack("<II", 1, len(sections)))
+        for section_id, data in sections:
+            f.write(struct.pack("<IQ", section_id, len(data)) + data)
+
+
+@pytest.fixture
+def dev_vk():
+    return development_setup(
+        ZKProverService.CIRCUIT_ID, ZKProverService.CIRCUIT_VERSION, ZKProverService.NUM_PUBLIC_INPUTS
+    ).verification_key()
+
+
+def test_proving_key_decodes_lazily(tmp_path, dev_vk):
+    """Test that sections decode on access and match the written points."""
+    path = tmp_path / "circuit.zkey"
+    _write_zkey(path, dev_vk, [dev_vk.ic[1], None, dev_vk.alpha_1])
+    
+    pk = ProvingKey(str(path))
+    assert "header" not in pk.__dict__
+    
+    assert pk.header.n_public == dev_vk.num_public_inputs
+    assert pk.header.beta_2 == dev_vk.beta_2
+    assert list(pk.a_query) == [dev_vk.ic[1], None, dev_vk.alpha_1]
+    assert pk.a_query[-1] == dev_vk.alpha_1
+    
+    vk = pk.verification_key()
+    assert vk.to_snarkjs() == dev_vk.to_snarkjs()
+    
+    with pytest.raises(ValueError):
+        pk.b2_query
+    pk.close()
+
+
+def test_key_store_versions_and_eviction(tmp_path, dev_vk, monkeypatch):
+    """Test versioned paths, verification key fallback order and LRU unmapping."""
+    for version in ("1.0.0", "1.1.0", "1.2.0"):
+        _write_zkey(tmp_path / f"circuit-{version}.zkey", dev_vk, [dev_vk.alpha_1])
+    monkeypatch.setattr(keystore.settings, "ZK_PROVING_KEY_PATH", str(tmp_path / "circuit-{circuit_version}.zkey"))
+    monkeypatch.setattr(keystore.settings, "ZK_VERIFICATION_KEY_PATH", str(tmp_path / "vk-{circuit_version}.json"))
+    
+    store = KeyStore(max_resident=2)
+    n = dev_vk.num_public_inputs
+    
+    vk = store.verification_key("circuit", "1.0.0", n)
+    assert vk.source.endswith("circuit-1.0.0.zkey")
+    assert store.verification_key("circuit", "1.0.0", n) is vk
+    
+    held = store.proving_key("circuit", "1.0.0")
+    store.proving_key("circuit", "1.1.0")
+    store.proving_key("circuit", "1.2.0")
+    assert store.resident() == [("circuit", "1.1.0"), ("circuit", "1.2.0")]
+    # An evicted key stays readable for whoever still holds it
+    assert list(held.a_query) == [dev_vk.alpha_1]
+    
+    # No key files deployed for this version: development key
+    assert store.verification_key("circuit", "9.9.9", n).source == "development"
+    assert store.proving_key("circuit", "9.9.9") is None
+    
+    with pytest.raises(ValueError):
+        store.verification_key("circuit", "1.2.0", n + 1)
+    store.close()
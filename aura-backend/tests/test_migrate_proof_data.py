@@ -0,0 +1,131 @@
+"""
+Tests for the TEXT to BYTEA proof_data migration, against the test database.
+"""
+
+import json
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.database import Base
+from app.jobs.migrate_proof_data import migrate
+from app.models.proof import ZKProof
+from app.zk import codec
+from app.zk.curve import get_backend
+from tests.conftest import TEST_DATABASE_URL
+
+INSERT_APPLICATION = text(
+    "INSERT INTO loan_applications "
+    "(id, wallet_address, ipfs_cid, data_hash, encryption_nonce, requested_amount, tenure_months, status, "
+    "created_at, updated_at) "
+    "VALUES (:id, 'addr_test1', 'Qm', 'hash', 'nonce', 2000, 12, 'PENDING', now(), now())"
+)
+INSERT_LEGACY_PROOF = text(
+    "INSERT INTO zk_proofs "
+    "(id, application_id, proof_hash, proof_data, public_signals, is_valid, income_sufficient, dti_acceptable, "
+    "no_compliance_flags, circuit_id, circuit_version, proving_scheme, curve, num_constraints, num_public_inputs, "
+    "num_private_inputs, proving_time_ms, proof_size_bytes, generated_at) "
+    "VALUES (:id, :application_id, :proof_hash, :proof_data, '[1, 1, 1, 1, 1700000000]', true, true, true, true, "
+    "'loan_eligibility', '1.0.0', 'groth16', 'bn254', 1024, 5, 5, 100, :size, now())"
+)
+COLUMN_TYPE = text(
+    "SELECT data_type FROM information_schema.columns "
+    "WHERE table_name = 'zk_proofs' AND column_name = 'proof_data'"
+)
+
+
+def _legacy_proof(k: int) -> dict:
+    backend = get_backend()
+    return codec.proof_data_from_points(
+        backend.g1_to_ints(backend.multiply(backend.G1, k)),
+        backend.g2_to_ints(backend.multiply(backend.G2, k + 1)),
+        backend.g1_to_ints(backend.multiply(backend.G1, k + 2)),
+    )
+
+
+@pytest_asyncio.fixture
+async def legacy_db():
+    """The current schema with zk_proofs.proof_data as the old TEXT column."""
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+    except OSError:
+        await engine.dispose()
+        pytest.skip("Postgres test database not available")
+    
+    async with engine.begin() as conn:
+        await conn.execute(text("ALTER TABLE zk_proofs DROP COLUMN proof_data"))
+        await conn.execute(text("ALTER TABLE zk_proofs ADD COLUMN proof_data TEXT NOT NULL"))
+    yield engine
+    
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+async def _insert_proofs(engine, proofs) -> list:
+    ids = []
+    async with engine.begin() as conn:
+        for proof_data in proofs:
+            application_id, proof_id = uuid4(), uuid4()
+            await conn.execute(INSERT_APPLICATION, {"id": application_id})
+            value = proof_data if isinstance(proof_data, str) else json.dumps(proof_data)
+            await conn.execute(INSERT_LEGACY_PROOF, {
+                "id": proof_id,
+                "application_id": application_id,
+                "proof_hash": uuid4().hex * 2,
+                "proof_data": value,
+                "size": len(value),
+            })
+            ids.append(proof_id)
+    return ids
+
+
+async def _column_type(engine) -> str:
+    async with engine.connect() as conn:
+        return (await conn.execute(COLUMN_TYPE)).scalar()
+
+
+@pytest.mark.asyncio
+async def test_existing_rows_round_trip_through_the_migration(legacy_db):
+    """Test that TEXT proofs come out as BYTEA rows the ORM decodes to the same proof."""
+    proofs = [_legacy_proof(k) for k in (5, 11, 17)]
+    ids = await _insert_proofs(legacy_db, proofs)
+    
+    assert await migrate(bind=legacy_db, dry_run=True) == {"status": "dry_run", "rows": 3}
+    assert await _column_type(legacy_db) == "text"
+    
+    # Chunks smaller than the table exercise the keyset paging
+    assert await migrate(bind=legacy_db, chunk_size=2) == {"status": "migrated", "rows": 3}
+    assert await _column_type(legacy_db) == "bytea"
+    
+    async with legacy_db.connect() as conn:
+        rows = {row.id: row for row in (await conn.execute(select(ZKProof))).all()}
+    for proof_id, proof_data in zip(ids, proofs):
+        row = rows[proof_id]
+        assert codec.decode_proof(row.proof_data) == proof_data
+        assert row.proof_size_bytes == len(row.proof_data) == codec.PROOF_SIZE
+    
+    assert await migrate(bind=legacy_db) == {"status": "already_migrated"}
+
+
+@pytest.mark.asyncio
+async def test_unparseable_row_leaves_the_table_unchanged(legacy_db):
+    """Test that one bad row aborts the whole migration."""
+    await _insert_proofs(legacy_db, [_legacy_proof(5), '{"pi_a": ["1"]}'])
+    
+    with pytest.raises(ValueError, match="zk_proofs row"):
+        await migrate(bind=legacy_db)
+    assert await _column_type(legacy_db) == "text"
+    async with legacy_db.connect() as conn:
+        columns = (await conn.execute(text(
+            "SELECT count(*) FROM information_schema.columns WHERE table_name = 'zk_proofs'"
+            " AND column_name = 'proof_data_compressed'"
+        ))).scalar()
+    assert columns == 0
@@ -0,0 +1,159 @@
+"""
+Tests for hot-swapping and shadow-scoring agent models.
+"""
+
+import asyncio
+from uuid import uuid4
+
+import joblib
+import numpy as np
+import pytest
+import pytest_asyncio
+from redis.exceptions import RedisError
+from sklearn.linear_model import LogisticRegression
+
+from app.core.redis import redis_client
+from app.services.agents import AuraAgent
+from app.services.model_registry import ModelRegistry
+from app.services.underwriting import loan_decision_record, underwriting_pipeline
+
+APPLICATION = dict(
+    proof_valid=True,
+    income_sufficient=True,
+    dti_acceptable=True,
+    no_compliance_flags=True,
+    requested_amount=2000.0,
+    tenure_months=12,
+    monthly_income=5000.0,
+    existing_debt=1000.0,
+)
+
+
+def _dump_model(path, seed: int) -> str:
+    rng = np.random.default_rng(seed)
+    features = rng.random((200, len(AuraAgent.FEATURES)))
+    labels = (features[:, seed % 7] > 0.5).astype(int)
+    joblib.dump(LogisticRegression().fit(features, labels), path)
+    return str(path)
+
+
+@pytest_asyncio.fixture
+async def registry(monkeypatch):
+    registry = ModelRegistry("aura")
+    registry.state_key = f"model_registry:test:{uuid4()}"
+    monkeypatch.setattr(AuraAgent, "models", registry)
+    yield registry
+    await redis_client.delete(registry.state_key)
+
+
+@pytest.mark.asyncio
+async def test_swap_under_load_drops_no_requests(registry, tmp_path):
+    """Test that activating a new version mid-traffic leaves every request answered."""
+    await registry.activate(_dump_model(tmp_path / "v1.joblib", 1), "aura-risk-v1")
+    
+    async def swap():
+        await asyncio.sleep(0)
+        await registry.activate(_dump_model(tmp_path / "v2.joblib", 2), "aura-risk-v2")
+    
+    results, _ = await asyncio.gather(
+        asyncio.gather(*(AuraAgent.assess_risk(**APPLICATION) for _ in range(200))),
+        swap(),
+    )
+    
+    assert all(r["scoring"] == "model" for r in results)
+    assert {r["model_version"] for r in results} <= {"aura-risk-v1", "aura-risk-v2"}
+    after = await AuraAgent.assess_risk(**APPLICATION)
+    assert after["model_version"] == "aura-risk-v2"
+
+
+@pytest.mark.asyncio
+async def test_candidate_is_shadow_scored_then_promoted(registry, tmp_path):
+    """Test that a candidate sees live traffic in shadow only, until promoted."""
+    await registry.activate(_dump_model(tmp_path / "v1.joblib", 1), "aura-risk-v1")
+    await registry.set_candidate(_dump_model(tmp_path / "v2.joblib", 2), "aura-risk-v2", shadow_fraction=1.0)
+    
+    results = [await AuraAgent.assess_risk(**APPLICATION) for _ in range(5)]
+    await AuraAgent.assess_risk_batch(**{k: [v] * 10 for k, v in APPLICATION.items()})
+    await asyncio.gather(*registry._shadow_tasks)
+    
+    assert {r["model_version"] for r in results} == {"aura-risk-v1"}
+    shadow = registry.status()["shadow"]
+    assert shadow["rows"] == 15 and shadow["errors"] == 0
+    assert shadow["mean_abs_delta"] > 0
+    
+    await registry.promote()
+    assert registry.candidate is None
+    assert (await AuraAgent.assess_risk(**APPLICATION))["model_version"] == "aura-risk-v2"
+
+
+@pytest.mark.asyncio
+async def test_rollouts_reach_every_worker(registry, tmp_path):
+    """Test that another worker's registry follows loads, promotions and discards."""
+    other = ModelRegistry("aura")
+    other.state_key = registry.state_key
+    assert not await other.sync()
+    
+    await registry.roll_out(_dump_model(tmp_path / "v1.joblib", 1), "aura-risk-v1")
+    assert await other.sync()
+    assert other.active.version == "aura-risk-v1" and other.revision == registry.revision
+    assert not await other.sync()
+    
+    await registry.set_candidate(_dump_model(tmp_path / "v2.joblib", 2), "aura-risk-v2", shadow_fraction=0.5)
+    await other.sync()
+    assert (other.candidate.version, other.shadow_fraction) == ("aura-risk-v2", 0.5)
+    
+    candidate = other.candidate
+    await registry.promote()
+    await other.sync()
+    assert other.active is candidate and other.candidate is None
+    
+    await registry.set_candidate(_dump_model(tmp_path / "v3.joblib", 3), "aura-risk-v3", shadow_fraction=0.1)
+    await registry.discard_candidate()
+    await other.sync()
+    assert other.candidate is None and other.active.version == "aura-risk-v2"
+    assert other.status()["revision"] == registry.status()["revision"]
+
+
+@pytest.mark.asyncio
+async def test_unpublished_rollout_changes_nothing(registry, tmp_path, monkeypatch):
+    """Test that a rollout Redis cannot record is not applied locally either."""
+    await registry.activate(_dump_model(tmp_path / "v1.joblib", 1), "aura-risk-v1")
+    
+    async def unavailable(*args, **kwargs):
+        raise RedisError("connection refused")
+    
+    monkeypatch.setattr(redis_client, "set", unavailable)
+    with pytest.raises(RedisError):
+        await registry.roll_out(_dump_model(tmp_path / "v2.joblib", 2), "aura-risk-v2")
+    assert registry.active.version == "aura-risk-v1"
+
+
+@pytest.mark.asyncio
+async def test_failed_load_keeps_active_version(registry, tmp_path):
+    """Test that a version that cannot be loaded never replaces the active one."""
+    await registry.activate(_dump_model(tmp_path / "v1.joblib", 1), "aura-risk-v1")
+    broken = tmp_path / "broken.joblib"
+    broken.write_bytes(b"not a model")
+    
+    with pytest.raises(Exception):
+        await registry.activate(str(broken), "aura-risk-v2")
+    with pytest.raises(ValueError):
+        await registry.activate(str(broken), "x" * 33)
+    assert registry.active.version == "aura-risk-v1"
+
+
+@pytest.mark.asyncio
+async def test_decision_record_carries_model_versions(registry, tmp_path):
+    """Test that LoanDecision rows name the versions that scored the application."""
+    await registry.activate(_dump_model(tmp_path / "v3.joblib", 3), "aura-risk-v3")
+    result = await underwriting_pipeline.run(
+        monthly_income=5000.0,
+        existing_debt=1000.0,
+        requested_amount=2000.0,
+        tenure_months=12,
+    )
+    
+    record = loan_decision_record(uuid4(), result["aura_assessment"], result["lender_decision"])
+    assert record.aura_model_version == "aura-risk-v3"
+    assert record.lender_model_version == result["lender_decision"]["model_version"]
+    assert record.is_approved == result["lender_decision"]["is_approved"]
@@ -0,0 +1,54 @@
+"""
+Tests for Pippenger multi-scalar multiplication.
+"""
+
+import pytest
+from py_ecc.bn128 import curve_order
+
+from app.zk.curve import get_backend
+from app.zk.msm import msm, optimal_window
+
+
+def _naive(backend, points, scalars):
+    acc = backend.identity_like(points[0])
+    for p, k in zip(points, scalars):
+        acc = backend.add(acc, backend.multiply(p, k % curve_order))
+    return acc
+
+
+@pytest.mark.parametrize("n", [1, 5, 40])
+def test_msm_matches_naive_g1(n):
+    """Test that G1 MSM equals the sum of individual multiplications."""
+    backend = get_backend()
+    points = [backend.multiply(backend.G1, i + 2) for i in range(n)]
+    scalars = [(i * 0x9E3779B97F4A7C15 + 7) ** 3 % curve_order for i in range(n)]
+    
+    assert backend.g1_to_ints(msm(points, scalars, backend)) == backend.g1_to_ints(
+        _naive(backend, points, scalars)
+    )
+
+
+def test_msm_matches_naive_g2_with_zero_and_small_scalars():
+    """Test G2 MSM with zero, one and timestamp-sized scalars."""
+    backend = get_backend()
+    points = [backend.multiply(backend.G2, i + 3) for i in range(5)]
+    scalars = [0, 1, 1, 0, 1700000000]
+    
+    assert backend.g2_to_ints(msm(points, scalars, backend)) == backend.g2_to_ints(
+        _naive(backend, points, scalars)
+    )
+
+
+def test_msm_all_zero_scalars_is_identity():
+    """Test that an MSM with only zero scalars returns the identity."""
+    backend = get_backend()
+    
+    assert backend.is_zero(msm([backend.G1, backend.G1], [0, curve_order], backend))
+
+
+def test_optimal_window_grows_with_size():
+    """Test that the window width is monotone in the number of points."""
+    sizes = [1, 5, 64, 1024, 4096]
+    windows = [optimal_window(n) for n in sizes]
+    
+    assert windows == sorted(windows)
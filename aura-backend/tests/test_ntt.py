@@ -0,0 +1,64 @@
+"""
+Tests for the number-theoretic transform.
+"""
+
+import numpy as np
+import pytest
+from py_ecc.bn128 import curve_order as R
+
+from app.zk.ntt import GENERATOR, ROOT_OF_UNITY, TWO_ADICITY, domain_for, get_domain
+
+
+def _coefficients(n, seed=1):
+    return [(seed * 0x9E3779B97F4A7C15 + i) ** 5 % R for i in range(n)]
+
+
+def _evaluate(coefficients, x):
+    return sum(c * pow(x, i, R) for i, c in enumerate(coefficients)) % R
+
+
+def test_root_of_unity_order():
+    """Test that the 2-adic root has order exactly 2^28."""
+    assert pow(ROOT_OF_UNITY, 1 << TWO_ADICITY, R) == 1
+    assert pow(ROOT_OF_UNITY, 1 << (TWO_ADICITY - 1), R) != 1
+
+
+@pytest.mark.parametrize("n", [1, 2, 8, 64])
+def test_ntt_matches_naive_evaluation(n):
+    """Test forward, inverse and coset transforms against direct evaluation."""
+    domain = get_domain(n)
+    coefficients = _coefficients(n)
+    
+    evaluations = domain.ntt(coefficients)
+    assert evaluations.tolist() == [_evaluate(coefficients, pow(domain.omega, k, R)) for k in range(n)]
+    assert domain.intt(evaluations).tolist() == coefficients
+    
+    coset = domain.coset_ntt(coefficients)
+    assert coset.tolist() == [
+        _evaluate(coefficients, GENERATOR * pow(domain.omega, k, R)) for k in range(n)
+    ]
+    assert domain.coset_intt(coset).tolist() == coefficients
+
+
+def test_batched_transform_and_polynomial_product():
+    """Test that a batch transforms row by row and NTT multiplication matches schoolbook."""
+    domain = domain_for(12)
+    assert domain.size == 16
+    
+    a = _coefficients(8, seed=2) + [0] * 8
+    b = _coefficients(8, seed=3) + [0] * 8
+    evaluations = domain.ntt(np.array([a, b], dtype=object))
+    assert evaluations[1].tolist() == domain.ntt(b).tolist()
+    
+    product = domain.intt(evaluations[0] * evaluations[1] % R).tolist()
+    expected = [0] * 16
+    for i in range(8):
+        for j in range(8):
+            expected[i + j] = (expected[i + j] + a[i] * b[j]) % R
+    assert product == expected
+
+
+def test_invalid_domain_size():
+    """Test that non power-of-two domains are rejected."""
+    with pytest.raises(ValueError):
+        get_domain(12)
@@ -75,3 +75,130 @@ async def test_generate_invalid_proof_compliance_flags():
     
     assert result["is_valid"] is False
     assert result["conditions"]["no_compliance_flags"] is False
+
+
+@pytest.mark.parametrize("backend_name", ["affine", "projective"])
+def test_curve_backends_produce_identical_proofs(backend_name, monkeypatch):
+    """Test that the curve backend does not change the proof format or points."""
+    from app.zk import curve, fixed_base
+    
+    witness = {"monthly_income": 5_000_000_000, "tenure_months": 12, "timestamp": 1700000000}
+    
+    monkeypatch.setattr(curve.settings, "ZK_CURVE_BACKEND", "affine")
+    fixed_base.g1_table.cache_clear()
+    fixed_base.g2_table.cache_clear()
+    signals = [1, 1, 1, 1, 1700000000]
+    expected = ZKProverService()._generate_groth16_proof(witness, True, signals)
+    
+    monkeypatch.setattr(curve.settings, "ZK_CURVE_BACKEND", backend_name)
+    fixed_base.g1_table.cache_clear()
+    fixed_base.g2_table.cache_clear()
+    prover = ZKProverService()
+    proof = prover._generate_groth16_proof(witness, True, signals)
+    
+    fixed_base.g1_table.cache_clear()
+    fixed_base.g2_table.cache_clear()
+    
+    assert proof == expected
+    assert prover._verify_proof(proof, signals) is True
+
+
+
+def test_incomplete_curve_backend_cannot_be_instantiated():
+    """Test that a backend missing group operations fails at construction."""
+    from app.zk.curve import AffineBackend, CurveBackend
+    
+    class PartialBackend(CurveBackend):
+        def add(self, p, q):
+            return p
+    
+    with pytest.raises(TypeError):
+        PartialBackend()
+    AffineBackend()
+
+def test_batch_witness_matches_scalar_path():
+    """Test that vectorized conditions and witnesses match the per-application path."""
+    import numpy as np
+    
+    prover = ZKProverService()
+    rows = [
+        (5000.0, 1000.0, 2000.0, 12, False),
+        (500.0, 1000.0, 5000.0, 12, False),
+        (3000.0, 10000.0, 5000.0, 12, True),
+        (0.0, 0.0, 100.0, 6, False),
+        (1234.567891, 0.1, 0.3, 7, False),
+        (1999.999999, 333.333333, 4000.0, 6, False),
+    ]
+    income, debt, amount, tenure, flags = (np.array(col) for col in zip(*rows))
+    
+    conditions = prover._compute_conditions_batch(
+        income.astype(np.float64), debt.astype(np.float64), amount.astype(np.float64), tenure, flags
+    )
+    witnesses = prover._compute_witness_batch(
+        income.astype(np.float64), debt.astype(np.float64), amount.astype(np.float64), tenure.tolist(), flags
+    )
+    
+    for i, (inc, dbt, amt, ten, flag) in enumerate(rows):
+        repayment = amt / ten
+        dti = (dbt + amt) / (inc * 12) if inc > 0 else 1.0
+        assert bool(conditions["income_sufficient"][i]) == (inc >= repayment * 3)
+        assert bool(conditions["dti_acceptable"][i]) == (dti < 0.4)
+        assert bool(conditions["no_compliance_flags"][i]) == (not flag)
+        
+        expected = prover._compute_witness(inc, dbt, amt, ten, flag)
+        expected["timestamp"] = witnesses[i]["timestamp"]
+        assert witnesses[i] == expected
+        assert all(type(v) is int for v in witnesses[i].values())
+
+
+@pytest.mark.asyncio
+async def test_generate_proofs_batch_in_submission_order():
+    """Test batch generation streams valid, cached proofs in submission order."""
+    prover = ZKProverService()
+    applications = [
+        {
+            "monthly_income": 5000.0,
+            "existing_debt": 1000.0,
+            "requested_amount": amount,
+            "tenure_months": 12,
+            "has_compliance_flags": i == 2,
+        }
+        for i, amount in enumerate([2000.0, 4000.0, 2000.0, 30000.0, 50000.0])
+    ]
+    
+    results = [r async for r in prover.generate_proofs_batch(applications)]
+    
+    assert [r["index"] for r in results] == list(range(5))
+    assert [r["is_valid"] for r in results] == [True, True, False, False, False]
+    assert results[2]["conditions"]["no_compliance_flags"] is False
+    assert prover._verify_proof_batch(
+        [(r["proof_data"], r["public_signals"]) for r in results]
+    ) == [True] * 5
+    
+    cached = await prover.get_cached_proofs([r["proof_hash"] for r in results])
+    assert [c["proof_hash"] for c in cached] == [r["proof_hash"] for r in results]
+
+
+@pytest.mark.asyncio
+async def test_generate_proof_records_phase_trace():
+    """Test that proving phases are traced and exported as histograms."""
+    import random
+    from app.services.zk_prover import PROOF_PHASE_SECONDS
+    
+    def observed(phase: str) -> float:
+        return PROOF_PHASE_SECONDS.labels(phase=phase)._sum.get()
+    
+    before = {phase: observed(phase) for phase in ("witness", "g1", "g2", "verify", "cache_write")}
+    result = await ZKProverService().generate_proof(
+        monthly_income=5000.0,
+        existing_debt=1000.0,
+        requested_amount=round(random.uniform(2000, 3000), 6),
+        tenure_months=12,
+        include_trace=True,
+    )
+    
+    trace = result["trace"]
+    assert trace["cache_hit"] is False
+    assert {"witness", "g1", "g2", "hash", "verify", "serialize", "cache_write"} <= set(trace["phases_ms"])
+    assert trace["total_ms"] >= trace["phases_ms"]["g1"]
+    assert all(observed(phase) > before[phase] for phase in before)
@@ -0,0 +1,105 @@
+"""
+Tests for the witness-digest proof result cache.
+"""
+
+import random
+
+import pytest
+from app.services import zk_prover
+from app.services.proof_cache import PROOF_CACHE_LOOKUPS, ProofResultCache, witness_digest
+from app.services.zk_prover import ZKProverService
+
+
+def _lookups(result: str) -> float:
+    return PROOF_CACHE_LOOKUPS.labels(result=result)._value.get()
+
+
+def test_digest_ignores_timestamp():
+    """Test that only the submission timestamp may differ between cache hits."""
+    witness = {"monthly_income": 5_000_000_000, "tenure_months": 12, "timestamp": 1700000000}
+    retry = dict(witness, timestamp=1700000042)
+    other = dict(witness, tenure_months=24)
+    
+    digest = witness_digest("circuit", "1.0.0", witness)
+    assert witness_digest("circuit", "1.0.0", retry) == digest
+    assert witness_digest("circuit", "1.0.0", other) != digest
+    assert witness_digest("circuit", "1.0.1", witness) != digest
+
+
+@pytest.mark.asyncio
+async def test_retry_is_served_without_proving(monkeypatch):
+    """Test that a repeated application returns the first proof with no prover work."""
+    prover = ZKProverService()
+    # Random amount so earlier runs' Redis entries cannot satisfy the first call
+    application = {
+        "monthly_income": 5000.0,
+        "existing_debt": 1000.0,
+        "requested_amount": round(random.uniform(1000, 2000), 6),
+        "tenure_months": 12,
+    }
+    first = await prover.generate_proof(**application)
+    
+    calls = []
+    
+    async def run(fn, *args):
+        calls.append(fn)
+        raise AssertionError("prover pool used on a cache hit")
+    
+    monkeypatch.setattr(zk_prover.prover_executor, "run", run)
+    hits = _lookups("memory")
+    retry = await prover.generate_proof(**application)
+    
+    assert calls == []
+    assert _lookups("memory") == hits + 1
+    assert retry["proof_hash"] == first["proof_hash"]
+    assert retry["public_signals"] == first["public_signals"]
+    assert retry["proof_data"] == first["proof_data"]
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_backs_the_local_lru():
+    """Test that evicted entries are still found in Redis and re-promoted."""
+    cache = ProofResultCache(max_entries=1, ttl=60)
+    first, second = (f"test-{random.getrandbits(64):016x}-{i}" for i in range(2))
+    await cache.put(first, '{"proving_time_ms": 250}')
+    await cache.put(second, '{"proving_time_ms": 100}')
+    assert list(cache._entries) == [second]
+    
+    hits = _lookups("redis")
+    assert await cache.get(first, lambda record: {"proving_time_ms": 250}) is not None
+    assert _lookups("redis") == hits + 1
+    assert list(cache._entries) == [first]
+    
+    misses = _lookups("miss")
+    assert await cache.get("test-absent", lambda record: {}) is None
+    assert _lookups("miss") == misses + 1
+
+
+@pytest.mark.asyncio
+async def test_batch_proofs_use_and_fill_the_cache(monkeypatch):
+    """Test that batch items are served from and written to the witness-digest cache."""
+    prover = ZKProverService()
+    applications = [
+        {
+            "monthly_income": 5000.0,
+            "existing_debt": 1000.0,
+            "requested_amount": round(random.uniform(1000, 2000), 6),
+            "tenure_months": 12,
+        }
+        for _ in range(3)
+    ]
+    # A client that leaves after the first result still leaves it cached
+    stream = prover.generate_proofs_batch(applications)
+    first = await stream.__anext__()
+    await stream.aclose()
+    batch = [first] + [r async for r in prover.generate_proofs_batch(applications[1:])]
+    
+    async def run(fn, *args):
+        raise AssertionError("prover pool used on a cache hit")
+    
+    monkeypatch.setattr(zk_prover.prover_executor, "run", run)
+    for application, result in zip(applications, batch):
+        assert (await prover.generate_proof(**application))["proof_hash"] == result["proof_hash"]
+    again = [r async for r in prover.generate_proofs_batch(applications)]
+    assert [r["proof_hash"] for r in again] == [r["proof_hash"] for r in batch]
+    assert [r["index"] for r in again] == [0, 1, 2]
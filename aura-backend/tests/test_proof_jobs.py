@@ -0,0 +1,188 @@
+"""
+Tests for background proof jobs.
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.redis import redis_client
+from app.schemas.proof import ProofJobRequest
+from app.services.prover_pool import ProverPoolSaturated
+from app.services.proof_jobs import ProofJobQueue, ProofJobQueueFull, job_priority
+
+
+class FakeProver:
+    """Stands in for ZKProverService, recording the order proofs run in."""
+    
+    def __init__(self, delay: float = 0.0, fail: bool = False, saturated: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.saturated = saturated
+        self.order = []
+        self.results = {}
+    
+    async def generate_proof(self, **params):
+        await asyncio.sleep(self.delay)
+        if self.saturated:
+            raise ProverPoolSaturated("Prover pool saturated")
+        if self.fail:
+            raise ValueError("witness does not satisfy the circuit")
+        self.order.append(params["requested_amount"])
+        proof_hash = f"{int(params['requested_amount']):064d}"
+        self.results[proof_hash] = {"proof_hash": proof_hash, "is_valid": True}
+        return self.results[proof_hash]
+    
+    async def get_cached_proof(self, proof_hash):
+        return dict(self.results[proof_hash])
+
+
+def _params(amount: float) -> dict:
+    return {
+        "monthly_income": 5000.0,
+        "existing_debt": 1000.0,
+        "requested_amount": amount,
+        "tenure_months": 12,
+        "has_compliance_flags": False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_job_long_poll_returns_result():
+    """Test that a long poll wakes when the job finishes and includes the proof."""
+    queue = ProofJobQueue(concurrency=1, max_pending=10, prover=FakeProver(delay=0.05))
+    await queue.start()
+    try:
+        job = await queue.submit(_params(2000))
+        assert job["status"] == "queued"
+        
+        done = await queue.get(job["job_id"], wait=5.0)
+        assert done["status"] == "done"
+        assert done["result"]["proof_hash"] == done["proof_hash"]
+        assert done["result"]["generated_at"] == done["finished_at"]
+    finally:
+        await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_in_priority_order():
+    """Test that high priority jobs overtake queued normal and low ones."""
+    prover = FakeProver(delay=0.01)
+    queue = ProofJobQueue(concurrency=1, max_pending=10, prover=prover)
+    
+    # Queue everything before the worker starts so ordering is deterministic
+    pending = queue._queue = asyncio.PriorityQueue()
+    jobs = [
+        await queue.submit(_params(1), priority="low"),
+        await queue.submit(_params(2), priority="normal"),
+        await queue.submit(_params(3), priority="high"),
+        await queue.submit(_params(4), priority="normal"),
+    ]
+    queue._workers = [asyncio.create_task(queue._worker(0, pending))]
+    try:
+        for job in jobs:
+            await queue.get(job["job_id"], wait=5.0)
+        assert prover.order == [3, 2, 4, 1]
+    finally:
+        await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_job_records_error():
+    """Test that a proving error marks the job failed instead of losing it."""
+    queue = ProofJobQueue(concurrency=1, max_pending=10, prover=FakeProver(fail=True))
+    await queue.start()
+    try:
+        job = await queue.submit(_params(2000))
+        failed = await queue.get(job["job_id"], wait=5.0)
+        assert failed["status"] == "failed"
+        assert "witness" in failed["error"]
+        assert "result" not in failed
+    finally:
+        await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_fails_the_job_after_a_while():
+    """Test that a job stops waiting for a saturated pool and frees its worker."""
+    queue = ProofJobQueue(concurrency=1, max_pending=10, prover=FakeProver(saturated=True), saturated_wait=0.3)
+    await queue.start()
+    try:
+        job = await queue.submit(_params(2000))
+        failed = await queue.get(job["job_id"], wait=5.0)
+        assert failed["status"] == "failed"
+        assert "saturated for 0.3 s" in failed["error"]
+        
+        queue.prover.saturated = False
+        done = await queue.get((await queue.submit(_params(3000)))["job_id"], wait=5.0)
+        assert done["status"] == "done"
+    finally:
+        await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_expired_record_during_long_poll_returns_none():
+    """Test that a job record expiring mid-poll reads as not found."""
+    queue = ProofJobQueue(concurrency=1, max_pending=10, prover=FakeProver(delay=0.5))
+    await queue.start()
+    try:
+        job = await queue.submit(_params(2000))
+        await redis_client.delete(f"{queue.key_prefix}{job['job_id']}")
+        assert await queue.get(job["job_id"], wait=0.1) is None
+        
+        job = await queue.submit(_params(3000))
+        poll = asyncio.ensure_future(queue.get(job["job_id"], wait=5.0))
+        await asyncio.sleep(0.1)
+        await redis_client.delete(f"{queue.key_prefix}{job['job_id']}")
+        assert await poll is None
+    finally:
+        await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_when_queue_full():
+    """Test that submissions beyond max_pending are refused."""
+    queue = ProofJobQueue(concurrency=1, max_pending=1, prover=FakeProver())
+    queue._queue = asyncio.PriorityQueue()
+    try:
+        await queue.submit(_params(2000))
+        with pytest.raises(ProofJobQueueFull):
+            await queue.submit(_params(3000))
+    finally:
+        await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_unknown_job_returns_none():
+    """Test that status lookups for unknown ids return None."""
+    queue = ProofJobQueue(concurrency=1, max_pending=1, prover=FakeProver())
+    assert await queue.get("00000000-0000-0000-0000-000000000000") is None
+
+
+class FakeSession:
+    """Answers one scalar query, keeping the statement it was asked."""
+    
+    def __init__(self, answer):
+        self.answer = answer
+        self.statement = None
+    
+    async def scalar(self, statement):
+        self.statement = statement
+        return self.answer
+
+
+@pytest.mark.asyncio
+async def test_priority_is_derived_from_the_wallet():
+    """Test that pre-approved wallets get high priority and callers cannot pick one."""
+    assert await job_priority(FakeSession(True), uuid4()) == "high"
+    assert await job_priority(FakeSession(None), uuid4()) == "normal"
+    
+    session = FakeSession(False)
+    await job_priority(session, uuid4())
+    sql = str(session.statement.compile(dialect=postgresql.dialect()))
+    assert "loan_applications.wallet_address = (SELECT" in sql
+    assert "loan_applications.status IN" in sql
+    
+    assert "priority" not in ProofJobRequest.model_fields
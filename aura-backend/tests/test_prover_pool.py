@@ -0,0 +1,69 @@
+"""
+Tests for the ZK prover process pool.
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+from app.services.prover_pool import ProverExecutor, ProverJobTimeout, ProverPoolSaturated
+
+
+@pytest.mark.asyncio
+async def test_pool_runs_job_in_worker_process():
+    """Test that jobs execute outside the event loop's process."""
+    executor = ProverExecutor(workers=1, max_queue=1, job_timeout=30.0)
+    try:
+        pid = await executor.run(os.getpid)
+        assert pid != os.getpid()
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pool_rejects_when_queue_full():
+    """Test that jobs beyond workers + max_queue are rejected."""
+    executor = ProverExecutor(workers=1, max_queue=0, job_timeout=30.0)
+    try:
+        await executor.start()
+        running = asyncio.ensure_future(executor.run(time.sleep, 0.5))
+        await asyncio.sleep(0)
+        
+        with pytest.raises(ProverPoolSaturated):
+            await executor.run(os.getpid)
+        
+        await running
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pool_job_timeout():
+    """Test that overrunning jobs raise ProverJobTimeout."""
+    executor = ProverExecutor(workers=1, max_queue=1, job_timeout=0.1)
+    try:
+        await executor.start()
+        with pytest.raises(ProverJobTimeout):
+            await executor.run(time.sleep, 1.0)
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timed_out_job_keeps_its_slot():
+    """Test that a job still running after its timeout counts against capacity."""
+    executor = ProverExecutor(workers=1, max_queue=0, job_timeout=0.1)
+    try:
+        await executor.start()
+        with pytest.raises(ProverJobTimeout):
+            await executor.run(time.sleep, 0.6)
+        
+        with pytest.raises(ProverPoolSaturated):
+            await executor.run(os.getpid)
+        
+        await asyncio.sleep(0.8)
+        assert executor._admitted == 0
+        assert await executor.run(os.getpid) != os.getpid()
+    finally:
+        executor.shutdown()
@@ -0,0 +1,114 @@
+"""
+Tests for the R1CS loader and batched witness solver.
+"""
+
+import numpy as np
+import pytest
+from py_ecc.bn128 import curve_order
+
+from app.services import zk_prover
+from app.services.zk_prover import ZKProverService
+from app.zk import keystore
+from app.zk.r1cs import R1CS, dump_r1cs, parse_r1cs
+from app.zk.setup import SetupUnavailable
+
+MINUS_ONE = curve_order - 1
+
+
+def _mul_add_circuit() -> R1CS:
+    # out = x * y + 5 with wires [1, out, x, y, z]
+    return R1CS(
+        n_wires=5, n_pub_out=1, n_pub_in=0, n_prv_in=2,
+        constraints=[
+            ({2: 1}, {3: 1}, {4: 1}),
+            ({4: 1, 0: 5}, {0: 1}, {1: 1}),
+        ],
+    )
+
+
+def test_r1cs_roundtrip_and_solve():
+    """Test that a circuit survives the .r1cs format and solves a batch."""
+    circuit = parse_r1cs(dump_r1cs(_mul_add_circuit()))
+    assert (circuit.n_wires, circuit.n_constraints) == (5, 2)
+    
+    witnesses = circuit.solve_batch(np.array([[3, 4], [0, 9], [MINUS_ONE, 2]], dtype=object))
+    assert witnesses[:, 1].tolist() == [17, 5, 3]
+    assert circuit.check_batch(witnesses).tolist() == [True, True, True]
+    
+    witnesses[1, 4] = 1
+    assert circuit.check_batch(witnesses).tolist() == [True, False, True]
+
+
+def _hint_circuit() -> R1CS:
+    # b * (b - 1) = 0 alone does not determine b
+    return R1CS(3, 0, 1, 0, [({2: 1}, {2: 1, 0: MINUS_ONE}, {})])
+
+
+def test_unsolvable_circuit_raises(monkeypatch):
+    """Test that hint-style signals are reported instead of mis-solved, planning once."""
+    circuit = _hint_circuit()
+    plans = []
+    schedule = circuit._propagation_schedule
+    monkeypatch.setattr(circuit, "_propagation_schedule", lambda: plans.append(1) or schedule())
+    
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            circuit.solve_batch(np.array([[1]], dtype=object))
+    assert len(plans) == 1
+
+
+def test_key_store_rejects_unsolvable_circuit(tmp_path, monkeypatch):
+    """Test that a circuit needing hints fails loudly instead of skipping checks."""
+    path = tmp_path / "hints.r1cs"
+    path.write_bytes(dump_r1cs(_hint_circuit()))
+    monkeypatch.setattr(keystore.settings, "ZK_CIRCUIT_PATH", str(path))
+    store = keystore.KeyStore()
+    
+    for _ in range(2):
+        with pytest.raises(SetupUnavailable):
+            store.circuit("circuit", "1.0.0")
+    
+    monkeypatch.setattr(zk_prover, "key_store", store)
+    with pytest.raises(SetupUnavailable):
+        ZKProverService()._check_constraints_batch([{}], [[1, 1, 1, 1, 1700000000]])
+
+
+def _layout_circuit() -> R1CS:
+    # Wires: 1 income_ok, 2 dti_ok, 3 no_flags, 4 valid, 5 timestamp,
+    # 6-10 private inputs, 11 income_ok * dti_ok. The income and DTI flags
+    # are pinned to 1, so applications failing either are rejected.
+    return R1CS(
+        n_wires=12, n_pub_out=4, n_pub_in=1, n_prv_in=5,
+        constraints=[
+            ({0: 1}, {0: 1}, {1: 1}),
+            ({0: 1}, {0: 1}, {2: 1}),
+            ({0: 1, 10: MINUS_ONE}, {0: 1}, {3: 1}),
+            ({1: 1}, {2: 1}, {11: 1}),
+            ({11: 1}, {3: 1}, {4: 1}),
+            ({10: 1}, {10: 1, 0: MINUS_ONE}, {}),
+        ],
+    )
+
+
+def test_batch_constraint_precheck(tmp_path, monkeypatch):
+    """Test that witnesses contradicting the deployed circuit are rejected."""
+    path = tmp_path / "eligibility.r1cs"
+    path.write_bytes(dump_r1cs(_layout_circuit()))
+    monkeypatch.setattr(keystore.settings, "ZK_CIRCUIT_PATH", str(path))
+    keystore.key_store._circuits.clear()
+    
+    prover = ZKProverService()
+    witnesses = [
+        {"monthly_income": 5, "existing_debt": 1, "requested_amount": 2, "tenure_months": 12, "compliance_flag": flag}
+        for flag in (0, 1, 0, 2)
+    ]
+    signals = [
+        [1, 1, 1, 1, 1700000000],
+        [1, 1, 0, 0, 1700000000],
+        [0, 1, 1, 0, 1700000000],
+        [1, 1, 1, 1, 1700000000],
+    ]
+    try:
+        assert prover._check_constraints_batch(witnesses, signals) == [True, True, False, False]
+    finally:
+        keystore.key_store._circuits.clear()
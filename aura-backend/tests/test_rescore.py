@@ -0,0 +1,129 @@
+"""
+Tests for the offline re-scoring job.
+"""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.jobs.rescore import (
+    MAX_CHUNK_SIZE,
+    Rescore,
+    applications_query,
+    load_checkpoint,
+    save_checkpoint,
+    score_chunk,
+    upsert_rescores,
+)
+from app.services.agents import AuraAgent, LenderAgent
+
+
+def _row(requested_amount: float, tenure_months: int, decided: bool = True, **flags) -> SimpleNamespace:
+    proof = dict(is_valid=True, income_sufficient=True, dti_acceptable=True, no_compliance_flags=True)
+    proof.update(flags)
+    return SimpleNamespace(
+        application_id=uuid4(),
+        wallet_address="addr_test1" + "q" * 50,
+        requested_amount=requested_amount,
+        tenure_months=tenure_months,
+        decision_id=uuid4() if decided else None,
+        was_approved=True if decided else None,
+        **proof,
+    )
+
+
+@pytest.mark.asyncio
+async def test_chunk_matches_the_agents():
+    """Test that a scored chunk equals per-row assess_risk and make_decision."""
+    rows = [
+        _row(2000.0, 12),
+        _row(40000.0, 6, dti_acceptable=False),
+        _row(1500.0, 24, decided=False, is_valid=False),
+    ]
+    run_id = uuid4()
+    values = await score_chunk(rows, run_id, monthly_income=5000.0, existing_debt=1000.0)
+    
+    for row, value in zip(rows, values):
+        assessment = await AuraAgent.assess_risk(
+            proof_valid=row.is_valid,
+            income_sufficient=row.income_sufficient,
+            dti_acceptable=row.dti_acceptable,
+            no_compliance_flags=row.no_compliance_flags,
+            requested_amount=row.requested_amount,
+            tenure_months=row.tenure_months,
+            monthly_income=5000.0,
+            existing_debt=1000.0,
+        )
+        decision = await LenderAgent.make_decision(assessment, row.requested_amount, row.tenure_months)
+        
+        assert value["application_id"] == row.application_id
+        assert value["risk_score"] == assessment["risk_score"]
+        assert value["risk_level"].value == assessment["risk_level"]
+        assert value["aura_recommendation"] == assessment["recommendation"]
+        assert value["is_approved"] == decision["is_approved"]
+        assert value["approved_amount"] == decision["approved_amount"]
+        assert value["monthly_payment"] == decision["monthly_payment"]
+        assert value["lender_model_version"] == decision["model_version"]
+    
+    # Rows point at the stored decision they re-score, and carry the run and income
+    assert [v["decision_id"] for v in values] == [r.decision_id for r in rows]
+    assert {v["run_id"] for v in values} == {run_id}
+    assert {(v["assumed_monthly_income"], v["assumed_existing_debt"]) for v in values} == {(5000.0, 1000.0)}
+    assert len({v["id"] for v in values}) == 3
+    assert len({v["scored_at"] for v in values}) == 1
+
+
+@pytest.mark.asyncio
+async def test_upsert_writes_rescores_not_decisions():
+    """Test that scored values bind to loan_rescores, keyed on the run and application."""
+    values = await score_chunk([_row(2000.0, 12), _row(3000.0, 24)], uuid4())
+    compiled = upsert_rescores().compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    
+    assert set(values[0]) == set(compiled.params)
+    assert sql.startswith("INSERT INTO loan_rescores")
+    assert "loan_decisions" not in sql
+    assert "ON CONFLICT (run_id, application_id) DO UPDATE SET" in sql
+    assert "risk_score = excluded.risk_score" in sql
+    assert "run_id = excluded" not in sql
+    assert "application_id = excluded" not in sql
+
+
+def test_query_resumes_after_the_checkpoint():
+    """Test that the stream is keyset-ordered and starts after the saved id."""
+    sql = str(applications_query(uuid4()).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("SELECT DISTINCT ON (loan_applications.id)")
+    assert "WHERE loan_applications.id >" in sql
+    assert "ORDER BY loan_applications.id" in sql
+    assert "LEFT OUTER JOIN loan_decisions" not in sql
+    undecided = applications_query(include_undecided=True).compile(dialect=postgresql.dialect())
+    assert "LEFT OUTER JOIN loan_decisions" in str(undecided)
+
+
+def test_checkpoint_round_trip(tmp_path):
+    """Test that checkpoints are written whole and read back."""
+    path = str(tmp_path / "rescore.json")
+    assert load_checkpoint(path) is None
+    
+    state = {"run_id": str(uuid4()), "last_application_id": str(uuid4()), "rows": 5000, "approvals_changed": 12}
+    save_checkpoint(path, state)
+    assert load_checkpoint(path) == state
+    assert not (tmp_path / "rescore.json.tmp").exists()
+
+
+def test_chunk_size_is_bounded():
+    """Test that chunks stay within Postgres' bind parameter limit."""
+    with pytest.raises(ValueError):
+        Rescore(chunk_size=0, dry_run=True)
+    with pytest.raises(ValueError):
+        Rescore(chunk_size=MAX_CHUNK_SIZE + 1, dry_run=True)
+
+
+def test_writes_need_the_assumed_income_acknowledged():
+    """Test that only dry runs go ahead without assume_income."""
+    with pytest.raises(ValueError):
+        Rescore()
+    Rescore(dry_run=True)
+    Rescore(assume_income=True)
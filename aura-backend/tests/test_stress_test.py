@@ -0,0 +1,112 @@
+"""
+Tests for the Monte Carlo policy stress test.
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints.admin import StressTestRequest, _stress_test_lock, run_stress_test
+from app.jobs.stress_test import StressTest, build_scenario
+
+
+def _final(stress_test: StressTest) -> dict:
+    *_, final = stress_test.run()
+    return final
+
+
+def test_unchanged_policy_matches_baseline():
+    """Test that the candidate equals the baseline when no policy field changes."""
+    final = _final(StressTest({"applicants": 20_000}, workers=0, shard_size=7_000))
+    
+    assert final["complete"] and final["shards_total"] == 3
+    assert final["applicants_done"] == 20_000
+    assert final["scenario"] == final["baseline"]
+    assert 0 < final["baseline"]["approval_rate"] < 1
+    assert final["baseline"]["expected_loss"] > 0
+
+
+def test_results_do_not_depend_on_workers():
+    """Test that sharding across processes gives the same totals as running inline."""
+    scenario = {"applicants": 30_000, "seed": 11, "policy": {"base_rate": 10.0}}
+    inline = _final(StressTest(scenario, workers=0, shard_size=10_000))
+    pooled = _final(StressTest(scenario, workers=2, shard_size=10_000))
+    
+    assert pooled["delta"] == pytest.approx(inline["delta"])
+    for key in ("baseline", "scenario"):
+        # Shards may finish in any order, so float totals can differ in the last bit
+        assert pooled[key].pop("risk_levels") == inline[key].pop("risk_levels")
+        assert pooled[key] == pytest.approx(inline[key])
+
+
+def test_policy_changes_move_the_portfolio():
+    """Test that pricing and threshold changes show up in the candidate's totals."""
+    final = _final(StressTest(
+        {"applicants": 20_000, "policy": {"base_rate": 9.5, "risk_thresholds": [5, 10, 15]}},
+        workers=0,
+    ))
+    baseline, scenario = final["baseline"], final["scenario"]
+    
+    # Tighter thresholds move approvals out of "approve" into "reduce_amount" or "reject"
+    assert scenario["approval_rate"] <= baseline["approval_rate"]
+    assert scenario["exposure"] < baseline["exposure"]
+    assert scenario["reduced_rate"] > baseline["reduced_rate"]
+    assert final["delta"]["expected_loss"] < 0
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_every_shard():
+    """Test that the async stream yields running totals once per shard."""
+    stress_test = StressTest({"applicants": 5_000}, workers=0, shard_size=2_000)
+    progress = [p async for p in stress_test.stream()]
+    
+    assert [p["shards_done"] for p in progress] == [1, 2, 3]
+    assert progress[-1]["complete"] and progress[-1]["applicants_done"] == 5_000
+
+
+def test_historical_applicants_are_resampled(tmp_path):
+    """Test that applicants can be drawn from a CSV of past applications."""
+    path = tmp_path / "history.csv"
+    path.write_text(
+        "monthly_income,existing_debt,requested_amount,tenure_months,has_compliance_flags\n"
+        "5000,1000,2000,12,false\n"
+        "800,9000,20000,6,true\n"
+    )
+    final = _final(StressTest({"applicants": 1_000, "applicants_file": str(path)}, workers=0))
+    
+    # The first row is approved and the second rejected
+    share = final["baseline"]["approval_rate"]
+    assert 0.4 < share < 0.6
+    assert final["baseline"]["risk_levels"]["low"]["share"] == pytest.approx(share)
+
+
+def test_invalid_policy_is_rejected():
+    """Test that malformed candidate policies fail before any work is done."""
+    with pytest.raises(ValueError):
+        build_scenario({"policy": {"risk_thresholds": [50, 25, 75]}})
+    with pytest.raises(ValueError):
+        build_scenario({"policy": {"risk_premium": {"extreme": 20.0}}})
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoint_runs_one_stress_test_at_a_time():
+    """Test that concurrent requests get 409 and the lock is freed however the stream ends."""
+    request = StressTestRequest(applicants=1_000)
+    
+    responses = await asyncio.gather(run_stress_test(request), run_stress_test(request), return_exceptions=True)
+    conflicts = [r for r in responses if isinstance(r, HTTPException)]
+    assert len(conflicts) == 1 and conflicts[0].status_code == 409
+    
+    # A client that leaves before the stream starts still frees the lock
+    response = next(r for r in responses if not isinstance(r, HTTPException))
+    await response.background()
+    assert not _stress_test_lock.locked()
+    
+    response = await run_stress_test(request)
+    lines = [json.loads(line) async for line in response.body_iterator]
+    assert lines[-1]["complete"]
+    assert not _stress_test_lock.locked()
+    await response.background()
+    assert not _stress_test_lock.locked()
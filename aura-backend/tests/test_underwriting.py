@@ -0,0 +1,86 @@
+"""
+Tests for the single-call underwriting pipeline.
+"""
+
+from uuid import uuid4
+
+import pytest
+from app.api.v1.endpoints.underwrite import underwrite
+from app.schemas.loan import UnderwriteRequest
+from app.services.agents import AuraAgent, LenderAgent
+from app.services.underwriting import underwriting_pipeline
+
+
+APPLICATION = dict(
+    monthly_income=5000.0,
+    existing_debt=1000.0,
+    requested_amount=2000.0,
+    tenure_months=12,
+    has_compliance_flags=False,
+)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_matches_separate_calls():
+    """Test that one pipeline run agrees with calling the three services in turn."""
+    result = await underwriting_pipeline.run(**APPLICATION)
+    
+    proof = result["proof"]
+    assert proof["is_valid"] is True
+    
+    assessment = await AuraAgent.assess_risk(
+        proof_valid=proof["is_valid"],
+        **proof["conditions"],
+        requested_amount=2000.0,
+        tenure_months=12,
+        monthly_income=5000.0,
+        existing_debt=1000.0,
+    )
+    assert result["aura_assessment"]["risk_score"] == assessment["risk_score"]
+    assert result["aura_assessment"]["recommendation"] == assessment["recommendation"]
+    
+    decision = await LenderAgent.make_decision(
+        aura_assessment=assessment,
+        requested_amount=2000.0,
+        requested_tenure=12,
+    )
+    assert result["lender_decision"]["is_approved"] == decision["is_approved"]
+    assert result["lender_decision"]["interest_rate"] == decision["interest_rate"]
+    assert set(result["stage_times_ms"]) == {"proof", "aura_assessment", "lender_decision"}
+
+
+@pytest.mark.asyncio
+async def test_pipeline_yields_stages_in_order():
+    """Test that stages are reported one by one, ending with the timings."""
+    stages = [stage async for stage, _ in underwriting_pipeline.stages(**dict(APPLICATION, has_compliance_flags=True))]
+    
+    assert stages == ["proof", "aura_assessment", "lender_decision", "complete"]
+
+
+@pytest.mark.asyncio
+async def test_failed_proof_is_declined():
+    """Test that an application failing the proof is carried through to a rejection."""
+    result = await underwriting_pipeline.run(**dict(APPLICATION, monthly_income=500.0, requested_amount=5000.0))
+    
+    assert result["proof"]["is_valid"] is False
+    assert result["aura_assessment"]["recommendation"] == "reject"
+    assert result["lender_decision"]["is_approved"] is False
+
+
+@pytest.mark.asyncio
+async def test_endpoint_result_has_the_pipeline_shape():
+    """Test that the non-streaming endpoint assembles the same result as run()."""
+    request = UnderwriteRequest(
+        application_id=uuid4(),
+        ipfs_cid="Qm" + "a" * 44,
+        monthly_income_hash="0" * 64,
+        existing_debt_hash="0" * 64,
+        requested_amount=2000.0,
+        tenure_months=12,
+    )
+    result = await underwrite(request, accept=None)
+    expected = await underwriting_pipeline.run(**APPLICATION)
+    
+    assert set(result) == set(expected) | {"application_id", "decided_at"}
+    assert result["application_id"] == request.application_id
+    assert result["lender_decision"]["is_approved"] == expected["lender_decision"]["is_approved"]
@@ -0,0 +1,82 @@
+"""
+Tests for Groth16 pairing verification.
+"""
+
+import pytest
+from app.services import zk_prover
+from app.services.zk_prover import ZKProverService
+from app.zk import setup
+from app.zk.keystore import KeyStore
+from app.zk.setup import SetupUnavailable, VerificationKey, development_setup
+
+
+def _proof(prover: ZKProverService, income: int, signals: list) -> dict:
+    witness = {"monthly_income": income, "timestamp": signals[-1]}
+    return prover._generate_groth16_proof(witness, bool(signals[3]), signals)
+
+
+def test_valid_proof_passes_pairing_check():
+    """Test that a generated proof satisfies the pairing equation."""
+    prover = ZKProverService()
+    signals = [1, 1, 1, 1, 1700000000]
+    
+    assert prover._verify_proof(_proof(prover, 5_000, signals), signals) is True
+
+
+def test_proof_rejected_for_different_public_signals():
+    """Test that a proof does not verify against altered public signals."""
+    prover = ZKProverService()
+    signals = [0, 1, 1, 0, 1700000000]
+    proof = _proof(prover, 500, signals)
+    
+    assert prover._verify_proof(proof, [1, 1, 1, 1, 1700000000]) is False
+
+
+def test_batch_verification_isolates_bad_proof():
+    """Test that batch verification reports each proof individually."""
+    prover = ZKProverService()
+    good_signals = [1, 1, 1, 1, 1700000000]
+    other_signals = [1, 1, 1, 1, 1700000001]
+    good = _proof(prover, 5_000, good_signals)
+    other = _proof(prover, 6_000, other_signals)
+    
+    results = prover._verify_proof_batch([
+        (good, good_signals),
+        (other, good_signals),
+        (other, other_signals),
+        ({"pi_a": ["1"]}, good_signals),
+    ])
+    
+    assert results == [True, False, True, False]
+
+
+def test_verification_key_snarkjs_roundtrip():
+    """Test that verification keys survive the snarkjs JSON layout."""
+    setup = development_setup(ZKProverService.CIRCUIT_ID, ZKProverService.CIRCUIT_VERSION, 5)
+    vk = setup.verification_key()
+    
+    parsed = VerificationKey.from_snarkjs(vk.to_snarkjs())
+    
+    assert parsed.num_public_inputs == 5
+    assert parsed.ic == vk.ic
+    assert parsed.delta_2 == vk.delta_2
+
+
+@pytest.mark.parametrize("environment, enabled", [("development", False), ("production", True)])
+def test_development_setup_requires_opt_in(environment, enabled, monkeypatch):
+    """Test that without deployed keys nothing is proved or verified unless opted in."""
+    signals = [1, 1, 1, 1, 1700000000]
+    proof = _proof(ZKProverService(), 5_000, signals)
+    
+    monkeypatch.setattr(setup.settings, "ENVIRONMENT", environment)
+    monkeypatch.setattr(setup.settings, "ZK_DEVELOPMENT_SETUP", enabled)
+    monkeypatch.setattr(zk_prover, "key_store", KeyStore())
+    prover = ZKProverService()
+    
+    with pytest.raises(SetupUnavailable):
+        development_setup(ZKProverService.CIRCUIT_ID, ZKProverService.CIRCUIT_VERSION, 5)
+    with pytest.raises(SetupUnavailable):
+        _proof(prover, 5_000, signals)
+    with pytest.raises(SetupUnavailable):
+        prover._verify_proof_batch([(proof, signals)])
+    assert prover._verify_proof(proof, signals) is False